@@ -1,7 +1,7 @@
 from flask import Flask, jsonify
-from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from app.extension import db, build_db_uri
+from app.json_provider import CustomJSONProvider
+from app.extension import db, migrate, build_db_uri
 from app.api.root import bp as root_bp
 from app.api.user import bp as user_bp
 from app.api.student import bp as student_bp
@@ -9,27 +9,18 @@ from app.api.teacher import bp as teacher_bp
 from app.api.course import bp as course_bp
 from app.api.enrollment import bp as enrollment_bp
 from app.api.quiz import bp as quiz_bp
-import datetime
-import json
+from app.api.search import bp as search_bp
+from app.api.auth import authenticate_request
+from app.repository.search_repository import exclude_search_index
+from app.cli import quiz_cli, grading_cli, course_cli, search_cli, student_cli, teacher_cli, auth_cli
 import os
 from flask_sqlalchemy import SQLAlchemy
 
-class CustomJSONProvider(JSONProvider):
-    def dumps(self, obj, **kwargs):
-        return json.dumps(obj, default=self.default, **kwargs)
-    
-    def loads(self, s, **kwargs):
-        return json.loads(s, **kwargs)
-    
-    def default(self, obj):
-        if isinstance(obj, datetime.datetime) or isinstance(obj, datetime.date):
-            return obj.isoformat()
-        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
 app = Flask(__name__)
 CORS(app)
 
-app.json = CustomJSONProvider(app)
+# JSON encoder backend: auto (orjson when installed), orjson or stdlib
+app.json = CustomJSONProvider(app, backend=os.getenv("JSON_BACKEND", "auto").lower())
 
 db_credentials = {
     "DB_USER": os.getenv("DB_USER"),
@@ -39,12 +30,42 @@ db_credentials = {
     "DB_NAME": os.getenv("DB_NAME"),
 }
 
-app.config["SQLALCHEMY_DATABASE_URI"] = build_db_uri(**db_credentials)
+# DATABASE_URL overrides the DB_* settings, e.g. sqlite:///school.db for local runs
+app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL") or build_db_uri(**db_credentials)
+
+# Auth: signed access/refresh tokens; AUTH_REQUIRED rejects requests without an access token
+app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "fallback-secret-key")
+app.config["JWT_ACCESS_TOKEN_MINUTES"] = int(os.getenv("JWT_ACCESS_TOKEN_MINUTES", 15))
+app.config["JWT_REFRESH_TOKEN_DAYS"] = int(os.getenv("JWT_REFRESH_TOKEN_DAYS", 7))
+app.config["TOKEN_DENYLIST_SYNC_SECONDS"] = float(os.getenv("TOKEN_DENYLIST_SYNC_SECONDS", 30))
+app.config["AUTH_REQUIRED"] = os.getenv("AUTH_REQUIRED", "false").lower() == "true"
+
+# Quiz grading queue
+app.config["ASYNC_GRADING"] = os.getenv("ASYNC_GRADING", "false").lower() == "true"
+app.config["GRADING_WORKERS"] = int(os.getenv("GRADING_WORKERS", 2))
+app.config["GRADING_POLL_SECONDS"] = float(os.getenv("GRADING_POLL_SECONDS", 1.0))
+app.config["GRADING_JOB_TIMEOUT_SECONDS"] = int(os.getenv("GRADING_JOB_TIMEOUT_SECONDS", 300))
+app.config["GRADING_MAX_ATTEMPTS"] = int(os.getenv("GRADING_MAX_ATTEMPTS", 3))
+
+# Bulk paper submission import: grading processes started with the server (0 = one per CPU) and sheets per chunk
+app.config["IMPORT_GRADING_PROCESSES"] = int(os.getenv("IMPORT_GRADING_PROCESSES", 0))
+app.config["IMPORT_GRADING_CHUNK_SIZE"] = int(os.getenv("IMPORT_GRADING_CHUNK_SIZE", 1000))
+
+# Student/teacher imports: rows validated and committed per chunk
+app.config["ROSTER_IMPORT_CHUNK_SIZE"] = int(os.getenv("ROSTER_IMPORT_CHUNK_SIZE", 5000))
+
+# Quiz preview cache pre-warming: minutes before start_date (0 = off) and how often to check
+app.config["PREVIEW_PREWARM_MINUTES"] = int(os.getenv("PREVIEW_PREWARM_MINUTES", 0))
+app.config["PREVIEW_PREWARM_INTERVAL_SECONDS"] = float(os.getenv("PREVIEW_PREWARM_INTERVAL_SECONDS", 60))
 
 db.init_app(app)
+# SQLite cannot ALTER constraints, so migrations use batch (copy-and-move) operations
+migrate.init_app(app, db, render_as_batch=True, include_object=exclude_search_index)
 
 from app.model import models
 
+app.before_request(authenticate_request)
+
 app.register_blueprint(root_bp)
 app.register_blueprint(user_bp)
 app.register_blueprint(student_bp)
@@ -52,5 +73,14 @@ app.register_blueprint(teacher_bp)
 app.register_blueprint(course_bp)
 app.register_blueprint(enrollment_bp)
 app.register_blueprint(quiz_bp)
+app.register_blueprint(search_bp)
+
+app.cli.add_command(quiz_cli)
+app.cli.add_command(grading_cli)
+app.cli.add_command(course_cli)
+app.cli.add_command(search_cli)
+app.cli.add_command(student_cli)
+app.cli.add_command(teacher_cli)
+app.cli.add_command(auth_cli)
 
 __all__ = ["app"]
@@ -0,0 +1,39 @@
+import jwt
+from flask import current_app, g, jsonify, request
+from app.blc.tokenBLC import TokenBLC
+
+
+# Reachable without an access token even when AUTH_REQUIRED is set
+PUBLIC_ENDPOINTS = {"root.root", "user.user_signup", "user.user_login", "user.refresh_token", "static"}
+
+
+def _unauthorized(message):
+    response = jsonify({"error": message})
+    response.status_code = 401
+    response.headers["WWW-Authenticate"] = "Bearer"
+    return response
+
+
+def authenticate_request():
+    """before_request hook: verify the bearer access token, if any, and keep its claims in g.token.
+
+    Without AUTH_REQUIRED a request may omit the token, but a token that is sent must be valid.
+    Public endpoints and CORS preflights are not checked, so a stale token cannot block a login.
+    """
+    g.token = None
+    if request.endpoint in PUBLIC_ENDPOINTS or request.method == "OPTIONS":
+        return None
+    header = request.headers.get("Authorization")
+    if not header:
+        if current_app.config["AUTH_REQUIRED"]:
+            return _unauthorized("Authentication required")
+        return None
+
+    scheme, _, token = header.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return _unauthorized("Authorization header must be: Bearer <access token>")
+    try:
+        g.token = TokenBLC.verify(token.strip(), "access")
+    except jwt.InvalidTokenError as e:
+        return _unauthorized(f"Invalid token: {e}")
+    return None
@@ -0,0 +1,93 @@
+import threading
+from functools import wraps
+from flask import Response, current_app, request
+
+
+class _Call:
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class SingleFlight:
+    """Process-local request coalescing: identical concurrent reads share one execution.
+
+    The first request for a key runs the view; requests with the same key that arrive
+    while it is in flight wait and receive a copy of its response.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.coalesced_by_endpoint = {}
+
+    def do(self, key, endpoint, fn):
+        """Run fn() for key unless an identical call is in flight, then share its (body, status, headers)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                self.coalesced_by_endpoint[endpoint] = self.coalesced_by_endpoint.get(endpoint, 0) + 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+
+        try:
+            call.response = fn()
+            return call.response
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "coalesced_by_endpoint": dict(self.coalesced_by_endpoint)
+            }
+
+
+single_flight = SingleFlight()
+
+
+def coalesce_requests(view):
+    """Opt a GET view into single-flight coalescing, keyed by endpoint, URL arguments and query string"""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.method != "GET":
+            return view(*args, **kwargs)
+
+        key = (request.endpoint, tuple(sorted(kwargs.items())), tuple(sorted(request.args.items(multi=True))))
+
+        def run():
+            response = current_app.make_response(view(*args, **kwargs))
+            return response.get_data(), response.status_code, list(response.headers.items())
+
+        body, status, headers = single_flight.do(key, request.endpoint, run)
+        return Response(body, status=status, headers=headers)
+
+    return wrapper
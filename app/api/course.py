@@ -1,42 +1,44 @@
 from flask import Blueprint, request, jsonify
 from app.blc.courseBLC import CourseBLC
+from app.api.coalescing import coalesce_requests
 from webargs.flaskparser import use_args
-from webargs import fields
+from webargs import fields, validate
+from app.api.streaming import export_response, stream_response
+from app.api.pagination import fields_arg, page_args, page_response
+from app.repository.pagination import InvalidCursor
+from app.repository.course_repository import COURSE_PROJECTION, COURSE_SORT_COLUMNS
 
 bp = Blueprint("course", __name__, url_prefix="/courses")
 
 @bp.route("/list", methods=["GET"])
-def get_all_courses():
+@use_args(
+    page_args(
+        COURSE_SORT_COLUMNS,
+        COURSE_PROJECTION.field_names,
+        teacher_id=fields.Integer(),
+        credits=fields.Integer()
+    ),
+    location="query",
+)
+def get_all_courses(args: dict):
+    if args["stream"]:
+        return stream_response(CourseBLC.iter_courses(args), args["stream"])
     try:
-        courses = CourseBLC.get_all_courses()
-        return jsonify([{
-        "id": course.id,
-        "name": course.name,
-        "description": course.description,
-        "credits": course.credits,
-        "max_students": course.max_students,
-        "teacher_id": course.teacher_id,
-        "created_at": course.created_at.isoformat() if course.created_at else None,
-        "updated_at": course.updated_at.isoformat() if course.updated_at else None
-    } for course in courses])
+        courses, next_cursor = CourseBLC.get_all_courses(args)
+        return page_response(courses, next_cursor)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": "No courses found"}), 404
 
 
 @bp.route("/detail/<int:id>", methods=["GET"])
-def get_course(id):
+@coalesce_requests
+@use_args({"fields": fields_arg(COURSE_PROJECTION.field_names)}, location="query")
+def get_course(args: dict, id):
     try:
-        course = CourseBLC.get_course_by_id(id)
-        return jsonify({
-            "id": course.id,
-            "name": course.name,
-            "description": course.description,
-            "credits": course.credits,
-            "max_students": course.max_students,
-            "teacher_id": course.teacher_id,
-            "created_at": course.created_at.isoformat() if course.created_at else None,
-            "updated_at": course.updated_at.isoformat() if course.updated_at else None
-        })
+        course = CourseBLC.get_course_by_id(id, args["fields"])
+        return jsonify(course)
     except Exception as e:
         return jsonify({"error": str(e)}), 404
 
@@ -47,7 +49,8 @@ def get_course(id):
         "description": fields.String(required=True),
         "credits": fields.Integer(required=True),
         "teacher_id": fields.Integer(required=True),
-        "max_students": fields.Integer(required=False)
+        "max_students": fields.Integer(required=False),
+        "drop_lowest": fields.Integer(required=False, validate=validate.Range(min=0))
     },
     location="json",
 )
@@ -66,7 +69,8 @@ def create_course(args: dict):
         "description": fields.String(),
         "credits": fields.Integer(),
         "teacher_id": fields.Integer(),
-        "max_students": fields.Integer()
+        "max_students": fields.Integer(),
+        "drop_lowest": fields.Integer(validate=validate.Range(min=0))
     },
     location="json",
 )
@@ -85,3 +89,40 @@ def delete_course(id):
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 404
+
+
+@bp.route("/<int:id>/grades/recompute", methods=["POST"])
+def recompute_course_grades(id):
+    """Recompute weighted course grades of every enrollment in a course"""
+    try:
+        result = CourseBLC.recompute_grades(id)
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 404
+
+
+@bp.route("/<int:id>/gradebook", methods=["GET"])
+@use_args({"format": fields.String(load_default="json", validate=validate.OneOf(["json", "csv"]))}, location="query")
+def get_gradebook(args: dict, id):
+    """Students x quizzes gradebook with row and column averages, as JSON or a CSV download"""
+    try:
+        gradebook = CourseBLC.get_gradebook(id)
+        if args["format"] == "json":
+            return jsonify(gradebook)
+        
+        columns = ["student_id", "student_name"]
+        for quiz in gradebook["quizzes"]:
+            columns += [f"{quiz['title']} (%)", f"{quiz['title']} (grade)"]
+        columns.append("average")
+        
+        rows = (
+            [student["id"], student["name"]]
+            + [value for cell in zip(percentages, grades) for value in cell]
+            + [average]
+            for student, percentages, grades, average in zip(
+                gradebook["students"], gradebook["percentages"], gradebook["grades"], gradebook["student_averages"]
+            )
+        )
+        return export_response(rows, columns, "csv", f"course-{id}-gradebook")
+    except Exception as e:
+        return jsonify({"error": str(e)}), 404
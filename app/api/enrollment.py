@@ -1,59 +1,56 @@
 from flask import Blueprint, request, jsonify
 from app.blc.enrollmentBLC import EnrollmentBLC
 from webargs.flaskparser import use_args
-from webargs import fields
+from webargs import fields, validate
+from app.api.streaming import stream_response
+from app.api.pagination import fields_arg, page_args, page_response
+from app.repository.pagination import InvalidCursor
+from app.repository.enrollment_repository import ENROLLMENT_PROJECTION, ENROLLMENT_SORT_COLUMNS
 from datetime import date
 
 bp = Blueprint("enrollment", __name__, url_prefix="/enrollments")
 
+# Largest explicit student list accepted by /enrollments/bulk
+MAX_BULK_STUDENTS = 5000
+
 
 @bp.route("/list", methods=["GET"])
-def get_all_enrollments():
-    enrollments = EnrollmentBLC.get_all_enrollments()
-    return jsonify([{
-        "id": enrollment.id,
-        "student_id": enrollment.student_id,
-        "course_id": enrollment.course_id,
-        "enrollment_date": enrollment.enrollment_date.isoformat() if enrollment.enrollment_date else None,
-        "status": enrollment.status,
-        "grade": enrollment.grade,
-        "created_at": enrollment.created_at.isoformat() if enrollment.created_at else None,
-        "updated_at": enrollment.updated_at.isoformat() if enrollment.updated_at else None
-    } for enrollment in enrollments])
+@use_args(
+    page_args(
+        ENROLLMENT_SORT_COLUMNS,
+        ENROLLMENT_PROJECTION.field_names,
+        status=fields.String(validate=validate.OneOf(["active", "completed", "dropped"])),
+        student_id=fields.Integer(),
+        course_id=fields.Integer()
+    ),
+    location="query",
+)
+def get_all_enrollments(args: dict):
+    if args["stream"]:
+        return stream_response(EnrollmentBLC.iter_enrollments(args), args["stream"])
+    try:
+        enrollments, next_cursor = EnrollmentBLC.get_all_enrollments(args)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return page_response(enrollments, next_cursor)
 
 
 @bp.route("/by-student/<int:student_id>", methods=["GET"])
-def get_student_enrollments(student_id):
+@use_args({"fields": fields_arg(ENROLLMENT_PROJECTION.field_names)}, location="query")
+def get_student_enrollments(args: dict, student_id):
     try:
-        enrollments = EnrollmentBLC.get_enrollments_by_student(student_id)
-        return jsonify([{
-            "id": enrollment.id,
-            "student_id": enrollment.student_id,
-            "course_id": enrollment.course_id,
-            "enrollment_date": enrollment.enrollment_date.isoformat() if enrollment.enrollment_date else None,
-            "status": enrollment.status,
-            "grade": enrollment.grade,
-            "created_at": enrollment.created_at.isoformat() if enrollment.created_at else None,
-            "updated_at": enrollment.updated_at.isoformat() if enrollment.updated_at else None
-        } for enrollment in enrollments])
+        enrollments = EnrollmentBLC.get_enrollments_by_student(student_id, args["fields"])
+        return jsonify(enrollments)
     except Exception as e:
         return jsonify({"error": str(e)}), 404
 
 
 @bp.route("/by-course/<int:course_id>", methods=["GET"])
-def get_course_enrollments(course_id):
+@use_args({"fields": fields_arg(ENROLLMENT_PROJECTION.field_names)}, location="query")
+def get_course_enrollments(args: dict, course_id):
     try:
-        enrollments = EnrollmentBLC.get_enrollments_by_course(course_id)
-        return jsonify([{
-            "id": enrollment.id,
-            "student_id": enrollment.student_id,
-            "course_id": enrollment.course_id,
-            "enrollment_date": enrollment.enrollment_date.isoformat() if enrollment.enrollment_date else None,
-            "status": enrollment.status,
-            "grade": enrollment.grade,
-            "created_at": enrollment.created_at.isoformat() if enrollment.created_at else None,
-            "updated_at": enrollment.updated_at.isoformat() if enrollment.updated_at else None
-        } for enrollment in enrollments])
+        enrollments = EnrollmentBLC.get_enrollments_by_course(course_id, args["fields"])
+        return jsonify(enrollments)
     except Exception as e:
         return jsonify({"error": str(e)}), 404
 
@@ -79,6 +76,29 @@ def create_enrollment(args: dict):
         return jsonify({"error": str(e)}), 400
 
 
+@bp.route("/bulk", methods=["POST"])
+@use_args(
+    {
+        "course_id": fields.Integer(required=True),
+        "student_ids": fields.List(fields.Integer(), validate=validate.Length(min=1, max=MAX_BULK_STUDENTS)),
+        "grade": fields.Integer(validate=validate.Range(min=1, max=12)),
+        "enrollment_date": fields.Date(),
+        "status": fields.String(validate=validate.OneOf(["active", "completed", "dropped"]))
+    },
+    location="json",
+)
+def bulk_enroll(args: dict):
+    """Enroll many students in a course; one created/skipped/rejected outcome per student."""
+    if ("student_ids" in args) == ("grade" in args):
+        return jsonify({"error": "Provide exactly one of student_ids or grade"}), 400
+
+    try:
+        result = EnrollmentBLC.bulk_enroll(args)
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
 @bp.route("/update/<int:id>", methods=["PUT"])
 @use_args(
     {
@@ -0,0 +1,35 @@
+from flask import jsonify
+from webargs import fields, validate
+from app.repository.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.api.streaming import STREAM_FORMATS
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def fields_arg(field_names):
+    """Sparse fieldset: comma-separated subset of field_names, all fields when omitted"""
+    return fields.DelimitedList(fields.String(validate=validate.OneOf(field_names)), load_default=None)
+
+
+def page_args(sort_columns, field_names, **filters):
+    """Query arguments of a keyset-paged list: limit, cursor, sort (prefix "-" for descending), fields and filters.
+
+    stream=json|ndjson returns every matching row in one streamed response instead of a page.
+    """
+    sort_keys = list(sort_columns)
+    return {
+        "limit": fields.Integer(load_default=DEFAULT_PAGE_SIZE, validate=validate.Range(min=1, max=MAX_PAGE_SIZE)),
+        "cursor": fields.String(load_default=None),
+        "sort": fields.String(load_default="id", validate=validate.OneOf(sort_keys + [f"-{key}" for key in sort_keys])),
+        "fields": fields_arg(field_names),
+        "stream": fields.String(load_default=None, validate=validate.OneOf(STREAM_FORMATS)),
+        **filters
+    }
+
+
+def page_response(items, next_cursor):
+    """JSON list of one page; the token for the following page, if any, goes in X-Next-Cursor"""
+    response = jsonify(items)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
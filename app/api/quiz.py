@@ -1,8 +1,15 @@
-from flask import Blueprint, request, jsonify
-from app.blc.quizBLC import QuizBLC, QuizQuestionBLC, QuizSubmissionBLC, QuizGradingBLC, QuizResultBLC
-from app.schema.quiz_schema import QuizSchema, QuizQuestionSchema, QuizSubmissionSchema, QuizResultSchema, QuizSubmitSchema
+from flask import Blueprint, request, jsonify, current_app, url_for, make_response
+from app.blc.quizBLC import (
+    QuizBLC, QuizQuestionBLC, QuizSubmissionBLC, QuizGradingBLC, QuizResultBLC, QuizAnalyticsBLC, QuizExportBLC
+)
+from app.blc.gradingQueueBLC import GradingQueueBLC
+from app.blc.quizImportBLC import QuizImportBLC, IMPORT_FORMATS
+from app.schema.quiz_schema import QuizSchema, QuizQuestionSchema, QuizQuestionSetSchema, QuizSubmissionSchema, QuizResultSchema, QuizSubmitSchema
+from app.api.streaming import EXPORT_FORMATS, export_response, upload_lines
+from app.api.coalescing import coalesce_requests
+from app.repository.quiz_export_repository import RESULT_EXPORT_COLUMNS, ANSWER_EXPORT_COLUMNS
 from webargs.flaskparser import use_args
-from webargs import fields
+from webargs import fields, validate
 from datetime import datetime
 from marshmallow import ValidationError
 
@@ -36,10 +43,11 @@ def create_quiz():
 
 
 @bp.route("/<int:quiz_id>", methods=["GET"])
+@coalesce_requests
 def get_quiz(quiz_id):
     """Get quiz details with questions"""
     try:
-        quiz = QuizBLC.get_quiz_by_id(quiz_id)
+        quiz = QuizBLC.get_quiz_with_questions(quiz_id)
         
         quiz_data = {
             "id": quiz.id,
@@ -48,11 +56,12 @@ def get_quiz(quiz_id):
             "title": quiz.title,
             "description": quiz.description,
             "total_marks": quiz.total_marks,
+            "weight": quiz.weight,
             "duration_minutes": quiz.duration_minutes,
-            "start_date": quiz.start_date.isoformat() if quiz.start_date else None,
-            "end_date": quiz.end_date.isoformat() if quiz.end_date else None,
+            "start_date": quiz.start_date,
+            "end_date": quiz.end_date,
             "is_active": quiz.is_active,
-            "created_at": quiz.created_at.isoformat() if quiz.created_at else None,
+            "created_at": quiz.created_at,
             "question_count": len(quiz.questions),
             "questions": [{
                 "id": q.id,
@@ -83,15 +92,18 @@ def get_quizzes_by_course(course_id):
         
         quiz_list = [{
             "id": quiz.id,
+            "course_name": quiz.course_name,
             "title": quiz.title,
             "description": quiz.description,
             "total_marks": quiz.total_marks,
+            "weight": quiz.weight,
             "duration_minutes": quiz.duration_minutes,
-            "start_date": quiz.start_date.isoformat() if quiz.start_date else None,
-            "end_date": quiz.end_date.isoformat() if quiz.end_date else None,
+            "start_date": quiz.start_date,
+            "end_date": quiz.end_date,
             "is_active": quiz.is_active,
-            "created_at": quiz.created_at.isoformat() if quiz.created_at else None,
-            "question_count": len(quiz.questions)
+            "created_at": quiz.created_at,
+            "question_count": quiz.question_count,
+            "question_marks": quiz.question_marks
         } for quiz in quizzes]
         
         return jsonify(quiz_list), 200
@@ -134,6 +146,28 @@ def delete_quiz(quiz_id):
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
 
+@bp.route("/<int:quiz_id>/clone", methods=["POST"])
+@use_args(
+    {
+        "course_id": fields.Integer(load_default=None),
+        "title": fields.String(load_default=None, validate=validate.Length(min=5, max=200)),
+        "start_date": fields.DateTime(load_default=None),
+        "end_date": fields.DateTime(load_default=None)
+    },
+    location="json"
+)
+def clone_quiz(args: dict, quiz_id):
+    """Copy a quiz and all its questions into another course or date window (Teacher)"""
+    try:
+        result = QuizBLC.clone_quiz(quiz_id, **args)
+        return jsonify(result), 201
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
 # Quiz Question Management Endpoints
 
 @bp.route("/<int:quiz_id>/questions", methods=["POST"])
@@ -159,7 +193,22 @@ def add_question_to_quiz(quiz_id):
 
 
 
+@bp.route("/<int:quiz_id>/questions/bulk", methods=["POST"])
+@use_args(QuizQuestionSetSchema(), location="json")
+def add_questions_to_quiz(args: dict, quiz_id):
+    """Append an ordered set of questions to a quiz in one transaction (Teacher)"""
+    try:
+        result = QuizQuestionBLC.add_questions_to_quiz(quiz_id, args["questions"])
+        return jsonify(result), 201
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
 @bp.route("/<int:quiz_id>/questions", methods=["GET"])
+@coalesce_requests
 def get_quiz_questions(quiz_id):
     """Get all questions for a quiz"""
     try:
@@ -220,13 +269,15 @@ def get_available_quizzes_for_student(student_id, course_id):
         
         quiz_list = [{
             "id": quiz.id,
+            "course_name": quiz.course_name,
             "title": quiz.title,
             "description": quiz.description,
             "total_marks": quiz.total_marks,
             "duration_minutes": quiz.duration_minutes,
-            "start_date": quiz.start_date.isoformat() if quiz.start_date else None,
-            "end_date": quiz.end_date.isoformat() if quiz.end_date else None,
-            "question_count": len(quiz.questions)
+            "start_date": quiz.start_date,
+            "end_date": quiz.end_date,
+            "question_count": quiz.question_count,
+            "question_marks": quiz.question_marks
         } for quiz in quizzes]
         
         return jsonify(quiz_list), 200
@@ -237,12 +288,44 @@ def get_available_quizzes_for_student(student_id, course_id):
         return jsonify({"error": f"Error fetching available quizzes: {str(e)}"}), 500
 
 
+@bp.route("/student/<int:student_id>/available", methods=["GET"])
+def get_available_quizzes_for_student_all_courses(student_id):
+    """Get open quizzes across all of a student's enrolled courses"""
+    try:
+        quizzes = QuizBLC.get_available_quizzes_for_student(student_id)
+        
+        quiz_list = [{
+            "id": quiz.id,
+            "course_id": quiz.course_id,
+            "course_name": quiz.course_name,
+            "title": quiz.title,
+            "description": quiz.description,
+            "total_marks": quiz.total_marks,
+            "duration_minutes": quiz.duration_minutes,
+            "start_date": quiz.start_date,
+            "end_date": quiz.end_date,
+            "question_count": quiz.question_count,
+            "question_marks": quiz.question_marks
+        } for quiz in quizzes]
+        
+        return jsonify(quiz_list), 200
+        
+    except Exception as e:
+        return jsonify({"error": f"Error fetching available quizzes: {str(e)}"}), 500
+
+
 @bp.route("/student/<int:student_id>/quiz/<int:quiz_id>/preview", methods=["GET"])
 def preview_quiz_for_student(student_id, quiz_id):
     """Allow student to preview quiz questions before attempting"""
     try:
         quiz_preview = QuizBLC.preview_quiz_for_student(student_id, quiz_id)
-        return jsonify(quiz_preview), 200
+        
+        # Serve the pre-encoded body; a matching If-None-Match gets a 304
+        response = make_response(quiz_preview.body)
+        response.mimetype = "application/json"
+        response.set_etag(quiz_preview.etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response.make_conditional(request)
         
     except ValueError as e:
         # Handle business logic errors (enrollment, already submitted, etc.)
@@ -274,13 +357,12 @@ def submit_quiz(student_id, quiz_id):
             answers = [answer.strip() for answer in text.split(',')]
         else:
             answers = [text.strip()]
-        questions = QuizQuestionBLC.get_quiz_questions(quiz_id)
-        sorted_questions = sorted(questions, key=lambda x: x.order_number)
+        question_ids = QuizQuestionBLC.get_ordered_question_ids(quiz_id)
         formatted_answers = []
-        for i, question in enumerate(sorted_questions):
+        for i, question_id in enumerate(question_ids):
             answer_text = answers[i] if i < len(answers) else ""
             formatted_answers.append({
-                "question_id": question.id,
+                "question_id": question_id,
                 "answer": answer_text
             })
         submission_data = {
@@ -288,7 +370,14 @@ def submit_quiz(student_id, quiz_id):
             "answers": formatted_answers
         }
         
-        result = QuizSubmissionBLC.submit_quiz(student_id, submission_data)
+        # Async grading is enabled by config and can be chosen per request with ?async=true|false
+        async_arg = request.args.get("async")
+        defer_grading = current_app.config["ASYNC_GRADING"] if async_arg is None else async_arg.lower() in ("1", "true")
+        
+        result = QuizSubmissionBLC.submit_quiz(student_id, submission_data, defer_grading=defer_grading)
+        if defer_grading:
+            result["status_url"] = url_for("quiz.get_submission_status", submission_id=result["submission_id"])
+            return jsonify(result), 202
         return jsonify(result), 201
         
     except Exception as e:
@@ -304,7 +393,7 @@ def get_quiz_submissions(quiz_id):
             "id": submission.id,
             "student_id": submission.student_id,
             "student_name": f"{submission.student.first_name} {submission.student.last_name}",
-            "submitted_at": submission.submitted_at.isoformat() if submission.submitted_at else None,
+            "submitted_at": submission.submitted_at,
             "time_taken_minutes": submission.time_taken_minutes,
             "is_completed": submission.is_completed
         } for submission in submissions]
@@ -315,6 +404,50 @@ def get_quiz_submissions(quiz_id):
         return jsonify({"error": f"Error fetching submissions: {str(e)}"}), 500
 
 
+@bp.route("/<int:quiz_id>/submissions/import", methods=["POST"])
+@use_args({"format": fields.String(load_default=None, validate=validate.OneOf(IMPORT_FORMATS))}, location="query")
+def import_quiz_submissions(args: dict, quiz_id):
+    """Import paper answer sheets for many students from a CSV or NDJSON upload (Teacher)"""
+    try:
+        lines, import_format = upload_lines(args["format"])
+        result = QuizImportBLC.import_submissions(
+            quiz_id,
+            lines,
+            import_format,
+            chunk_size=current_app.config["IMPORT_GRADING_CHUNK_SIZE"]
+        )
+        return jsonify(result), 200
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Import error: {str(e)}"}), 500
+
+
+@bp.route("/submissions/<int:submission_id>/status", methods=["GET"])
+def get_submission_status(submission_id):
+    """Get grading status of a submission (pending, processing, done, failed)"""
+    try:
+        status = GradingQueueBLC.get_submission_status(submission_id)
+        return jsonify(status), 200
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error fetching submission status: {str(e)}"}), 500
+
+
+@bp.route("/grading/metrics", methods=["GET"])
+def get_grading_metrics():
+    """Get grading queue depth and grading lag"""
+    try:
+        metrics = GradingQueueBLC.get_metrics()
+        return jsonify(metrics), 200
+        
+    except Exception as e:
+        return jsonify({"error": f"Error fetching grading metrics: {str(e)}"}), 500
+
+
 @bp.route("/submissions/<int:submission_id>/answers", methods=["GET"])
 def get_submission_answers(submission_id):
     """Get detailed answers for a specific submission (Teacher view)"""
@@ -350,6 +483,21 @@ def manual_grade_submission(submission_id):
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
 
+@bp.route("/<int:quiz_id>/regrade", methods=["POST"])
+def regrade_quiz(quiz_id):
+    """Regrade all submissions of a quiz, keeping teacher overrides (Teacher)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        
+        result = QuizGradingBLC.regrade_quiz(quiz_id, question_ids=data.get("question_ids"))
+        return jsonify(result), 200
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
 @bp.route("/<int:quiz_id>/results", methods=["GET"])
 def get_quiz_results(quiz_id):
     """Get all results for a quiz (Teacher view)"""
@@ -365,7 +513,7 @@ def get_quiz_results(quiz_id):
             "percentage": result.percentage,
             "grade": result.grade,
             "graded_by_teacher": result.graded_by_teacher,
-            "created_at": result.created_at.isoformat() if result.created_at else None
+            "created_at": result.created_at
         } for result in results]
         
         return jsonify(result_list), 200
@@ -374,6 +522,78 @@ def get_quiz_results(quiz_id):
         return jsonify({"error": f"Error fetching results: {str(e)}"}), 500
 
 
+export_args = {"format": fields.String(load_default="csv", validate=validate.OneOf(EXPORT_FORMATS))}
+
+
+@bp.route("/<int:quiz_id>/results/export", methods=["GET"])
+@use_args(export_args, location="query")
+def export_quiz_results(args: dict, quiz_id):
+    """Stream all results for a quiz as CSV or NDJSON (Teacher view)"""
+    try:
+        rows = QuizExportBLC.export_quiz_results(quiz_id)
+        return export_response(rows, RESULT_EXPORT_COLUMNS, args["format"], f"quiz-{quiz_id}-results")
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error exporting results: {str(e)}"}), 500
+
+
+@bp.route("/<int:quiz_id>/answers/export", methods=["GET"])
+@use_args(export_args, location="query")
+def export_quiz_answers(args: dict, quiz_id):
+    """Stream every submitted answer for a quiz as CSV or NDJSON (Teacher view)"""
+    try:
+        rows = QuizExportBLC.export_quiz_answers(quiz_id)
+        return export_response(rows, ANSWER_EXPORT_COLUMNS, args["format"], f"quiz-{quiz_id}-answers")
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error exporting answers: {str(e)}"}), 500
+
+
+@bp.route("/course/<int:course_id>/results/export", methods=["GET"])
+@use_args(export_args, location="query")
+def export_course_results(args: dict, course_id):
+    """Stream results of every quiz in a course as CSV or NDJSON (Teacher view)"""
+    try:
+        rows = QuizExportBLC.export_course_results(course_id)
+        return export_response(rows, RESULT_EXPORT_COLUMNS, args["format"], f"course-{course_id}-results")
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error exporting results: {str(e)}"}), 500
+
+
+@bp.route("/<int:quiz_id>/stats", methods=["GET"])
+def get_quiz_stats(quiz_id):
+    """Get summary statistics for a quiz: mean, median estimate, max, pass rate and grade counts"""
+    try:
+        stats = QuizResultBLC.get_quiz_stats(quiz_id)
+        return jsonify(stats), 200
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error fetching quiz stats: {str(e)}"}), 500
+
+
+@bp.route("/<int:quiz_id>/analytics", methods=["GET"])
+@use_args({"bins": fields.Integer(load_default=10, validate=lambda n: 1 <= n <= 100)}, location="query")
+def get_quiz_analytics(args: dict, quiz_id):
+    """Get item analysis for a quiz: difficulty, discrimination, distractors and score histogram (Teacher view)"""
+    try:
+        analysis = QuizAnalyticsBLC.get_item_analysis(quiz_id, histogram_bins=args["bins"])
+        return jsonify(analysis), 200
+        
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": f"Error fetching quiz analytics: {str(e)}"}), 500
+
+
 @bp.route("/submissions/<int:submission_id>/result", methods=["GET"])
 def get_submission_result(submission_id):
     """Get result for a specific submission"""
@@ -389,8 +609,8 @@ def get_submission_result(submission_id):
             "grade": result.grade,
             "feedback": result.feedback,
             "graded_by_teacher": result.graded_by_teacher,
-            "graded_at": result.graded_at.isoformat() if result.graded_at else None,
-            "created_at": result.created_at.isoformat() if result.created_at else None
+            "graded_at": result.graded_at,
+            "created_at": result.created_at
         }
         
         return jsonify(result_data), 200
@@ -414,8 +634,8 @@ def get_student_results_by_course(student_id, course_id):
             "percentage": result.percentage,
             "grade": result.grade,
             "feedback": result.feedback,
-            "submitted_at": result.submission.submitted_at.isoformat() if result.submission.submitted_at else None,
-            "graded_at": result.graded_at.isoformat() if result.graded_at else None
+            "submitted_at": result.submission.submitted_at,
+            "graded_at": result.graded_at
         } for result in results]
         
         return jsonify(result_list), 200
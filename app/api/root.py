@@ -1,7 +1,21 @@
 from flask import Flask, Blueprint, jsonify
+from app.api.coalescing import single_flight
+from app.repository.password_hasher import password_hasher
 
 bp = Blueprint("root", __name__)
 
 @bp.route("/")
 def root():
-    return("Welcome to School Management System", 200)
\ No newline at end of file
+    return("Welcome to School Management System", 200)
+
+
+@bp.route("/metrics/coalescing")
+def coalescing_metrics():
+    """Counts of requests served by an identical in-flight request"""
+    return jsonify(single_flight.stats()), 200
+
+
+@bp.route("/metrics/password-hashing")
+def password_hashing_metrics():
+    """Password hashing pool load, and logins turned away while it was saturated"""
+    return jsonify(password_hasher.stats()), 200
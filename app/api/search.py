@@ -0,0 +1,25 @@
+from flask import Blueprint, jsonify
+from app.blc.searchBLC import SearchBLC
+from app.repository.search_repository import SEARCH_TYPES
+from webargs.flaskparser import use_args
+from webargs import fields, validate
+
+bp = Blueprint("search", __name__)
+
+
+@bp.route("/search", methods=["GET"])
+@use_args(
+    {
+        "q": fields.String(required=True, validate=validate.Length(min=1, max=200)),
+        "type": fields.DelimitedList(fields.String(validate=validate.OneOf(SEARCH_TYPES)), load_default=None),
+        "limit": fields.Integer(load_default=20, validate=validate.Range(min=1, max=100)),
+        "offset": fields.Integer(load_default=0, validate=validate.Range(min=0, max=10000))
+    },
+    location="query",
+)
+def search(args: dict):
+    """Search student names and emails, teacher names and subjects, and course names and descriptions."""
+    try:
+        return jsonify(SearchBLC.search(args)), 200
+    except Exception as e:
+        return jsonify({"error": f"Error searching: {str(e)}"}), 500
@@ -0,0 +1,111 @@
+import csv
+import io
+from datetime import date, datetime
+from flask import Response, current_app, request, stream_with_context
+
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# Whole-collection modes of the list endpoints (?stream=json|ndjson)
+STREAM_FORMATS = ("json", "ndjson")
+
+EXPORT_MIMETYPES = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows buffered before a chunk is sent to the client
+ROWS_PER_CHUNK = 500
+
+
+def _export_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(rows, columns):
+    """Encode rows as CSV text chunks, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 1
+    for row in rows:
+        writer.writerow([_export_value(value) for value in row])
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def iter_ndjson(rows, columns, dumps_bytes):
+    """Encode rows as newline-delimited JSON objects; dumps_bytes writes the dates"""
+    return iter_json_lines((dict(zip(columns, row)) for row in rows), dumps_bytes)
+
+
+def export_response(rows, columns, export_format, filename):
+    """Stream rows as a CSV or NDJSON attachment without building the body in memory"""
+    if export_format == "csv":
+        body = iter_csv(rows, columns)
+    else:
+        body = iter_ndjson(rows, columns, current_app.json.dumps_bytes)
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+
+def iter_json_array(items, dumps_bytes):
+    """Encode dicts as one JSON array, a chunk of ROWS_PER_CHUNK items at a time"""
+    yield b"["
+    separator = b""
+    chunk = []
+    for item in items:
+        chunk.append(dumps_bytes(item))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield separator + b",".join(chunk)
+            separator = b","
+            chunk = []
+    if chunk:
+        yield separator + b",".join(chunk)
+    yield b"]"
+
+
+def iter_json_lines(items, dumps_bytes):
+    """Encode dicts as newline-delimited JSON"""
+    chunk = []
+    for item in items:
+        chunk.append(dumps_bytes(item))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield b"\n".join(chunk) + b"\n"
+            chunk = []
+    if chunk:
+        yield b"\n".join(chunk) + b"\n"
+
+
+def stream_response(items, stream_format):
+    """Stream an iterable of dicts as a JSON array or NDJSON using the app's JSON provider"""
+    encode = iter_json_array if stream_format == "json" else iter_json_lines
+    return Response(
+        stream_with_context(encode(items, current_app.json.dumps_bytes)),
+        mimetype=EXPORT_MIMETYPES[stream_format]
+    )
+
+
+def upload_lines(import_format=None):
+    """Text lines of an uploaded file (multipart "file") or of the raw request body, and its format.
+
+    Without an explicit format, .ndjson/.jsonl filenames are NDJSON and everything else CSV.
+    """
+    upload = request.files.get("file")
+    stream = upload.stream if upload else request.stream
+    if import_format is None:
+        filename = (upload.filename or "") if upload else ""
+        import_format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""), import_format
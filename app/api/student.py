@@ -1,7 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.blc.studentBLC import StudentBLC
 from webargs.flaskparser import use_args
-from webargs import fields
+from webargs import fields, validate
+from app.api.streaming import stream_response, upload_lines
+from app.blc.quizImportBLC import IMPORT_FORMATS
+from app.blc.rosterImportBLC import RosterImportBLC
+from app.api.pagination import fields_arg, page_args, page_response
+from app.repository.pagination import InvalidCursor
+from app.repository.student_repository import STUDENT_PROJECTION, STUDENT_SORT_COLUMNS
 from app.model.models import Student
 from app.extension import db
 
@@ -9,44 +15,52 @@ bp = Blueprint("student", __name__)
 
 
 @bp.route("/students/list", methods=["GET"])
-def get_all_students():
-    """Get all students."""
-    students = StudentBLC.get_all_students()
-    return jsonify([{
-        "id": student.id,
-        "first_name": student.first_name,
-        "last_name": student.last_name,
-        "email": student.email,
-        "date_of_birth": student.date_of_birth.isoformat() if student.date_of_birth else None,
-        "grade": student.grade,
-        "address": student.address,
-        "phone": student.phone,
-        "created_at": student.created_at.isoformat() if student.created_at else None,
-        "updated_at": student.updated_at.isoformat() if student.updated_at else None
-    } for student in students])
+@use_args(
+    page_args(
+        STUDENT_SORT_COLUMNS,
+        STUDENT_PROJECTION.field_names,
+        grade=fields.Integer(),
+        last_name=fields.String(),
+        email=fields.String()
+    ),
+    location="query",
+)
+def get_all_students(args: dict):
+    """Get one page of students."""
+    if args["stream"]:
+        return stream_response(StudentBLC.iter_students(args), args["stream"])
+    try:
+        students, next_cursor = StudentBLC.get_all_students(args)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return page_response(students, next_cursor)
 
 
 @bp.route("/students/detail/<int:id>", methods=["GET"])
-def get_student(id):
+@use_args({"fields": fields_arg(STUDENT_PROJECTION.field_names)}, location="query")
+def get_student(args: dict, id):
     """Get a student by ID."""
     try:
-        student = StudentBLC.get_student_by_id(id)
-        return jsonify({
-            "id": student.id,
-            "first_name": student.first_name,
-            "last_name": student.last_name,
-            "email": student.email,
-            "date_of_birth": student.date_of_birth.isoformat() if student.date_of_birth else None,
-            "grade": student.grade,
-            "address": student.address,
-            "phone": student.phone,
-            "created_at": student.created_at.isoformat() if student.created_at else None,
-            "updated_at": student.updated_at.isoformat() if student.updated_at else None
-        })
+        student = StudentBLC.get_student_by_id(id, args["fields"])
+        return jsonify(student)
     except Exception as e:
         return jsonify({"error": str(e)}), 404
 
 
+@bp.route("/students/import", methods=["POST"])
+@use_args({"format": fields.String(load_default=None, validate=validate.OneOf(IMPORT_FORMATS))}, location="query")
+def import_students(args: dict):
+    """Bulk create students from a CSV or NDJSON upload; returns a row-level error report."""
+    try:
+        lines, import_format = upload_lines(args["format"])
+        result = RosterImportBLC.import_students(lines, import_format, current_app.config["ROSTER_IMPORT_CHUNK_SIZE"])
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Import error: {str(e)}"}), 500
+
+
 @bp.route("/students/create", methods=["POST"])
 @use_args(
     {
@@ -1,44 +1,59 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.blc.teacherBLC import TeacherBLC
 from webargs.flaskparser import use_args
-from webargs import fields
+from webargs import fields, validate
+from app.api.streaming import stream_response, upload_lines
+from app.blc.quizImportBLC import IMPORT_FORMATS
+from app.blc.rosterImportBLC import RosterImportBLC
+from app.api.pagination import fields_arg, page_args, page_response
+from app.repository.pagination import InvalidCursor
+from app.repository.teacher_repository import TEACHER_PROJECTION, TEACHER_SORT_COLUMNS
 
 bp = Blueprint("teacher", __name__, url_prefix="/teachers")
 
 @bp.route("/list", methods=["GET"])
-def get_all_teachers():
-    teachers = TeacherBLC.get_all_teachers()
-    return jsonify([{
-        "id": teacher.id,
-        "first_name": teacher.first_name,
-        "last_name": teacher.last_name,
-        "email": teacher.email,
-        "subject": teacher.subject,
-        "qualification": teacher.qualification,
-        "phone": teacher.phone,
-        "created_at": teacher.created_at.isoformat() if teacher.created_at else None,
-        "updated_at": teacher.updated_at.isoformat() if teacher.updated_at else None
-    } for teacher in teachers])
+@use_args(
+    page_args(
+        TEACHER_SORT_COLUMNS,
+        TEACHER_PROJECTION.field_names,
+        subject=fields.String(),
+        qualification=fields.String()
+    ),
+    location="query",
+)
+def get_all_teachers(args: dict):
+    if args["stream"]:
+        return stream_response(TeacherBLC.iter_teachers(args), args["stream"])
+    try:
+        teachers, next_cursor = TeacherBLC.get_all_teachers(args)
+    except InvalidCursor as e:
+        return jsonify({"error": str(e)}), 400
+    return page_response(teachers, next_cursor)
 
 
 @bp.route("/detail/<int:id>", methods=["GET"])
-def get_teacher(id):
+@use_args({"fields": fields_arg(TEACHER_PROJECTION.field_names)}, location="query")
+def get_teacher(args: dict, id):
     try:
-        teacher = TeacherBLC.get_teacher_by_id(id)
-        return jsonify({
-            "id": teacher.id,
-            "first_name": teacher.first_name,
-            "last_name": teacher.last_name,
-            "email": teacher.email,
-            "subject": teacher.subject,
-            "qualification": teacher.qualification,
-            "phone": teacher.phone,
-            "created_at": teacher.created_at.isoformat() if teacher.created_at else None,
-            "updated_at": teacher.updated_at.isoformat() if teacher.updated_at else None
-        })
+        teacher = TeacherBLC.get_teacher_by_id(id, args["fields"])
+        return jsonify(teacher)
     except Exception as e:
         return jsonify({"error": str(e)}), 404
 
+@bp.route("/import", methods=["POST"])
+@use_args({"format": fields.String(load_default=None, validate=validate.OneOf(IMPORT_FORMATS))}, location="query")
+def import_teachers(args: dict):
+    """Bulk create teachers from a CSV or NDJSON upload; returns a row-level error report."""
+    try:
+        lines, import_format = upload_lines(args["format"])
+        result = RosterImportBLC.import_teachers(lines, import_format, current_app.config["ROSTER_IMPORT_CHUNK_SIZE"])
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"Import error: {str(e)}"}), 500
+
+
 @bp.route("/create", methods=["POST"])
 @use_args(
     {
@@ -1,11 +1,10 @@
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, request, jsonify, g
 from app.blc.userBLC import UserBLC
+from app.repository.password_hasher import PasswordHasherBusy
+from app.blc.tokenBLC import TokenBLC
 from webargs.flaskparser import use_args
 from webargs import fields
 import jwt
-import datetime
-import os
 
 bp = Blueprint("user", __name__)
 
@@ -16,7 +15,10 @@ bp = Blueprint("user", __name__)
     location="json",
 )
 def user_signup(args: dict):
-    user = UserBLC.user_signup(args=args)
+    try:
+        user = UserBLC.user_signup(args=args)
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     return jsonify(user)
 
 @bp.route("/login", methods=["POST"])
@@ -27,28 +29,49 @@ def user_signup(args: dict):
 def user_login(args: dict):
     try:
         user = UserBLC.user_login(args=args)
-        
+
         if user:
-            secret_key = os.getenv('JWT_SECRET_KEY', 'fallback-secret-key')
-            token = jwt.encode(
-                {
-                    "email": user.get("email"),
-                    "user_id": user.get("user_id"),
-                    "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=24)
-                },
-                secret_key,
-                algorithm="HS256"
-            )
+            tokens = TokenBLC.issue_tokens(user["user_id"], user["email"])
             return jsonify({
                 "message": "Login successful",
-                "access_token": token,
+                **tokens,
                 "user": {
                     "id": user["user_id"],
                     "email": user["email"],
                     "username": user.get("username", "")
                 }
             })
+    except PasswordHasherBusy as e:
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         return jsonify({"error": str(e)}), 401
-    
-    return jsonify({"error": "Invalid credentials"}), 401
\ No newline at end of file
+
+    return jsonify({"error": "Invalid credentials"}), 401
+
+
+@bp.route("/token/refresh", methods=["POST"])
+@use_args({"refresh_token": fields.String(required=True)}, location="json")
+def refresh_token(args: dict):
+    """Exchange a refresh token for a new access/refresh token pair; each refresh token works once"""
+    try:
+        tokens = TokenBLC.refresh(args["refresh_token"])
+        return jsonify(tokens), 200
+    except jwt.InvalidTokenError as e:
+        return jsonify({"error": f"Invalid token: {str(e)}"}), 401
+    except Exception as e:
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+@bp.route("/logout", methods=["POST"])
+@use_args({"refresh_token": fields.String(load_default=None)}, location="json")
+def logout(args: dict):
+    """Revoke the request's access token and, if given, its refresh token"""
+    try:
+        if not g.token:
+            return jsonify({"error": "Authentication required"}), 401
+        result = TokenBLC.revoke(g.token, args["refresh_token"])
+        return jsonify(result), 200
+    except jwt.InvalidTokenError as e:
+        return jsonify({"error": f"Invalid token: {str(e)}"}), 401
+    except Exception as e:
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
@@ -1,14 +1,25 @@
 from app.repository.course_repository import CourseRepository
+from app.repository.pagination import PAGE_ARGS
+from app.repository.gradebook_repository import GradebookRepository
+from app.repository.course_grade_repository import CourseGradeRepository
+from app.repository.course_seat_repository import CourseSeatRepository
 
 class CourseBLC:
     @staticmethod
-    def get_all_courses():
-        courses = CourseRepository.get_all_courses()
-        return courses
+    def get_all_courses(args: dict):
+        """Get one page of courses; returns (courses, next_cursor)."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return CourseRepository.get_all_courses(filters, args["sort"], args["limit"], args.get("cursor"), args.get("fields"))
     
     @staticmethod
-    def get_course_by_id(course_id: int):
-        course = CourseRepository.get_course_by_id(course_id)
+    def iter_courses(args: dict):
+        """Stream every matching course, ignoring limit and cursor."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return CourseRepository.iter_courses(filters, args["sort"], args.get("fields"))
+    
+    @staticmethod
+    def get_course_by_id(course_id: int, fields=None):
+        course = CourseRepository.get_course_by_id(course_id, fields)
         return course
     
     @staticmethod
@@ -25,3 +36,19 @@ class CourseBLC:
     def delete_course(course_id: int):
         result = CourseRepository.delete_course(course_id)
         return {"course_id": course_id, "message": "Course deleted successfully"}
+    
+    @staticmethod
+    def get_gradebook(course_id: int):
+        gradebook = GradebookRepository.get_gradebook(course_id)
+        return gradebook
+    
+    @staticmethod
+    def recompute_grades(course_id=None):
+        result = CourseGradeRepository.recompute_course(course_id)
+        return {**result, "message": "Course grades recomputed successfully"}
+    
+    @staticmethod
+    def sync_seats(course_id=None):
+        """Reset enrolled_count from the enrollments table for one course or all courses."""
+        courses_corrected = CourseSeatRepository.sync_seats(course_id)
+        return {"course_id": course_id, "courses_corrected": courses_corrected}
@@ -1,19 +1,27 @@
 from app.repository.enrollment_repository import EnrollmentRepository
+from app.repository.pagination import PAGE_ARGS
 
 class EnrollmentBLC:
     @staticmethod
-    def get_all_enrollments():
-        enrollments = EnrollmentRepository.get_all_enrollments()
-        return enrollments
+    def get_all_enrollments(args: dict):
+        """Get one page of enrollments; returns (enrollments, next_cursor)."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return EnrollmentRepository.get_all_enrollments(filters, args["sort"], args["limit"], args.get("cursor"), args.get("fields"))
+    
+    @staticmethod
+    def iter_enrollments(args: dict):
+        """Stream every matching enrollment, ignoring limit and cursor."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return EnrollmentRepository.iter_enrollments(filters, args["sort"], args.get("fields"))
     
     @staticmethod
-    def get_enrollments_by_student(student_id: int):
-        enrollments = EnrollmentRepository.get_enrollments_by_student(student_id)
+    def get_enrollments_by_student(student_id: int, fields=None):
+        enrollments = EnrollmentRepository.get_enrollments_by_student(student_id, fields)
         return enrollments
     
     @staticmethod
-    def get_enrollments_by_course(course_id: int):
-        enrollments = EnrollmentRepository.get_enrollments_by_course(course_id)
+    def get_enrollments_by_course(course_id: int, fields=None):
+        enrollments = EnrollmentRepository.get_enrollments_by_course(course_id, fields)
         return enrollments
     
     @staticmethod
@@ -21,6 +29,21 @@ class EnrollmentBLC:
         enrollment_id = EnrollmentRepository.create_enrollment(args)
         return {"enrollment_id": enrollment_id, "message": "Enrollment created successfully"}
     
+    @staticmethod
+    def bulk_enroll(args: dict):
+        """Enroll a list of students, or a whole grade level, in one course."""
+        results = EnrollmentRepository.bulk_enroll(
+            args["course_id"],
+            student_ids=args.get("student_ids"),
+            grade=args.get("grade"),
+            enrollment_date=args.get("enrollment_date"),
+            status=args.get("status", "active")
+        )
+        summary = {outcome: 0 for outcome in ("created", "skipped", "rejected")}
+        for result in results:
+            summary[result["outcome"]] += 1
+        return {"course_id": args["course_id"], **summary, "results": results, "message": "Bulk enrollment processed"}
+    
     @staticmethod
     def update_enrollment(enrollment_id: int, args: dict):
         enrollment = EnrollmentRepository.update_enrollment(enrollment_id, args)
@@ -0,0 +1,100 @@
+import os
+import socket
+import threading
+from app.extension import db
+from app.repository.grading_queue_repository import GradingQueueRepository
+from app.repository.quiz_repository import QuizGradingRepository
+from app.repository.answer_key_cache import answer_key_cache
+
+
+class GradingQueueBLC:
+
+    @staticmethod
+    def process_next(worker_id, stale_after_seconds=300, max_attempts=3):
+        """Grade the next queued submission. Returns False when the queue is empty."""
+        job = GradingQueueRepository.claim_next(worker_id, stale_after_seconds)
+        if job is None:
+            return False
+
+        job_id, submission_id, enqueued_at = job
+        try:
+            QuizGradingRepository.auto_grade_submission(submission_id)
+        except Exception as e:
+            db.session.rollback()
+            GradingQueueRepository.fail(job_id, worker_id, str(e), max_attempts)
+            return True
+
+        GradingQueueRepository.complete(job_id, worker_id, enqueued_at)
+        return True
+
+    @staticmethod
+    def get_submission_status(submission_id):
+        """Get grading status of a submission"""
+        return GradingQueueRepository.get_status(submission_id)
+
+    @staticmethod
+    def get_metrics():
+        """Get grading queue depth, lag and answer key cache metrics"""
+        return {**GradingQueueRepository.get_metrics(), "answer_key_cache": answer_key_cache.stats()}
+
+
+class GradingWorkerPool:
+    """Background threads that drain the grading_jobs queue table"""
+
+    def __init__(self):
+        self._threads = []
+        self._stop = threading.Event()
+
+    def start(self, app, workers):
+        """Start `workers` grading threads for `app`"""
+        self._stop.clear()
+        for index in range(workers):
+            worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+            thread = threading.Thread(target=self._run, args=(app, worker_id), name=f"grading-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Ask every worker to stop after its current job and wait for them"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wait(self):
+        """Block until every worker has stopped"""
+        while any(thread.is_alive() for thread in self._threads):
+            for thread in self._threads:
+                thread.join(1)
+
+    def drain(self, app, worker_id):
+        """Grade queued submissions in the calling thread until the queue is empty"""
+        processed = 0
+        while not self._stop.is_set():
+            with app.app_context():
+                if not GradingQueueBLC.process_next(worker_id, **self._options(app)):
+                    return processed
+            processed += 1
+        return processed
+
+    def _run(self, app, worker_id):
+        poll_seconds = app.config["GRADING_POLL_SECONDS"]
+        while not self._stop.is_set():
+            try:
+                with app.app_context():
+                    processed = GradingQueueBLC.process_next(worker_id, **self._options(app))
+            except Exception as e:
+                app.logger.exception("Grading worker %s failed: %s", worker_id, e)
+                processed = False
+            if not processed:
+                self._stop.wait(poll_seconds)
+
+    @staticmethod
+    def _options(app):
+        return {
+            "stale_after_seconds": app.config["GRADING_JOB_TIMEOUT_SECONDS"],
+            "max_attempts": app.config["GRADING_MAX_ATTEMPTS"]
+        }
+
+
+grading_workers = GradingWorkerPool()
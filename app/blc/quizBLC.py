@@ -1,6 +1,14 @@
 from app.repository.quiz_repository import (
-    QuizRepository, QuizQuestionRepository, QuizSubmissionRepository, QuizResultRepository, QuizGradingRepository
+    QuizRepository, QuizQuestionRepository, QuizSubmissionRepository, QuizResultRepository, QuizGradingRepository,
+    QuizStatsRepository
 )
+from app.repository.quiz_analytics_repository import QuizAnalyticsRepository
+from app.repository.quiz_export_repository import QuizExportRepository
+from app.blc.quizPreviewBLC import QuizPreviewBLC
+
+
+# Question fields that change how existing answers are graded
+GRADING_FIELDS = {'correct_answer', 'marks', 'question_type'}
 
 
 class QuizBLC:
@@ -17,6 +25,12 @@ class QuizBLC:
         quiz = QuizRepository.get_quiz_by_id(quiz_id)
         return quiz
     
+    @staticmethod
+    def get_quiz_with_questions(quiz_id):
+        """Get quiz with its course and questions"""
+        quiz = QuizRepository.get_quiz_with_questions(quiz_id)
+        return quiz
+    
     @staticmethod
     def get_quizzes_by_course(course_id):
         """Get all quizzes for a course"""
@@ -24,15 +38,15 @@ class QuizBLC:
         return quizzes
     
     @staticmethod
-    def get_available_quizzes_for_student(student_id, course_id):
-        """Get available quizzes for a student"""
+    def get_available_quizzes_for_student(student_id, course_id=None):
+        """Get available quizzes for a student, in one course or across all enrolled courses"""
         quizzes = QuizRepository.get_available_quizzes_for_student(student_id, course_id)
         return quizzes
     
     @staticmethod
     def preview_quiz_for_student(student_id, quiz_id):
-        """Allow student to preview quiz questions before attempting"""
-        preview = QuizRepository.get_quiz_preview_for_student(student_id, quiz_id)
+        """Allow student to preview quiz questions before attempting; returns a CachedPreview"""
+        preview = QuizPreviewBLC.get_preview(student_id, quiz_id)
         return preview
     
     @staticmethod
@@ -46,6 +60,12 @@ class QuizBLC:
         """Delete a quiz"""
         result = QuizRepository.delete_quiz(quiz_id)
         return {"quiz_id": quiz_id, "message": "Quiz deleted successfully"}
+    
+    @staticmethod
+    def clone_quiz(quiz_id, course_id=None, title=None, start_date=None, end_date=None):
+        """Copy a quiz and its questions into another course or date window"""
+        clone_id = QuizRepository.clone_quiz(quiz_id, course_id, title, start_date, end_date)
+        return {"quiz_id": clone_id, "source_quiz_id": quiz_id, "message": "Quiz cloned successfully"}
 
 
 class QuizQuestionBLC:
@@ -62,6 +82,12 @@ class QuizQuestionBLC:
         question = QuizQuestionRepository.create_question(question_data)
         return {"question_id": question.id, "message": "Question added successfully"}
     
+    @staticmethod
+    def add_questions_to_quiz(quiz_id, questions_data):
+        """Append an ordered set of questions to a quiz in one transaction"""
+        question_ids = QuizQuestionRepository.create_questions(quiz_id, questions_data)
+        return {"quiz_id": quiz_id, "question_ids": question_ids, "message": f"{len(question_ids)} questions added successfully"}
+    
     @staticmethod
     def get_questions_by_quiz(quiz_id):
         """Get all questions for a quiz"""
@@ -74,25 +100,32 @@ class QuizQuestionBLC:
         questions = QuizQuestionRepository.get_questions_by_quiz(quiz_id)
         return questions
     
+    @staticmethod
+    def get_ordered_question_ids(quiz_id):
+        """Get a quiz's question ids by order_number, from the cached answer key"""
+        return list(QuizGradingRepository.get_answer_key(quiz_id).question_ids)
+    
     @staticmethod
     def update_question(question_id, update_data):
-        """Update a question"""
-        question = QuizQuestionRepository.update_question(question_id, update_data)
+        """Update a question and regrade its answers if the answer key or marks changed"""
+        QuizQuestionRepository.update_question(question_id, update_data, regrade=bool(GRADING_FIELDS.intersection(update_data)))
         return {"question_id": question_id, "message": "Question updated successfully"}
     
     @staticmethod
     def delete_question(question_id):
-        """Delete a question"""
-        result = QuizQuestionRepository.delete_question(question_id)
+        """Delete a question and regrade the quiz's results without it"""
+        QuizQuestionRepository.delete_question(question_id)
         return {"question_id": question_id, "message": "Question deleted successfully"}
 
 
 class QuizSubmissionBLC:
     
     @staticmethod
-    def submit_quiz(student_id, submission_data):
-        """Submit a quiz with answers"""
-        submission_id = QuizSubmissionRepository.submit_quiz(student_id, submission_data)
+    def submit_quiz(student_id, submission_data, defer_grading=False):
+        """Submit a quiz with answers, optionally queueing it for background grading"""
+        submission_id = QuizSubmissionRepository.submit_quiz(student_id, submission_data, defer_grading)
+        if defer_grading:
+            return {"submission_id": submission_id, "status": "pending", "message": "Quiz submitted, grading queued"}
         return {"submission_id": submission_id, "message": "Quiz submitted successfully"}
     
     @staticmethod
@@ -127,6 +160,12 @@ class QuizGradingBLC:
         """Manually grade or update grading for a submission"""
         result = QuizGradingRepository.manual_grade_submission(submission_id, teacher_feedback, override_marks)
         return {"submission_id": submission_id, "message": "Quiz graded by teacher successfully"}
+    
+    @staticmethod
+    def regrade_quiz(quiz_id, question_ids=None):
+        """Regrade all submissions of a quiz after its answer key or marks changed"""
+        result = QuizGradingRepository.regrade_quiz(quiz_id, question_ids)
+        return {"message": "Quiz regraded successfully", **result}
 
 
 class QuizResultBLC:
@@ -148,3 +187,45 @@ class QuizResultBLC:
         """Get result by submission ID"""
         result = QuizResultRepository.get_result_by_submission(submission_id)
         return result
+    
+    @staticmethod
+    def get_quiz_stats(quiz_id):
+        """Get summary statistics for a quiz"""
+        stats = QuizStatsRepository.get_stats(quiz_id)
+        return stats
+    
+    @staticmethod
+    def rebuild_quiz_stats(quiz_id=None, verify_only=False):
+        """Rebuild quiz statistics from results and report drift in the incremental values"""
+        report = QuizStatsRepository.rebuild(quiz_id, verify_only)
+        return report
+
+
+class QuizAnalyticsBLC:
+    
+    @staticmethod
+    def get_item_analysis(quiz_id, histogram_bins=10):
+        """Get difficulty, discrimination and distractor analysis for a quiz"""
+        analysis = QuizAnalyticsRepository.get_item_analysis(quiz_id, histogram_bins)
+        return analysis
+
+
+class QuizExportBLC:
+    
+    @staticmethod
+    def export_quiz_results(quiz_id):
+        """Get a lazy iterator over a quiz's result rows"""
+        QuizExportRepository.ensure_quiz_exists(quiz_id)
+        return QuizExportRepository.iter_quiz_results(quiz_id)
+    
+    @staticmethod
+    def export_quiz_answers(quiz_id):
+        """Get a lazy iterator over a quiz's answer rows"""
+        QuizExportRepository.ensure_quiz_exists(quiz_id)
+        return QuizExportRepository.iter_quiz_answers(quiz_id)
+    
+    @staticmethod
+    def export_course_results(course_id):
+        """Get a lazy iterator over result rows of every quiz in a course"""
+        QuizExportRepository.ensure_course_exists(course_id)
+        return QuizExportRepository.iter_course_results(course_id)
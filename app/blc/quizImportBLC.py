@@ -0,0 +1,140 @@
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from app.repository.answer_key_cache import grade_sheets
+from app.repository.quiz_import_repository import QuizImportRepository
+
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def parse_csv_sheets(lines):
+    """Yield (sheet, error) pairs, one of them None, from CSV lines.
+
+    The header must start with student_id, optionally followed by time_taken_minutes;
+    every remaining column is an answer, in question order.
+    """
+    reader = csv.reader(lines)
+    header = [column.strip().lower() for column in next(reader, [])]
+    if not header or header[0] != "student_id":
+        yield None, {"row": 1, "student_id": None, "error": "Header must start with student_id"}
+        return
+    answers_from = 2 if len(header) > 1 and header[1] == "time_taken_minutes" else 1
+
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        try:
+            yield {
+                "row": reader.line_num,
+                "student_id": int(values[0]),
+                "time_taken_minutes": int(values[1]) if answers_from == 2 and values[1].strip() else None,
+                "answers": [value.strip() for value in values[answers_from:]]
+            }, None
+        except (ValueError, IndexError):
+            yield None, {"row": reader.line_num, "student_id": values[0] or None, "error": "Invalid student_id or time_taken_minutes"}
+
+
+def parse_ndjson_sheets(lines):
+    """Yield (sheet, error) pairs, one of them None, from lines of {"student_id", "answers": [...], "time_taken_minutes"} objects"""
+    for row, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            answers = record.get("answers", [])
+            if not isinstance(answers, list):
+                raise ValueError("answers must be a list")
+            time_taken = record.get("time_taken_minutes")
+            sheet = {
+                "row": row,
+                "student_id": int(record["student_id"]),
+                "time_taken_minutes": int(time_taken) if time_taken is not None else None,
+                "answers": ["" if answer is None else str(answer).strip() for answer in answers]
+            }
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            yield None, {"row": row, "student_id": None, "error": f"Invalid record: {e}"}
+            continue
+        yield sheet, None
+
+
+class GradingProcessPool:
+    """Process pool that grades imported answer sheets, started once by the server or CLI process"""
+
+    def __init__(self):
+        self._executor = None
+        self.processes = 1
+
+    def start(self, processes):
+        """Start `processes` grading processes (0 = one per CPU); with 1, sheets are graded in the importing thread"""
+        self.processes = processes or os.cpu_count() or 1
+        if self.processes > 1:
+            # spawn, not fork: the server already runs grading worker and preview prewarm threads
+            self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def stop(self):
+        """Wait for running chunks and shut the processes down"""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+        self.processes = 1
+
+    def grade(self, answer_key, chunks):
+        """Graded chunks of sheets, on the processes when there is more than one chunk; a single
+        chunk is graded in the calling thread, skipping the pickling round trip"""
+        if len(chunks) <= 1 or self._executor is None:
+            return [grade_sheets(answer_key, chunk) for chunk in chunks]
+        return list(self._executor.map(grade_sheets, [answer_key] * len(chunks), chunks))
+
+
+class SheetGrader:
+    """Grades answer sheets in chunks of chunk_size on a GradingProcessPool"""
+
+    def __init__(self, pool, chunk_size=1000):
+        self.pool = pool
+        self.chunk_size = chunk_size
+
+    def __call__(self, answer_key, sheets):
+        chunks = [sheets[start:start + self.chunk_size] for start in range(0, len(sheets), self.chunk_size)]
+        return [graded for chunk in self.pool.grade(answer_key, chunks) for graded in chunk]
+
+
+class QuizImportBLC:
+
+    @staticmethod
+    def import_submissions(quiz_id, lines, import_format="csv", chunk_size=1000):
+        """Import paper answer sheets for a quiz and grade them on import_grading_pool, reporting rejected rows"""
+        started_at = time.perf_counter()
+
+        parse = parse_csv_sheets if import_format == "csv" else parse_ndjson_sheets
+        grader = SheetGrader(import_grading_pool, chunk_size)
+        errors = []
+
+        def sheet_chunks():
+            # One grading chunk per process is read from the upload at a time
+            parsed = parse(lines)
+            while True:
+                chunk = list(islice(parsed, chunk_size * import_grading_pool.processes))
+                if not chunk:
+                    return
+                errors.extend(error for _, error in chunk if error)
+                yield [sheet for sheet, _ in chunk if sheet]
+
+        imported, rejected = QuizImportRepository.import_submissions(quiz_id, sheet_chunks(), grader)
+        errors = sorted(errors + rejected, key=lambda error: error["row"])
+
+        return {
+            "quiz_id": quiz_id,
+            "imported": imported,
+            "failed": len(errors),
+            "errors": errors,
+            "import_ms": round((time.perf_counter() - started_at) * 1000, 3),
+            "message": "Submissions imported successfully" if imported else "No submissions imported"
+        }
+
+
+import_grading_pool = GradingProcessPool()
@@ -0,0 +1,68 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from app.repository.quiz_repository import QuizRepository
+from app.repository.preview_cache import preview_cache, CachedPreview
+
+
+class QuizPreviewBLC:
+
+    @staticmethod
+    def get_preview(student_id, quiz_id):
+        """Check the student may preview the quiz and return its cached, pre-encoded payload"""
+        content_version = QuizRepository.check_preview_access(student_id, quiz_id)
+        return preview_cache.get((quiz_id, content_version), QuizPreviewBLC._encode_preview)
+
+    @staticmethod
+    def prewarm(window_minutes):
+        """Encode previews of quizzes starting within the next window_minutes. Returns how many were built."""
+        now = datetime.now()  # Use naive datetime to match database
+        warmed = 0
+        for quiz_id, content_version in QuizRepository.get_quizzes_starting_between(now, now + timedelta(minutes=window_minutes)):
+            key = (quiz_id, content_version)
+            if key not in preview_cache:
+                preview_cache.get(key, QuizPreviewBLC._encode_preview)
+                warmed += 1
+        return warmed
+
+    @staticmethod
+    def _encode_preview(key):
+        quiz_id, content_version = key
+        body = current_app.json.dumps_bytes(QuizRepository.get_preview_payload(quiz_id))
+        # Content hash as a strong validator: identical bytes always get the same ETag
+        etag = f"{quiz_id}-{content_version}-{hashlib.sha1(body).hexdigest()[:16]}"
+        return CachedPreview(body, etag)
+
+
+class PreviewPrewarmer:
+    """Background thread that encodes quiz previews shortly before each quiz starts"""
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self, app):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(app,), name="preview-prewarmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, app):
+        window_minutes = app.config["PREVIEW_PREWARM_MINUTES"]
+        interval = app.config["PREVIEW_PREWARM_INTERVAL_SECONDS"]
+        while not self._stop.is_set():
+            try:
+                with app.app_context():
+                    QuizPreviewBLC.prewarm(window_minutes)
+            except Exception as e:
+                app.logger.exception("Preview prewarm failed: %s", e)
+            self._stop.wait(interval)
+
+
+preview_prewarmer = PreviewPrewarmer()
@@ -0,0 +1,96 @@
+import csv
+import json
+import time
+from itertools import islice
+from marshmallow import ValidationError
+from app.blc.quizImportBLC import IMPORT_FORMATS
+from app.model.models import Student, Teacher
+from app.repository.roster_import_repository import RosterImportRepository
+from app.schema.student_schema import StudentCreateSchema
+from app.schema.teacher_schema import TeacherCreateSchema
+
+
+def iter_csv_records(lines):
+    """Yield (row, fields) from CSV lines with a header row; blank values are left out"""
+    reader = csv.DictReader(lines)
+    if reader.fieldnames:
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    for record in reader:
+        fields = {key: value.strip() for key, value in record.items() if key and value and value.strip()}
+        if fields:
+            yield reader.line_num, fields
+
+
+def iter_ndjson_records(lines):
+    """Yield (row, fields) from lines of JSON objects; unparsable lines yield a string error instead"""
+    for row, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            yield row, f"Invalid record: {e}"
+            continue
+        yield row, {key: value for key, value in record.items() if value is not None and value != ""}
+
+
+class RosterImportBLC:
+
+    @staticmethod
+    def import_students(lines, import_format="csv", chunk_size=5000):
+        """Stream student rows from CSV or NDJSON into the database, reporting rejected rows"""
+        return RosterImportBLC._import(Student, StudentCreateSchema(), lines, import_format, chunk_size)
+
+    @staticmethod
+    def import_teachers(lines, import_format="csv", chunk_size=5000):
+        """Stream teacher rows from CSV or NDJSON into the database, reporting rejected rows"""
+        return RosterImportBLC._import(Teacher, TeacherCreateSchema(), lines, import_format, chunk_size)
+
+    @staticmethod
+    def _import(model, schema, lines, import_format, chunk_size):
+        started_at = time.perf_counter()
+        if import_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported format {import_format!r}")
+        records = iter_csv_records(lines) if import_format == "csv" else iter_ndjson_records(lines)
+
+        imported = 0
+        errors = []
+        seen_emails = set()
+        # Only one chunk of rows is held in memory; each is validated, checked and committed in turn
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            valid = []
+            for row, fields in chunk:
+                if isinstance(fields, str):
+                    errors.append({"row": row, "email": None, "error": fields})
+                    continue
+                try:
+                    valid.append((row, schema.load(fields)))
+                except ValidationError as e:
+                    errors.append({"row": row, "email": fields.get("email"), "error": RosterImportBLC._describe(e)})
+            if valid:
+                chunk_imported, chunk_errors = RosterImportRepository.import_chunk(model, valid, seen_emails)
+                imported += chunk_imported
+                errors.extend(chunk_errors)
+
+        elapsed = time.perf_counter() - started_at
+        return {
+            "imported": imported,
+            "failed": len(errors),
+            "errors": sorted(errors, key=lambda error: error["row"] or 0),
+            "import_ms": round(elapsed * 1000, 3),
+            "rows_per_second": round((imported + len(errors)) / elapsed) if elapsed else None,
+            "message": f"{model.__tablename__.capitalize()} imported successfully" if imported else f"No {model.__tablename__} imported"
+        }
+
+    @staticmethod
+    def _describe(error):
+        """One line from a marshmallow error: field: message; unknown columns are reported the same way"""
+        return "; ".join(
+            f"{field}: {' '.join(messages) if isinstance(messages, list) else messages}"
+            for field, messages in sorted(error.messages.items())
+        )
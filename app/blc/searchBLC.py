@@ -0,0 +1,16 @@
+from app.repository.search_repository import SearchRepository
+
+
+class SearchBLC:
+    @staticmethod
+    def search(args: dict):
+        """Ranked search over students, teachers and courses, one page at a time."""
+        # One extra row tells whether another page exists
+        results = SearchRepository.search(args["q"], args.get("type"), args["limit"] + 1, args["offset"])
+        next_offset = args["offset"] + args["limit"] if len(results) > args["limit"] else None
+        return {"query": args["q"], "results": results[:args["limit"]], "next_offset": next_offset}
+
+    @staticmethod
+    def rebuild_index():
+        """Rebuild the search index; returns the number of rows indexed."""
+        return SearchRepository.rebuild_index()
@@ -1,16 +1,23 @@
 from app.repository.student_repository import StudentRepository
+from app.repository.pagination import PAGE_ARGS
 
 class StudentBLC:
     @staticmethod
-    def get_all_students():
-        """Get all students."""
-        students = StudentRepository.get_all_students()
-        return students
+    def get_all_students(args: dict):
+        """Get one page of students; returns (students, next_cursor)."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return StudentRepository.get_all_students(filters, args["sort"], args["limit"], args.get("cursor"), args.get("fields"))
     
     @staticmethod
-    def get_student_by_id(student_id: int):
+    def iter_students(args: dict):
+        """Stream every matching student, ignoring limit and cursor."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return StudentRepository.iter_students(filters, args["sort"], args.get("fields"))
+    
+    @staticmethod
+    def get_student_by_id(student_id: int, fields=None):
         """Get a student by ID."""
-        student = StudentRepository.get_student_by_id(student_id)
+        student = StudentRepository.get_student_by_id(student_id, fields)
         return student
     
     @staticmethod
@@ -1,14 +1,22 @@
 from app.repository.teacher_repository import TeacherRepository
+from app.repository.pagination import PAGE_ARGS
 
 class TeacherBLC:
     @staticmethod
-    def get_all_teachers():
-        teachers = TeacherRepository.get_all_teachers()
-        return teachers
+    def get_all_teachers(args: dict):
+        """Get one page of teachers; returns (teachers, next_cursor)."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return TeacherRepository.get_all_teachers(filters, args["sort"], args["limit"], args.get("cursor"), args.get("fields"))
     
     @staticmethod
-    def get_teacher_by_id(teacher_id: int):
-        teacher = TeacherRepository.get_teacher_by_id(teacher_id)
+    def iter_teachers(args: dict):
+        """Stream every matching teacher, ignoring limit and cursor."""
+        filters = {key: value for key, value in args.items() if key not in PAGE_ARGS}
+        return TeacherRepository.iter_teachers(filters, args["sort"], args.get("fields"))
+    
+    @staticmethod
+    def get_teacher_by_id(teacher_id: int, fields=None):
+        teacher = TeacherRepository.get_teacher_by_id(teacher_id, fields)
         return teacher
     
     @staticmethod
@@ -0,0 +1,107 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+import jwt
+from flask import current_app
+from app.repository.token_denylist import token_denylist, verified_tokens
+from app.repository.token_repository import RevokedTokenRepository
+
+
+TOKEN_ALGORITHM = "HS256"
+
+
+class TokenBLC:
+    """Signed access and refresh tokens. Verifying an access token needs no database access."""
+
+    @staticmethod
+    def issue_tokens(user_id, email):
+        """A new access/refresh token pair for a user"""
+        config = current_app.config
+        access_lifetime = timedelta(minutes=config["JWT_ACCESS_TOKEN_MINUTES"])
+        return {
+            "access_token": TokenBLC._encode(user_id, email, "access", access_lifetime),
+            "refresh_token": TokenBLC._encode(user_id, email, "refresh", timedelta(days=config["JWT_REFRESH_TOKEN_DAYS"])),
+            "token_type": "Bearer",
+            "expires_in": int(access_lifetime.total_seconds())
+        }
+
+    @staticmethod
+    def verify(token, token_type="access"):
+        """Claims of a valid, unrevoked token of token_type; raises jwt.InvalidTokenError otherwise"""
+        # The signature is checked once per token string, the expiry on every use
+        claims = verified_tokens.get(token, TokenBLC._decode)
+        if claims["exp"] <= time.time():
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        if claims.get("type") != token_type:
+            raise jwt.InvalidTokenError(f"Expected an {token_type} token")
+        token_denylist.sync(TokenBLC._load_revoked, current_app.config["TOKEN_DENYLIST_SYNC_SECONDS"])
+        if token_denylist.is_revoked(claims["jti"]):
+            raise jwt.InvalidTokenError("Token has been revoked")
+        return claims
+
+    @staticmethod
+    def refresh(refresh_token):
+        """Spend a refresh token on a new token pair; a refresh token is accepted only once"""
+        claims = TokenBLC.verify(refresh_token, "refresh")
+        # The deny-list may lag other processes by a sync interval; the table is authoritative
+        if not TokenBLC._revoke(claims):
+            raise jwt.InvalidTokenError("Token has been revoked")
+        return TokenBLC.issue_tokens(int(claims["sub"]), claims.get("email"))
+
+    @staticmethod
+    def revoke(access_claims, refresh_token=None):
+        """Log out: revoke an access token and, if given, the same user's refresh token"""
+        TokenBLC._revoke(access_claims)
+        if refresh_token:
+            refresh_claims = TokenBLC.verify(refresh_token, "refresh")
+            if refresh_claims["sub"] != access_claims["sub"]:
+                raise jwt.InvalidTokenError("Refresh token belongs to another user")
+            TokenBLC._revoke(refresh_claims)
+        return {"message": "Logged out successfully"}
+
+    @staticmethod
+    def purge_revoked():
+        """Delete revocations of tokens that have expired"""
+        return RevokedTokenRepository.purge_expired()
+
+    @staticmethod
+    def _encode(user_id, email, token_type, lifetime):
+        now = datetime.now(timezone.utc)
+        return jwt.encode(
+            {
+                "sub": str(user_id),
+                "email": email,
+                "type": token_type,
+                "jti": uuid.uuid4().hex,
+                "iat": now,
+                "exp": now + lifetime
+            },
+            current_app.config["JWT_SECRET_KEY"],
+            algorithm=TOKEN_ALGORITHM
+        )
+
+    @staticmethod
+    def _decode(token):
+        return jwt.decode(
+            token,
+            current_app.config["JWT_SECRET_KEY"],
+            algorithms=[TOKEN_ALGORITHM],
+            options={"require": ["exp", "iat", "jti", "sub"]}
+        )
+
+    @staticmethod
+    def _revoke(claims):
+        token_denylist.add(claims["jti"], claims["exp"])
+        return RevokedTokenRepository.revoke(
+            claims["jti"],
+            claims["type"],
+            int(claims["sub"]),
+            datetime.fromtimestamp(claims["exp"], timezone.utc).replace(tzinfo=None)
+        )
+
+    @staticmethod
+    def _load_revoked(since):
+        return [
+            (jti, expires_at.replace(tzinfo=timezone.utc).timestamp())
+            for jti, expires_at in RevokedTokenRepository.get_revoked_since(since)
+        ]
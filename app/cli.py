@@ -0,0 +1,154 @@
+import click
+from flask.cli import AppGroup
+from flask import current_app
+from app.blc.quizBLC import QuizGradingBLC, QuizResultBLC
+from app.blc.gradingQueueBLC import GradingQueueBLC, GradingWorkerPool
+from app.blc.quizImportBLC import QuizImportBLC, IMPORT_FORMATS, import_grading_pool
+from app.blc.courseBLC import CourseBLC
+from app.blc.searchBLC import SearchBLC
+from app.blc.rosterImportBLC import RosterImportBLC
+from app.blc.tokenBLC import TokenBLC
+from app.repository.schema_repository import SchemaRepository
+
+
+quiz_cli = AppGroup("quiz", help="Quiz maintenance commands.")
+grading_cli = AppGroup("grading", help="Background grading queue commands.")
+course_cli = AppGroup("course", help="Course maintenance commands.")
+search_cli = AppGroup("search", help="Search index commands.")
+student_cli = AppGroup("student", help="Student roster commands.")
+teacher_cli = AppGroup("teacher", help="Teacher roster commands.")
+auth_cli = AppGroup("auth", help="Authentication token commands.")
+
+
+@quiz_cli.command("regrade")
+@click.argument("quiz_id", type=int)
+@click.option("--question-id", "question_ids", type=int, multiple=True, help="Only regrade answers to this question (repeatable).")
+def regrade_quiz(quiz_id, question_ids):
+    """Regrade every submission of a quiz, keeping teacher overrides."""
+    result = QuizGradingBLC.regrade_quiz(quiz_id, list(question_ids) or None)
+    click.echo(
+        f"Regraded {result['answers_regraded']} answers and {result['results_updated']} results "
+        f"for quiz {quiz_id} in {result['grading_ms']} ms"
+    )
+
+
+@quiz_cli.command("rebuild-stats")
+@click.option("--quiz-id", type=int, default=None, help="Only rebuild this quiz (default: all quizzes).")
+@click.option("--verify-only", is_flag=True, help="Report drift without rewriting the aggregate.")
+def rebuild_stats(quiz_id, verify_only):
+    """Rebuild the quiz_stats aggregate from quiz results and verify the incremental values."""
+    report = QuizResultBLC.rebuild_quiz_stats(quiz_id, verify_only)
+    for mismatch in report["mismatches"]:
+        click.echo(f"Quiz {mismatch['quiz_id']} drifted: {mismatch['differences']}")
+    action = "Rebuilt" if report["rebuilt"] else "Verified"
+    click.echo(f"{action} stats for {report['quizzes_checked']} quizzes, {len(report['mismatches'])} mismatched")
+
+
+@quiz_cli.command("import-submissions")
+@click.argument("quiz_id", type=int)
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "import_format", type=click.Choice(IMPORT_FORMATS), default=None, help="File format (default: from the file extension).")
+@click.option("--processes", type=int, default=None, help="Grading processes (default: IMPORT_GRADING_PROCESSES).")
+def import_submissions(quiz_id, path, import_format, processes):
+    """Import and grade paper answer sheets for a quiz from a CSV or NDJSON file."""
+    if import_format is None:
+        import_format = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+    config = current_app.config
+    import_grading_pool.start(processes if processes is not None else config["IMPORT_GRADING_PROCESSES"])
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as lines:
+            result = QuizImportBLC.import_submissions(quiz_id, lines, import_format, chunk_size=config["IMPORT_GRADING_CHUNK_SIZE"])
+    finally:
+        import_grading_pool.stop()
+    for error in result["errors"]:
+        click.echo(f"Row {error['row']} (student {error['student_id']}): {error['error']}")
+    click.echo(f"Imported {result['imported']} submissions, {result['failed']} rows failed, in {result['import_ms']} ms")
+
+
+@grading_cli.command("work")
+@click.option("--workers", type=int, default=None, help="Number of worker threads (default: GRADING_WORKERS).")
+@click.option("--drain", is_flag=True, help="Grade everything queued, then exit.")
+def work(workers, drain):
+    """Run grading workers against the grading_jobs queue."""
+    SchemaRepository.verify()
+    app = current_app._get_current_object()
+    pool = GradingWorkerPool()
+
+    if drain:
+        processed = pool.drain(app, worker_id="cli-drain")
+        click.echo(f"Graded {processed} queued submissions")
+        return
+
+    workers = workers or app.config["GRADING_WORKERS"]
+    pool.start(app, workers)
+    click.echo(f"Started {workers} grading workers, press Ctrl+C to stop")
+    try:
+        pool.wait()
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+@grading_cli.command("metrics")
+def metrics():
+    """Show grading queue depth and lag."""
+    for name, value in GradingQueueBLC.get_metrics().items():
+        click.echo(f"{name}: {value}")
+
+
+@course_cli.command("recompute-grades")
+@click.option("--course-id", type=int, default=None, help="Only recompute this course (default: all courses).")
+def recompute_grades(course_id):
+    """Recompute weighted course grades from quiz results in one set-based update."""
+    result = CourseBLC.recompute_grades(course_id)
+    click.echo(f"Recomputed grades of {result['enrollments_updated']} enrollments")
+
+
+@course_cli.command("sync-seats")
+@click.option("--course-id", type=int, default=None, help="Only sync this course (default: all courses).")
+def sync_seats(course_id):
+    """Reset each course's enrolled_count seat counter from its enrollments."""
+    result = CourseBLC.sync_seats(course_id)
+    click.echo(f"Corrected seat counts of {result['courses_corrected']} courses")
+
+
+@search_cli.command("rebuild")
+def rebuild_search_index():
+    """Create the search index if missing and re-read every student, teacher and course into it."""
+    indexed = SearchBLC.rebuild_index()
+    click.echo(f"Indexed {indexed} records")
+
+
+def _import_roster(import_rows, path, import_format):
+    if import_format is None:
+        import_format = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+    with open(path, encoding="utf-8-sig", newline="") as lines:
+        result = import_rows(lines, import_format, current_app.config["ROSTER_IMPORT_CHUNK_SIZE"])
+    for error in result["errors"]:
+        click.echo(f"Row {error['row']} ({error['email']}): {error['error']}")
+    click.echo(
+        f"Imported {result['imported']} rows, {result['failed']} rows failed, "
+        f"in {result['import_ms']} ms ({result['rows_per_second']} rows/s)"
+    )
+
+
+@student_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "import_format", type=click.Choice(IMPORT_FORMATS), default=None, help="File format (default: from the file extension).")
+def import_students(path, import_format):
+    """Create students from a CSV or NDJSON file, validated and loaded in chunks."""
+    _import_roster(RosterImportBLC.import_students, path, import_format)
+
+
+@teacher_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "import_format", type=click.Choice(IMPORT_FORMATS), default=None, help="File format (default: from the file extension).")
+def import_teachers(path, import_format):
+    """Create teachers from a CSV or NDJSON file, validated and loaded in chunks."""
+    _import_roster(RosterImportBLC.import_teachers, path, import_format)
+
+
+@auth_cli.command("purge-revoked")
+def purge_revoked_tokens():
+    """Delete revoked-token records whose tokens have expired anyway."""
+    purged = TokenBLC.purge_revoked()
+    click.echo(f"Purged {purged} expired revocations")
@@ -0,0 +1,56 @@
+import datetime
+import json
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used instead
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "stdlib")
+
+# orjson writes dates and naive datetimes as ISO 8601, the same as isoformat()
+ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+class CustomJSONProvider(JSONProvider):
+    """JSON provider that writes dates as ISO 8601 strings.
+
+    The encoder backend is orjson when it is installed (or requested with JSON_BACKEND=orjson)
+    and the stdlib json module otherwise. dumps_bytes encodes straight to UTF-8 bytes for
+    responses, streams and caches.
+    """
+
+    def __init__(self, app, backend="auto"):
+        super().__init__(app)
+        if backend not in JSON_BACKENDS:
+            raise ValueError(f"Unknown JSON backend {backend!r}; expected one of {', '.join(JSON_BACKENDS)}")
+        if backend == "orjson" and orjson is None:
+            raise RuntimeError("JSON_BACKEND=orjson but orjson is not installed")
+        self.backend = "orjson" if backend != "stdlib" and orjson is not None else "stdlib"
+
+    def dumps_bytes(self, obj):
+        if self.backend == "orjson":
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        return json.dumps(obj, default=self.default, separators=(",", ":")).encode()
+
+    def dumps(self, obj, **kwargs):
+        # Formatting options such as indent or sort_keys are only understood by the stdlib
+        if kwargs or self.backend == "stdlib":
+            return json.dumps(obj, default=self.default, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if self.backend == "orjson" and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def default(self, obj):
+        if isinstance(obj, datetime.datetime) or isinstance(obj, datetime.date):
+            return obj.isoformat()
+        raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+    def response(self, *args, **kwargs):
+        """jsonify: encode once to bytes instead of str then bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype="application/json")
@@ -21,10 +21,10 @@ class Student(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(50), nullable=False)
-    last_name = db.Column(db.String(50), nullable=False)
+    last_name = db.Column(db.String(50), nullable=False, index=True)
     email = db.Column(db.String(100), unique=True, nullable=False)
     date_of_birth = db.Column(db.Date, nullable=False)
-    grade = db.Column(db.Integer, nullable=False)
+    grade = db.Column(db.Integer, nullable=False, index=True)
     address = db.Column(db.String(200))
     phone = db.Column(db.String(20))
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
@@ -41,9 +41,9 @@ class Teacher(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     first_name = db.Column(db.String(50), nullable=False)
-    last_name = db.Column(db.String(50), nullable=False)
+    last_name = db.Column(db.String(50), nullable=False, index=True)
     email = db.Column(db.String(100), unique=True, nullable=False)
-    subject = db.Column(db.String(100), nullable=False)
+    subject = db.Column(db.String(100), nullable=False, index=True)
     qualification = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20))
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
@@ -59,11 +59,13 @@ class Course(db.Model):
     __tablename__ = 'courses'
     
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text, nullable=False)
     credits = db.Column(db.Integer, nullable=False)
     max_students = db.Column(db.Integer, default=30)
-    teacher_id = db.Column(db.Integer, db.ForeignKey('teachers.id'), nullable=False)
+    enrolled_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Seats taken; maintained with enrollments
+    drop_lowest = db.Column(db.Integer, nullable=False, default=0)  # Lowest quiz percentages ignored in the course grade
+    teacher_id = db.Column(db.Integer, db.ForeignKey('teachers.id'), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, onupdate=lambda: datetime.now(timezone.utc))
 
@@ -76,12 +78,15 @@ class Course(db.Model):
 
 class Enrollment(db.Model):
     __tablename__ = 'enrollments'
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'course_id', name='uq_enrollments_student_id_course_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
-    enrollment_date = db.Column(db.Date, nullable=False)
-    status = db.Column(db.String(20), default='active')  # active, completed, dropped
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)  # Leading column of the unique constraint
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False, index=True)
+    enrollment_date = db.Column(db.Date, nullable=False, index=True)
+    status = db.Column(db.String(20), default='active', index=True)  # active, completed, dropped
     grade = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, onupdate=lambda: datetime.now(timezone.utc))
@@ -109,12 +114,15 @@ class Quiz(db.Model):
     start_date = db.Column(db.DateTime, nullable=False)
     end_date = db.Column(db.DateTime, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    weight = db.Column(db.Float, nullable=False, default=1.0)  # Weight in the course grade
+    content_version = db.Column(db.Integer, nullable=False, default=1)  # Bumped whenever questions change
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, onupdate=lambda: datetime.now(timezone.utc))
 
     course = db.relationship('Course', backref='quizzes')
     questions = db.relationship('QuizQuestion', back_populates='quiz', cascade='all, delete-orphan')
     submissions = db.relationship('QuizSubmission', back_populates='quiz', cascade='all, delete-orphan')
+    stats = db.relationship('QuizStats', back_populates='quiz', uselist=False, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Quiz {self.title} for {self.course.name}>'
@@ -145,10 +153,14 @@ class QuizQuestion(db.Model):
 
 class QuizSubmission(db.Model):
     __tablename__ = 'quiz_submissions'
+    __table_args__ = (
+        # Serves per-quiz scans and (quiz, student) lookups such as gradebook and submission checks
+        db.Index('ix_quiz_submissions_quiz_id_student_id', 'quiz_id', 'student_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), nullable=False)
-    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('students.id'), nullable=False, index=True)
     submitted_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     time_taken_minutes = db.Column(db.Integer)  # Actual time taken
     is_completed = db.Column(db.Boolean, default=True)
@@ -158,6 +170,7 @@ class QuizSubmission(db.Model):
     student = db.relationship('Student', backref='quiz_submissions')
     answers = db.relationship('QuizAnswer', back_populates='submission', cascade='all, delete-orphan')
     result = db.relationship('QuizResult', back_populates='submission', uselist=False, cascade='all, delete-orphan')
+    grading_job = db.relationship('GradingJob', back_populates='submission', uselist=False, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<QuizSubmission {self.student_id} for {self.quiz.title}>'
@@ -167,8 +180,8 @@ class QuizAnswer(db.Model):
     __tablename__ = 'quiz_answers'
     
     id = db.Column(db.Integer, primary_key=True)
-    submission_id = db.Column(db.Integer, db.ForeignKey('quiz_submissions.id'), nullable=False)
-    question_id = db.Column(db.Integer, db.ForeignKey('quiz_questions.id'), nullable=False)
+    submission_id = db.Column(db.Integer, db.ForeignKey('quiz_submissions.id'), nullable=False, index=True)
+    question_id = db.Column(db.Integer, db.ForeignKey('quiz_questions.id'), nullable=False, index=True)
     student_answer = db.Column(db.Text, nullable=False)  # Student's answer
     is_correct = db.Column(db.Boolean)  # Will be populated after grading
     marks_obtained = db.Column(db.Float, default=0.0)
@@ -183,6 +196,10 @@ class QuizAnswer(db.Model):
 
 class QuizResult(db.Model):
     __tablename__ = 'quiz_results'
+    __table_args__ = (
+        # One result per submission, even if two graders race on the same submission
+        db.UniqueConstraint('submission_id', name='uq_quiz_results_submission_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     submission_id = db.Column(db.Integer, db.ForeignKey('quiz_submissions.id'), nullable=False)
@@ -192,6 +209,7 @@ class QuizResult(db.Model):
     grade = db.Column(db.String(5))  # A+, A, B+, B, C+, C, D, F
     feedback = db.Column(db.Text)
     graded_by_teacher = db.Column(db.Boolean, default=False)
+    marks_overridden = db.Column(db.Boolean, default=False)  # Marks set by a teacher, kept on regrade
     graded_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, onupdate=lambda: datetime.now(timezone.utc))
@@ -200,3 +218,73 @@ class QuizResult(db.Model):
     
     def __repr__(self):
         return f'<QuizResult {self.marks_obtained}/{self.total_marks} for submission {self.submission_id}>'
+
+
+class QuizStats(db.Model):
+    __tablename__ = 'quiz_stats'
+    
+    # Running aggregates over a quiz's results, maintained as results are graded
+    quiz_id = db.Column(db.Integer, db.ForeignKey('quizzes.id'), primary_key=True)
+    result_count = db.Column(db.Integer, nullable=False, default=0)
+    sum_percentage = db.Column(db.Float, nullable=False, default=0.0)
+    sum_sq_percentage = db.Column(db.Float, nullable=False, default=0.0)
+    max_percentage = db.Column(db.Float)
+    grade_a_plus = db.Column(db.Integer, nullable=False, default=0)
+    grade_a = db.Column(db.Integer, nullable=False, default=0)
+    grade_b_plus = db.Column(db.Integer, nullable=False, default=0)
+    grade_b = db.Column(db.Integer, nullable=False, default=0)
+    grade_c_plus = db.Column(db.Integer, nullable=False, default=0)
+    grade_c = db.Column(db.Integer, nullable=False, default=0)
+    grade_d = db.Column(db.Integer, nullable=False, default=0)
+    grade_f = db.Column(db.Integer, nullable=False, default=0)
+    # Result counts per 10% band of percentage (decile_9 includes 100%)
+    decile_0 = db.Column(db.Integer, nullable=False, default=0)
+    decile_1 = db.Column(db.Integer, nullable=False, default=0)
+    decile_2 = db.Column(db.Integer, nullable=False, default=0)
+    decile_3 = db.Column(db.Integer, nullable=False, default=0)
+    decile_4 = db.Column(db.Integer, nullable=False, default=0)
+    decile_5 = db.Column(db.Integer, nullable=False, default=0)
+    decile_6 = db.Column(db.Integer, nullable=False, default=0)
+    decile_7 = db.Column(db.Integer, nullable=False, default=0)
+    decile_8 = db.Column(db.Integer, nullable=False, default=0)
+    decile_9 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    quiz = db.relationship('Quiz', back_populates='stats')
+    
+    def __repr__(self):
+        return f'<QuizStats {self.quiz_id}: {self.result_count} results>'
+
+
+class GradingJob(db.Model):
+    __tablename__ = 'grading_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    submission_id = db.Column(db.Integer, db.ForeignKey('quiz_submissions.id'), unique=True, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)  # pending, processing, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    locked_by = db.Column(db.String(100))
+    enqueued_at = db.Column(db.DateTime, nullable=False)  # Naive UTC, like locked_at and finished_at
+    locked_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    lag_ms = db.Column(db.Float)  # Time from enqueue to graded
+
+    submission = db.relationship('QuizSubmission', back_populates='grading_job')
+    
+    def __repr__(self):
+        return f'<GradingJob {self.submission_id} {self.status}>'
+
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(32), unique=True, nullable=False)  # Token id claim
+    token_type = db.Column(db.String(10), nullable=False)  # access, refresh
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Naive UTC; the row is useless after this
+    revoked_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)  # Deny-list sync watermark
+    
+    def __repr__(self):
+        return f'<RevokedToken {self.token_type} {self.jti}>'
@@ -0,0 +1,76 @@
+import os
+from array import array
+from app.repository.lru_cache import LRUCache
+
+
+# Question types are stored as small integer codes in compiled keys
+QUESTION_TYPES = ('multiple_choice', 'true_false', 'text')
+_TYPE_CODES = {question_type: code for code, question_type in enumerate(QUESTION_TYPES)}
+_UNGRADABLE = -1
+
+
+def type_code(question_type):
+    """Code of a question type, or -1 for types that cannot be auto-graded"""
+    return _TYPE_CODES.get(question_type, _UNGRADABLE)
+
+
+def normalize_answer(answer, code):
+    """Normalize an answer for comparison under a question type code, or None if it cannot be graded"""
+    if answer is None or code == _UNGRADABLE:
+        return None
+    if code == _TYPE_CODES['text']:
+        # For text questions, do a case-insensitive comparison
+        return answer.strip().lower()
+    return answer.strip().upper()
+
+
+class CompiledAnswerKey:
+    """A quiz's answer key as parallel arrays ordered by question order_number"""
+
+    __slots__ = (
+        'quiz_id', 'question_ids', 'answers', 'marks', 'order_numbers', 'type_codes',
+        'question_texts', 'correct_answers', 'positions'
+    )
+
+    def __init__(self, quiz_id, questions):
+        """Compile (id, question_text, question_type, correct_answer, marks, order_number) rows"""
+        questions = sorted(questions, key=lambda q: q[5])
+        self.quiz_id = quiz_id
+        self.question_ids = array('q', [q[0] for q in questions])
+        self.type_codes = array('b', [type_code(q[2]) for q in questions])
+        self.answers = tuple(normalize_answer(q[3], code) for q, code in zip(questions, self.type_codes))
+        self.marks = array('d', [q[4] if q[4] is not None else 0 for q in questions])
+        self.order_numbers = array('l', [q[5] for q in questions])
+        self.question_texts = tuple(q[1] for q in questions)
+        self.correct_answers = tuple(q[3] for q in questions)
+        self.positions = {question_id: index for index, question_id in enumerate(self.question_ids)}
+
+    def question_type(self, index):
+        code = self.type_codes[index]
+        return QUESTION_TYPES[code] if code != _UNGRADABLE else None
+
+    def is_correct(self, index, student_answer):
+        correct_answer = self.answers[index]
+        return correct_answer is not None and normalize_answer(student_answer, self.type_codes[index]) == correct_answer
+
+    def __len__(self):
+        return len(self.question_ids)
+
+
+def grade_sheets(answer_key, sheets):
+    """Grade answer sheets (answers in question order) against a compiled key.
+
+    Returns (correct flags, marks per answer, marks obtained) per sheet. Kept at module
+    level with picklable arguments so imports can run it in a process pool.
+    """
+    graded = []
+    for answers in sheets:
+        correct = [answer_key.is_correct(index, answer) for index, answer in enumerate(answers)]
+        marks = [answer_key.marks[index] if is_correct else 0 for index, is_correct in enumerate(correct)]
+        graded.append((correct, marks, sum(marks)))
+    return graded
+
+
+# Keyed by (quiz_id, content_version), so question edits in any process never hit stale keys.
+# Deleting a quiz drops its keys, since a new quiz may reuse the id at version 1.
+answer_key_cache = LRUCache(maxsize=int(os.getenv("ANSWER_KEY_CACHE_SIZE", 512)))
@@ -0,0 +1,123 @@
+from app.extension import db
+from app.model.models import Course, Enrollment, Quiz, QuizSubmission, QuizResult
+from flask import abort
+from sqlalchemy import select, update, case, func
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class CourseGradeRepository:
+    """Course grades: weighted mean of a student's quiz percentages after dropping the lowest N.
+
+    Quiz.weight sets each quiz's weight and Course.drop_lowest how many of a student's
+    lowest percentages are ignored; at least one result always counts.
+    """
+
+    @staticmethod
+    def recompute_enrollment(student_id, course_id):
+        """Recompute one student's course grade within the caller's transaction; None without results"""
+        rows = db.session.execute(
+            select(QuizResult.percentage, Quiz.weight, Course.drop_lowest)
+            .join(QuizSubmission, QuizSubmission.id == QuizResult.submission_id)
+            .join(Quiz, Quiz.id == QuizSubmission.quiz_id)
+            .join(Course, Course.id == Quiz.course_id)
+            .where(QuizSubmission.student_id == student_id, Quiz.course_id == course_id)
+            .order_by(QuizResult.percentage, QuizResult.id)
+        ).all()
+
+        grade = None
+        if rows:
+            kept = rows[min(rows[0].drop_lowest or 0, len(rows) - 1):]
+            total_weight = sum(row.weight for row in kept)
+            grade = sum(row.percentage * row.weight for row in kept) / total_weight if total_weight else None
+
+        db.session.execute(
+            update(Enrollment)
+            .where(Enrollment.student_id == student_id, Enrollment.course_id == course_id)
+            .values(grade=grade)
+            .execution_options(synchronize_session=False)
+        )
+        return grade
+
+    @staticmethod
+    def recompute_course(course_id=None):
+        """Recompute grades of every enrollment, for one course or all courses; no results means no grade"""
+        try:
+            if course_id is not None and db.session.get(Course, course_id) is None:
+                abort(404, "Course not found")
+
+            enrollments_updated = CourseGradeRepository.recompute_course_in_transaction(course_id)
+            db.session.commit()
+            return {"course_id": course_id, "enrollments_updated": enrollments_updated}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def recompute_course_in_transaction(course_id=None):
+        """Set-based recompute committed by the caller; returns the number of enrollments updated"""
+        graded = db.session.execute(
+            CourseGradeRepository._grades_update(course_id).execution_options(synchronize_session=False)
+        ).rowcount
+        cleared = db.session.execute(
+            CourseGradeRepository._stale_grades_update(course_id).execution_options(synchronize_session=False)
+        ).rowcount
+        return graded + cleared
+
+    @staticmethod
+    def _stale_grades_update(course_id=None):
+        """UPDATE clearing grades of enrollments left without any quiz result in their course"""
+        has_results = (
+            select(QuizResult.id)
+            .join(QuizSubmission, QuizSubmission.id == QuizResult.submission_id)
+            .join(Quiz, Quiz.id == QuizSubmission.quiz_id)
+            .where(Quiz.course_id == Enrollment.course_id, QuizSubmission.student_id == Enrollment.student_id)
+            .exists()
+        )
+        statement = update(Enrollment).where(Enrollment.grade.isnot(None), ~has_results).values(grade=None)
+        if course_id is not None:
+            statement = statement.where(Enrollment.course_id == course_id)
+        return statement
+
+    @staticmethod
+    def _grades_update(course_id=None):
+        """UPDATE enrollments from one window-function aggregate over quiz results"""
+        partition = (Quiz.course_id, QuizSubmission.student_id)
+        ranked = (
+            select(
+                Quiz.course_id.label('course_id'),
+                QuizSubmission.student_id.label('student_id'),
+                QuizResult.percentage.label('percentage'),
+                Quiz.weight.label('weight'),
+                func.coalesce(Course.drop_lowest, 0).label('drop_lowest'),
+                func.row_number().over(partition_by=partition, order_by=(QuizResult.percentage, QuizResult.id)).label('position'),
+                func.count().over(partition_by=partition).label('result_count')
+            )
+            .join(QuizSubmission, QuizSubmission.id == QuizResult.submission_id)
+            .join(Quiz, Quiz.id == QuizSubmission.quiz_id)
+            .join(Course, Course.id == Quiz.course_id)
+        )
+        if course_id is not None:
+            ranked = ranked.where(Quiz.course_id == course_id)
+        ranked = ranked.subquery()
+
+        dropped = case(
+            (ranked.c.drop_lowest < ranked.c.result_count, ranked.c.drop_lowest),
+            else_=ranked.c.result_count - 1
+        )
+        grades = (
+            select(
+                ranked.c.course_id,
+                ranked.c.student_id,
+                (
+                    func.sum(ranked.c.percentage * ranked.c.weight) / func.nullif(func.sum(ranked.c.weight), 0)
+                ).label('grade')
+            )
+            .where(ranked.c.position > dropped)
+            .group_by(ranked.c.course_id, ranked.c.student_id)
+            .subquery()
+        )
+        return (
+            update(Enrollment)
+            .where(Enrollment.course_id == grades.c.course_id, Enrollment.student_id == grades.c.student_id)
+            .values(grade=grades.c.grade)
+        )
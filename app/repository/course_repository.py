@@ -1,26 +1,59 @@
 from datetime import datetime
 from app.extension import db
 from app.model.models import Course, Teacher, Enrollment
+from app.repository.course_grade_repository import CourseGradeRepository
 from flask import abort
+from app.repository.projection import Projection, stream_rows
+from app.repository.pagination import DEFAULT_PAGE_SIZE, apply_filters, resolve_sort, keyset_page, order_by_key, page_of
 from sqlalchemy.exc import SQLAlchemyError
 
+COURSE_PROJECTION = Projection(
+    id=Course.id,
+    name=Course.name,
+    description=Course.description,
+    credits=Course.credits,
+    max_students=Course.max_students,
+    enrolled_count=Course.enrolled_count,
+    drop_lowest=Course.drop_lowest,
+    teacher_id=Course.teacher_id,
+    created_at=Course.created_at,
+    updated_at=Course.updated_at
+)
+COURSE_SORT_COLUMNS = {"id": Course.id, "name": Course.name, "teacher_id": Course.teacher_id}
+
 class CourseRepository:
     @staticmethod
-    def get_all_courses():
+    def get_all_courses(filters=None, sort="id", limit=DEFAULT_PAGE_SIZE, cursor=None, fields=None):
+        """One keyset page of courses matching filters as dicts of fields; returns (courses, next_cursor)"""
         try:
-            courses = Course.query.all()
-            return courses
+            sort_column, descending = resolve_sort(sort, COURSE_SORT_COLUMNS)
+            statement, serialize = COURSE_PROJECTION.select(fields, required=(Course.id, sort_column))
+            statement = apply_filters(statement, Course, filters)
+            rows = db.session.execute(
+                keyset_page(statement, sort_column, Course.id, limit, cursor, descending)
+            ).all()
+            rows, next_cursor = page_of(rows, limit, sort_column, Course.id, descending)
+            return [serialize(row) for row in rows], next_cursor
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def get_course_by_id(course_id: int):
+    def iter_courses(filters=None, sort="id", fields=None):
+        """Yield every course matching filters as a dict of fields, in sort order, batch by batch"""
+        sort_column, descending = resolve_sort(sort, COURSE_SORT_COLUMNS)
+        statement, serialize = COURSE_PROJECTION.select(fields)
+        statement = order_by_key(apply_filters(statement, Course, filters), sort_column, Course.id, descending)
+        return stream_rows(statement, serialize)
+    
+    @staticmethod
+    def get_course_by_id(course_id: int, fields=None):
         try:
-            course = Course.query.get(course_id)
-            if not course:
+            statement, serialize = COURSE_PROJECTION.select(fields)
+            row = db.session.execute(statement.where(Course.id == course_id)).first()
+            if row is None:
                 abort(404, "Course not found")
-            return course
+            return serialize(row)
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -38,6 +71,7 @@ class CourseRepository:
                 description=args.get("description"),
                 credits=args.get("credits"),
                 max_students=args.get("max_students", 30),
+                drop_lowest=args.get("drop_lowest", 0),
                 teacher_id=args.get("teacher_id")
             )
             
@@ -71,6 +105,10 @@ class CourseRepository:
                 course.credits = args["credits"]
             if "max_students" in args:
                 course.max_students = args["max_students"]
+            if "drop_lowest" in args:
+                course.drop_lowest = args["drop_lowest"]
+                db.session.flush()
+                CourseGradeRepository.recompute_course_in_transaction(course_id)
             
             db.session.commit()
             return {"course_id": course_id, "modified": True}
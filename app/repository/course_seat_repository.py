@@ -0,0 +1,70 @@
+from app.extension import db
+from app.model.models import Course, Enrollment
+from flask import abort
+from sqlalchemy import select, update, func, or_
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class CourseSeatRepository:
+    """Course.enrolled_count: seats taken, one per enrollment row, changed only by conditional UPDATEs.
+
+    A course with no max_students (or 0) is unlimited. Taking a seat locks the course row until
+    the caller commits, so concurrent enrollers cannot overbook it.
+    """
+
+    @staticmethod
+    def take_seats(course_id, seats=1):
+        """Reserve seats within the caller's transaction; False when the course is missing or full"""
+        return db.session.execute(
+            update(Course)
+            .where(
+                Course.id == course_id,
+                or_(
+                    Course.max_students.is_(None),
+                    Course.max_students == 0,
+                    Course.enrolled_count + seats <= Course.max_students
+                )
+            )
+            .values(enrolled_count=Course.enrolled_count + seats)
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+
+    @staticmethod
+    def release_seats(course_id, seats=1):
+        """Give seats back within the caller's transaction"""
+        db.session.execute(
+            update(Course)
+            .where(Course.id == course_id)
+            .values(enrolled_count=Course.enrolled_count - seats)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def release_student_seats(student_id):
+        """Give back the seat of every course a student is enrolled in, before the student is deleted"""
+        db.session.execute(
+            update(Course)
+            .where(Course.id.in_(select(Enrollment.course_id).where(Enrollment.student_id == student_id)))
+            .values(enrolled_count=Course.enrolled_count - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def sync_seats(course_id=None):
+        """Reset enrolled_count from the enrollments table; returns the number of courses corrected"""
+        try:
+            if course_id is not None and db.session.get(Course, course_id) is None:
+                abort(404, "Course not found")
+
+            actual = func.coalesce(
+                select(func.count(Enrollment.id)).where(Enrollment.course_id == Course.id).scalar_subquery(), 0
+            )
+            statement = update(Course).where(Course.enrolled_count != actual).values(enrolled_count=actual)
+            if course_id is not None:
+                statement = statement.where(Course.id == course_id)
+            corrected = db.session.execute(statement.execution_options(synchronize_session=False)).rowcount
+            db.session.commit()
+            return corrected
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
@@ -2,40 +2,71 @@ from datetime import datetime, date
 from app.extension import db
 from app.model.models import Enrollment, Student, Course
 from flask import abort
-from sqlalchemy.exc import SQLAlchemyError
+from app.repository.course_seat_repository import CourseSeatRepository
+from app.repository.projection import Projection, stream_rows
+from app.repository.pagination import DEFAULT_PAGE_SIZE, apply_filters, resolve_sort, keyset_page, order_by_key, page_of
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+ENROLLMENT_PROJECTION = Projection(
+    id=Enrollment.id,
+    student_id=Enrollment.student_id,
+    course_id=Enrollment.course_id,
+    enrollment_date=Enrollment.enrollment_date,
+    status=Enrollment.status,
+    grade=Enrollment.grade,
+    created_at=Enrollment.created_at,
+    updated_at=Enrollment.updated_at
+)
+ENROLLMENT_SORT_COLUMNS = {"id": Enrollment.id, "enrollment_date": Enrollment.enrollment_date, "student_id": Enrollment.student_id, "course_id": Enrollment.course_id}
 
 class EnrollmentRepository:
     @staticmethod
-    def get_all_enrollments():
+    def get_all_enrollments(filters=None, sort="id", limit=DEFAULT_PAGE_SIZE, cursor=None, fields=None):
+        """One keyset page of enrollments matching filters as dicts of fields; returns (enrollments, next_cursor)"""
         try:
-            enrollments = Enrollment.query.all()
-            return enrollments
+            sort_column, descending = resolve_sort(sort, ENROLLMENT_SORT_COLUMNS)
+            statement, serialize = ENROLLMENT_PROJECTION.select(fields, required=(Enrollment.id, sort_column))
+            statement = apply_filters(statement, Enrollment, filters)
+            rows = db.session.execute(
+                keyset_page(statement, sort_column, Enrollment.id, limit, cursor, descending)
+            ).all()
+            rows, next_cursor = page_of(rows, limit, sort_column, Enrollment.id, descending)
+            return [serialize(row) for row in rows], next_cursor
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def get_enrollments_by_student(student_id: int):
+    def iter_enrollments(filters=None, sort="id", fields=None):
+        """Yield every enrollment matching filters as a dict of fields, in sort order, batch by batch"""
+        sort_column, descending = resolve_sort(sort, ENROLLMENT_SORT_COLUMNS)
+        statement, serialize = ENROLLMENT_PROJECTION.select(fields)
+        statement = order_by_key(apply_filters(statement, Enrollment, filters), sort_column, Enrollment.id, descending)
+        return stream_rows(statement, serialize)
+    
+    @staticmethod
+    def get_enrollments_by_student(student_id: int, fields=None):
         try:
-            student = Student.query.get(student_id)
-            if not student:
+            if db.session.scalar(select(Student.id).where(Student.id == student_id)) is None:
                 abort(404, "Student not found")
                 
-            enrollments = Enrollment.query.filter_by(student_id=student_id).all()
-            return enrollments
+            statement, serialize = ENROLLMENT_PROJECTION.select(fields)
+            rows = db.session.execute(statement.where(Enrollment.student_id == student_id)).all()
+            return [serialize(row) for row in rows]
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def get_enrollments_by_course(course_id: int):
+    def get_enrollments_by_course(course_id: int, fields=None):
         try:
-            course = Course.query.get(course_id)
-            if not course:
+            if db.session.scalar(select(Course.id).where(Course.id == course_id)) is None:
                 abort(404, "Course not found")
                 
-            enrollments = Enrollment.query.filter_by(course_id=course_id).all()
-            return enrollments
+            statement, serialize = ENROLLMENT_PROJECTION.select(fields)
+            rows = db.session.execute(statement.where(Enrollment.course_id == course_id)).all()
+            return [serialize(row) for row in rows]
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -44,29 +75,14 @@ class EnrollmentRepository:
     def create_enrollment(args: dict):
         try:
     
-            student = Student.query.get(args.get("student_id"))
-            if not student:
+            if db.session.scalar(select(Student.id).where(Student.id == args.get("student_id"))) is None:
                 abort(400, "Student not found")
                 
-            course = Course.query.get(args.get("course_id"))
-            if not course:
-                abort(400, "Course not found")
- 
-            existing = Enrollment.query.filter_by(
-                student_id=args.get("student_id"),
-                course_id=args.get("course_id")
-            ).first()
-            
-            if existing:
-                abort(400, "Student is already enrolled in this course")
-            
-            if course.max_students:
-                current_enrollments = Enrollment.query.filter_by(
-                    course_id=args.get("course_id")
-                ).count()
-                
-                if current_enrollments >= course.max_students:
-                    abort(400, "Course has reached maximum enrollment")
+            # The seat is taken first: the conditional UPDATE holds the course row until commit
+            if not CourseSeatRepository.take_seats(args.get("course_id")):
+                if db.session.scalar(select(Course.id).where(Course.id == args.get("course_id"))) is None:
+                    abort(400, "Course not found")
+                abort(400, "Course has reached maximum enrollment")
             
             enrollment = Enrollment(
                 student_id=args.get("student_id"),
@@ -77,12 +93,106 @@ class EnrollmentRepository:
             )
             
             db.session.add(enrollment)
+            try:
+                db.session.flush()
+            except IntegrityError:
+                # uq_enrollments_student_id_course_id; the rollback also returns the seat
+                db.session.rollback()
+                abort(400, "Student is already enrolled in this course")
             db.session.commit()
             return enrollment.id
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
+    @staticmethod
+    def bulk_enroll(course_id, student_ids=None, grade=None, enrollment_date=None, status="active"):
+        """Enroll many students in a course with a fixed number of queries and one multi-row INSERT.
+
+        Students come from student_ids (in request order) or every student in a grade level.
+        Returns one outcome per student: created (with enrollment_id), skipped or rejected, with a reason.
+        Seats go to students in order until the course is full.
+        """
+        try:
+            if db.session.scalar(select(Course.id).where(Course.id == course_id)) is None:
+                abort(404, "Course not found")
+
+            if grade is not None:
+                selected = select(Student.id).where(Student.grade == grade)
+                candidates = list(db.session.scalars(selected.order_by(Student.id)))
+                existing_students = set(candidates)
+            else:
+                selected = set(student_ids)
+                candidates = list(student_ids)
+                existing_students = set(db.session.scalars(select(Student.id).where(Student.id.in_(selected))))
+            already_enrolled = set(db.session.scalars(
+                select(Enrollment.student_id).where(Enrollment.course_id == course_id, Enrollment.student_id.in_(selected))
+            ))
+
+            outcomes = []
+            pending = []
+            seen = set()
+            for student_id in candidates:
+                if student_id in seen:
+                    outcomes.append({"student_id": student_id, "outcome": "skipped", "reason": "Duplicate student in request"})
+                elif student_id not in existing_students:
+                    outcomes.append({"student_id": student_id, "outcome": "rejected", "reason": "Student not found"})
+                elif student_id in already_enrolled:
+                    outcomes.append({"student_id": student_id, "outcome": "skipped", "reason": "Student is already enrolled in this course"})
+                else:
+                    outcomes.append({"student_id": student_id, "outcome": "created"})
+                    pending.append(student_id)
+                seen.add(student_id)
+
+            seats = EnrollmentRepository._take_available_seats(course_id, len(pending))
+            full = set(pending[seats:])
+            pending = pending[:seats]
+            for outcome in outcomes:
+                if outcome["outcome"] == "created" and outcome["student_id"] in full:
+                    outcome.update(outcome="rejected", reason="Course has reached maximum enrollment")
+
+            if pending:
+                enrollment_date = enrollment_date or date.today()
+                try:
+                    # Rows are matched back by student, so RETURNING order does not matter and
+                    # the rows go out as multi-row INSERT ... VALUES batches
+                    inserted = db.session.execute(
+                        insert(Enrollment.__table__).returning(Enrollment.student_id, Enrollment.id),
+                        [{
+                            "student_id": student_id,
+                            "course_id": course_id,
+                            "enrollment_date": enrollment_date,
+                            "status": status
+                        } for student_id in pending]
+                    ).all()
+                except IntegrityError:
+                    # Another request enrolled one of these students after the check above
+                    db.session.rollback()
+                    abort(409, "Enrollments changed during the request; retry")
+                ids_by_student = dict(inserted)
+                for outcome in outcomes:
+                    if outcome["outcome"] == "created":
+                        outcome["enrollment_id"] = ids_by_student[outcome["student_id"]]
+
+            db.session.commit()
+            return outcomes
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _take_available_seats(course_id, wanted):
+        """Reserve up to wanted seats in the caller's transaction and return how many were reserved"""
+        while wanted:
+            # FOR UPDATE holds the course row so the conditional UPDATE below normally succeeds first time
+            course = db.session.execute(
+                select(Course.max_students, Course.enrolled_count).where(Course.id == course_id).with_for_update()
+            ).one()
+            seats = wanted if not course.max_students else max(0, min(wanted, course.max_students - course.enrolled_count))
+            if seats == 0 or CourseSeatRepository.take_seats(course_id, seats):
+                return seats
+        return 0
+    
     @staticmethod
     def update_enrollment(enrollment_id: int, args: dict):
         try:
@@ -110,6 +220,7 @@ class EnrollmentRepository:
             if not enrollment:
                 abort(404, "Enrollment not found")
             
+            CourseSeatRepository.release_seats(enrollment.course_id)
             db.session.delete(enrollment)
             db.session.commit()
             return {"deleted": True}
@@ -0,0 +1,156 @@
+import numpy as np
+from app.extension import db
+from app.model.models import Course, Enrollment, Student, Quiz, QuizSubmission, QuizResult
+from flask import abort
+from sqlalchemy import select, and_
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class GradebookRepository:
+
+    @staticmethod
+    def get_gradebook(course_id):
+        """Students x quizzes matrix of percentage, grade and override flag for a course.
+
+        One query over enrolled students crossed with the course's quizzes, outer joined to
+        their results and pivoted with numpy.
+        """
+        try:
+            course_name = db.session.scalar(select(Course.name).where(Course.id == course_id))
+            if course_name is None:
+                abort(404, "Course not found")
+
+            # Read straight from the DBAPI cursor: the grid has one row per student per quiz
+            result = db.session.connection().execute(
+                select(
+                    Student.id,
+                    Student.first_name,
+                    Student.last_name,
+                    Quiz.id,
+                    Quiz.title,
+                    Quiz.total_marks,
+                    Quiz.start_date,
+                    QuizResult.percentage,
+                    QuizResult.grade,
+                    QuizResult.marks_overridden
+                )
+                .select_from(Enrollment)
+                .join(Student, Student.id == Enrollment.student_id)
+                .join(Quiz, Quiz.course_id == Enrollment.course_id)
+                .outerjoin(QuizSubmission, and_(
+                    QuizSubmission.quiz_id == Quiz.id,
+                    QuizSubmission.student_id == Student.id
+                ))
+                .outerjoin(QuizResult, QuizResult.submission_id == QuizSubmission.id)
+                .where(Enrollment.course_id == course_id)
+                .order_by(Student.last_name, Student.first_name, Student.id, Quiz.start_date, Quiz.id)
+            )
+            rows = result.cursor.fetchall()
+            result.close()
+
+            if not rows:
+                students, quizzes = GradebookRepository._roster(course_id)
+                return GradebookRepository._empty_gradebook(course_id, course_name, students, quizzes)
+
+            (student_ids, first_names, last_names, quiz_ids, titles, total_marks, start_dates,
+             percentages, grades, overridden) = zip(*rows)
+
+            # Rows arrive in display order; keep first-seen order for both axes
+            student_keys, student_first, student_index = np.unique(
+                np.fromiter(student_ids, dtype=np.int64, count=len(rows)), return_index=True, return_inverse=True
+            )
+            quiz_keys, quiz_first, quiz_index = np.unique(
+                np.fromiter(quiz_ids, dtype=np.int64, count=len(rows)), return_index=True, return_inverse=True
+            )
+            student_order = np.argsort(student_first)
+            quiz_order = np.argsort(quiz_first)
+            student_rank = np.empty_like(student_order)
+            student_rank[student_order] = np.arange(len(student_order))
+            quiz_rank = np.empty_like(quiz_order)
+            quiz_rank[quiz_order] = np.arange(len(quiz_order))
+            row_of = student_rank[student_index]
+            column_of = quiz_rank[quiz_index]
+
+            shape = (len(student_keys), len(quiz_keys))
+            percentage_matrix = np.full(shape, np.nan)
+            percentage_matrix[row_of, column_of] = np.array(
+                [np.nan if value is None else value for value in percentages], dtype=np.float64
+            )
+            grade_matrix = np.full(shape, None, dtype=object)
+            grade_matrix[row_of, column_of] = grades
+            overridden_matrix = np.zeros(shape, dtype=bool)
+            overridden_matrix[row_of, column_of] = [bool(value) for value in overridden]
+
+            # Averages over graded cells only
+            graded = ~np.isnan(percentage_matrix)
+            filled = np.where(graded, percentage_matrix, 0.0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                student_averages = filled.sum(axis=1) / graded.sum(axis=1)
+                quiz_averages = filled.sum(axis=0) / graded.sum(axis=0)
+            course_average = filled.sum() / graded.sum() if graded.any() else np.nan
+
+            students = [{
+                "id": student_ids[index],
+                "name": f"{first_names[index]} {last_names[index]}"
+            } for index in student_first[student_order]]
+            # Raw cursor values skip type processing, so convert the few dates shown
+            dialect = db.session.get_bind().dialect
+            to_datetime = Quiz.start_date.type.dialect_impl(dialect).result_processor(dialect, None) or (lambda value: value)
+            quizzes = [{
+                "id": quiz_ids[index],
+                "title": titles[index],
+                "total_marks": total_marks[index],
+                "start_date": to_datetime(start_dates[index])
+            } for index in quiz_first[quiz_order]]
+
+            return {
+                "course_id": course_id,
+                "course_name": course_name,
+                "students": students,
+                "quizzes": quizzes,
+                "percentages": GradebookRepository._nullable(percentage_matrix).tolist(),
+                "grades": grade_matrix.tolist(),
+                "overridden": overridden_matrix.tolist(),
+                "student_averages": GradebookRepository._nullable(student_averages).tolist(),
+                "quiz_averages": GradebookRepository._nullable(quiz_averages).tolist(),
+                "course_average": None if np.isnan(course_average) else float(course_average)
+            }
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _nullable(values):
+        """Float array as Python floats with NaN replaced by None, ready for JSON"""
+        return np.where(np.isnan(values), None, values.astype(object))
+
+    @staticmethod
+    def _roster(course_id):
+        """Students and quizzes of a course when the matrix has no cells"""
+        students = db.session.execute(
+            select(Student.id, Student.first_name, Student.last_name)
+            .join(Enrollment, Enrollment.student_id == Student.id)
+            .where(Enrollment.course_id == course_id)
+            .order_by(Student.last_name, Student.first_name, Student.id)
+        ).all()
+        quizzes = db.session.execute(
+            select(Quiz.id, Quiz.title, Quiz.total_marks, Quiz.start_date)
+            .where(Quiz.course_id == course_id)
+            .order_by(Quiz.start_date, Quiz.id)
+        ).all()
+        return students, quizzes
+
+    @staticmethod
+    def _empty_gradebook(course_id, course_name, students, quizzes):
+        return {
+            "course_id": course_id,
+            "course_name": course_name,
+            "students": [{"id": s.id, "name": f"{s.first_name} {s.last_name}"} for s in students],
+            "quizzes": [{"id": q.id, "title": q.title, "total_marks": q.total_marks, "start_date": q.start_date} for q in quizzes],
+            "percentages": [[None] * len(quizzes) for _ in students],
+            "grades": [[None] * len(quizzes) for _ in students],
+            "overridden": [[False] * len(quizzes) for _ in students],
+            "student_averages": [None] * len(students),
+            "quiz_averages": [None] * len(quizzes),
+            "course_average": None
+        }
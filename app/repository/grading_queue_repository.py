@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta, timezone
+from app.extension import db
+from app.model.models import GradingJob, QuizSubmission, QuizResult
+from flask import abort
+from sqlalchemy import and_, or_, select, update, case, func
+from sqlalchemy.exc import SQLAlchemyError
+
+
+def _utcnow():
+    """Naive UTC timestamp, comparable on both PostgreSQL and SQLite"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class GradingQueueRepository:
+
+    @staticmethod
+    def enqueue(submission_id):
+        """Add a grading job for a submission to the current transaction (caller commits)"""
+        job = GradingJob(submission_id=submission_id, status='pending', attempts=0, enqueued_at=_utcnow())
+        db.session.add(job)
+        return job
+
+    @staticmethod
+    def claim_next(worker_id, stale_after_seconds):
+        """Claim the oldest pending job, or one whose worker stopped responding.
+
+        Returns (job_id, submission_id, enqueued_at) or None when the queue is empty.
+        On PostgreSQL concurrent workers skip each other's locked rows; on SQLite the
+        conditional UPDATE alone guarantees a job is only claimed once.
+        """
+        try:
+            now = _utcnow()
+            claimable = or_(
+                GradingJob.status == 'pending',
+                and_(GradingJob.status == 'processing', GradingJob.locked_at < now - timedelta(seconds=stale_after_seconds))
+            )
+
+            candidate = db.session.execute(
+                select(GradingJob.id, GradingJob.submission_id, GradingJob.enqueued_at)
+                .where(claimable)
+                .order_by(GradingJob.id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).first()
+            if not candidate:
+                db.session.rollback()
+                return None
+
+            claimed = db.session.execute(
+                update(GradingJob)
+                .where(GradingJob.id == candidate.id, claimable)
+                .values(status='processing', locked_by=worker_id, locked_at=now, attempts=GradingJob.attempts + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+
+            return tuple(candidate) if claimed else None
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def complete(job_id, worker_id, enqueued_at):
+        """Mark a job as graded and record its grading lag.
+
+        Only the worker still holding the job may finish it: one whose job was reclaimed
+        after timing out changes nothing. Returns whether the job was still held.
+        """
+        try:
+            now = _utcnow()
+            completed = db.session.execute(
+                update(GradingJob)
+                .where(GradingJob.id == job_id, GradingJob.locked_by == worker_id)
+                .values(
+                    status='done',
+                    finished_at=now,
+                    last_error=None,
+                    lag_ms=(now - enqueued_at).total_seconds() * 1000
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            return bool(completed)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def fail(job_id, worker_id, error, max_attempts):
+        """Return a job to the queue, or mark it failed once it has used all its attempts.
+
+        Like complete(), a no-op for a worker whose job was reclaimed; returns whether it was still held.
+        """
+        try:
+            failed = db.session.execute(
+                update(GradingJob)
+                .where(GradingJob.id == job_id, GradingJob.locked_by == worker_id)
+                .values(
+                    status=case((GradingJob.attempts >= max_attempts, 'failed'), else_='pending'),
+                    last_error=error,
+                    locked_by=None,
+                    locked_at=None
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            return bool(failed)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_status(submission_id):
+        """Get grading status of a submission, with its result once graded"""
+        try:
+            row = db.session.execute(
+                select(
+                    QuizSubmission.id,
+                    GradingJob.status,
+                    GradingJob.attempts,
+                    GradingJob.last_error,
+                    GradingJob.enqueued_at,
+                    GradingJob.finished_at,
+                    QuizResult.marks_obtained,
+                    QuizResult.total_marks,
+                    QuizResult.percentage,
+                    QuizResult.grade
+                )
+                .outerjoin(GradingJob, GradingJob.submission_id == QuizSubmission.id)
+                .outerjoin(QuizResult, QuizResult.submission_id == QuizSubmission.id)
+                .where(QuizSubmission.id == submission_id)
+            ).first()
+            if not row:
+                abort(404, "Submission not found")
+
+            # Submissions graded synchronously never had a job
+            status = row.status or ('done' if row.grade is not None else 'pending')
+
+            return {
+                "submission_id": row.id,
+                "status": status,
+                "attempts": row.attempts or 0,
+                "error": row.last_error,
+                "enqueued_at": row.enqueued_at,
+                "finished_at": row.finished_at,
+                "result": {
+                    "marks_obtained": row.marks_obtained,
+                    "total_marks": row.total_marks,
+                    "percentage": row.percentage,
+                    "grade": row.grade
+                } if row.grade is not None else None
+            }
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_metrics(lag_window_seconds=300):
+        """Get queue depth per status and grading lag metrics"""
+        try:
+            now = _utcnow()
+
+            depth = {"pending": 0, "processing": 0, "failed": 0}
+            oldest_pending = None
+            for status, count, oldest in db.session.execute(
+                select(GradingJob.status, func.count(GradingJob.id), func.min(GradingJob.enqueued_at))
+                .where(GradingJob.status != 'done')
+                .group_by(GradingJob.status)
+            ):
+                depth[status] = count
+                if status == 'pending':
+                    oldest_pending = oldest
+
+            recent = db.session.execute(
+                select(func.count(GradingJob.id), func.avg(GradingJob.lag_ms), func.max(GradingJob.lag_ms))
+                .where(GradingJob.status == 'done', GradingJob.finished_at >= now - timedelta(seconds=lag_window_seconds))
+            ).one()
+
+            return {
+                "queue_depth": depth["pending"],
+                "processing": depth["processing"],
+                "failed": depth["failed"],
+                "oldest_pending_seconds": (now - oldest_pending).total_seconds() if oldest_pending else 0,
+                "lag_window_seconds": lag_window_seconds,
+                "graded_in_window": recent[0],
+                "avg_lag_ms": recent[1],
+                "max_lag_ms": recent[2]
+            }
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
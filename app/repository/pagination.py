@@ -0,0 +1,96 @@
+import base64
+import json
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Query arguments that shape a listing; every other list argument is a column filter
+PAGE_ARGS = ("limit", "cursor", "sort", "fields", "stream")
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token is malformed or was issued for a different sort"""
+
+
+def apply_filters(statement, model, filters):
+    """Push equality filters into SQL; keys are column names on model, None values are skipped"""
+    for name, value in (filters or {}).items():
+        if value is not None:
+            statement = statement.where(getattr(model, name) == value)
+    return statement
+
+
+def resolve_sort(sort, columns):
+    """Map a sort key such as "last_name" or "-grade" to (column, descending)"""
+    descending = sort.startswith("-")
+    column = columns.get(sort.lstrip("-"))
+    if column is None:
+        raise ValueError(f"Unsupported sort: {sort}")
+    return column, descending
+
+
+def keyset_page(statement, sort_column, id_column, limit, cursor=None, descending=False):
+    """Order statement by (sort_column, id_column), resume after cursor and fetch one row past limit.
+
+    The extra row only tells page_of whether a next page exists; nothing is counted or offset.
+    """
+    sort_key = f"{'-' if descending else ''}{sort_column.key}"
+    if cursor is not None:
+        sort_value, last_id = decode_cursor(cursor, sort_key, sort_column)
+        if sort_column is id_column:
+            after = id_column < last_id if descending else id_column > last_id
+        elif descending:
+            after = or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < last_id))
+        else:
+            after = or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > last_id))
+        statement = statement.where(after)
+
+    return order_by_key(statement, sort_column, id_column, descending).limit(limit + 1)
+
+
+def order_by_key(statement, sort_column, id_column, descending=False):
+    """Order by sort_column with id_column as the tie-breaker, giving every row a stable position"""
+    if sort_column is id_column:
+        ordering = (id_column.desc() if descending else id_column.asc(),)
+    else:
+        ordering = (sort_column.desc(), id_column.desc()) if descending else (sort_column.asc(), id_column.asc())
+    return statement.order_by(*ordering)
+
+
+def page_of(rows, limit, sort_column, id_column, descending=False):
+    """Trim the look-ahead row and return (rows, next_cursor); next_cursor is None on the last page"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    sort_key = f"{'-' if descending else ''}{sort_column.key}"
+    return rows, encode_cursor(sort_key, getattr(last, sort_column.key), getattr(last, id_column.key))
+
+
+def encode_cursor(sort_key, sort_value, last_id):
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_key, sort_value, last_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token, sort_key, sort_column):
+    """Return (sort_value, last_id) from a token issued for the same sort"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        issued_for, sort_value, last_id = payload
+        last_id = int(last_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor")
+    if issued_for != sort_key:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+
+    # Dates travel as ISO strings; bind them back as the column's Python type
+    python_type = sort_column.type.python_type
+    if sort_value is not None and python_type in (date, datetime):
+        try:
+            sort_value = python_type.fromisoformat(sort_value)
+        except (ValueError, TypeError):
+            raise InvalidCursor("Invalid cursor")
+    return sort_value, last_id
@@ -0,0 +1,88 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+
+class PasswordHasherBusy(Exception):
+    """Every hashing slot is taken; the request should be answered with 503 and retried"""
+
+
+def canonical_method(method):
+    """The method prefix generate_password_hash writes for method, e.g. pbkdf2 -> pbkdf2:sha256:260000"""
+    parts = method.split(":")
+    if parts[0] == "pbkdf2":
+        parts += ["sha256", str(DEFAULT_PBKDF2_ITERATIONS)][len(parts) - 1:]
+    return ":".join(parts)
+
+
+class PasswordHasher:
+    """Bounded thread pool for password key derivation, off the request threads.
+
+    hashlib's key derivation releases the GIL, so hashes run in parallel on `workers`
+    threads while CPU for other requests stays available. At most `max_pending` more wait
+    for a thread; past that, callers get PasswordHasherBusy at once instead of queueing.
+    """
+
+    def __init__(self, workers, max_pending, method, salt_length):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.method = canonical_method(method)
+        self.salt_length = salt_length
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def hash(self, password):
+        """Hash a password with the configured method"""
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored hash of any supported method"""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when a stored method$salt$hash differs from the configured parameters: hash
+        function, pbkdf2 iterations (defaults spelled out on both sides) or salt length"""
+        method, _, rest = password_hash.partition("$")
+        salt, separator, _ = rest.partition("$")
+        if not separator:
+            return True
+        return canonical_method(method) != self.method or len(salt) != self.salt_length
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Too many logins in progress, please retry shortly")
+        try:
+            with self._lock:
+                self.in_flight += 1
+            return self._executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "method": self.method,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1)),
+    max_pending=int(os.getenv("PASSWORD_HASH_MAX_PENDING", 16)),
+    method=os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256"),
+    salt_length=int(os.getenv("PASSWORD_HASH_SALT_LENGTH", 16))
+)
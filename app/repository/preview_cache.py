@@ -0,0 +1,11 @@
+import os
+from collections import namedtuple
+from app.repository.lru_cache import LRUCache
+
+
+# A student-facing quiz preview encoded once, with its strong ETag
+CachedPreview = namedtuple('CachedPreview', ['body', 'etag'])
+
+# Keyed by (quiz_id, content_version), so question edits never hit stale entries.
+# Deleting a quiz drops its entries, since a new quiz may reuse the id at version 1.
+preview_cache = LRUCache(maxsize=int(os.getenv("PREVIEW_CACHE_SIZE", 256)))
@@ -0,0 +1,68 @@
+from app.extension import db
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from app.repository.lru_cache import LRUCache
+
+# Rows fetched per round trip when streaming a whole table
+STREAM_BATCH_SIZE = 1000
+
+# Serializers kept per projection; field sets are canonical, so this only bounds rare subsets
+SERIALIZER_CACHE_SIZE = 64
+
+
+class Projection:
+    """Read-only view of a model as named columns, returned as Core rows instead of ORM entities.
+
+    Rows skip the identity map and attribute instrumentation; a serializer built once per field
+    set turns each row into a dict. Dates stay date objects for the JSON provider to encode.
+    """
+
+    def __init__(self, **columns):
+        self.columns = columns
+        self.field_names = tuple(columns)
+        self._serializers = LRUCache(SERIALIZER_CACHE_SIZE)
+
+    def select(self, fields=None, required=()):
+        """Statement selecting fields (all when empty) then any required columns, and its row serializer.
+
+        Required columns, such as the keyset sort key, are read but left out of the output.
+        """
+        names = self.canonical(fields)
+        selected = names + tuple(column.key for column in required if column.key not in names)
+        statement = select(*(self.columns[name] for name in selected))
+        return statement, self._serializers.get(names, Projection._build_serializer)
+
+    def canonical(self, fields=None):
+        """fields deduplicated and in projection order, so equal field sets share a statement and serializer"""
+        if not fields:
+            return self.field_names
+        requested = set(fields)
+        unknown = requested.difference(self.columns)
+        if unknown:
+            raise KeyError(", ".join(sorted(unknown)))
+        return tuple(name for name in self.field_names if name in requested)
+
+    def serializer(self, names):
+        """Row-to-dict function for names; zip drops the trailing required-only columns"""
+        return self._serializers.get(self.canonical(names), Projection._build_serializer)
+
+    @staticmethod
+    def _build_serializer(names):
+        def serializer(row):
+            return dict(zip(names, row))
+        return serializer
+
+
+def stream_rows(statement, serialize, batch_size=STREAM_BATCH_SIZE):
+    """Yield every row of statement as a dict; yield_per keeps only one batch in memory at a time"""
+    try:
+        result = db.session.execute(statement.execution_options(yield_per=batch_size))
+        try:
+            for partition in result.partitions():
+                for row in partition:
+                    yield serialize(row)
+        finally:
+            result.close()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise e
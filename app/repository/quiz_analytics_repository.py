@@ -0,0 +1,172 @@
+import numpy as np
+from app.extension import db
+from app.model.models import Quiz, QuizSubmission, QuizAnswer
+from app.repository.quiz_repository import QuizGradingRepository
+from flask import abort
+from sqlalchemy import select, func
+from sqlalchemy.exc import SQLAlchemyError
+
+
+MULTIPLE_CHOICE_OPTIONS = ('A', 'B', 'C', 'D')
+
+
+class QuizAnalyticsRepository:
+
+    @staticmethod
+    def get_item_analysis(quiz_id, histogram_bins=10):
+        """Per-question difficulty, discrimination and distractor analysis for a quiz"""
+        try:
+            quiz = db.session.get(Quiz, quiz_id)
+            if not quiz:
+                abort(404, "Quiz not found")
+
+            answer_key = QuizGradingRepository.get_answer_key(quiz_id, quiz.content_version)
+
+            # One columnar query read straight from the DBAPI cursor, skipping ORM and Row
+            # construction. Multiple choice answers are normalized in SQL.
+            result = db.session.connection().execute(
+                select(
+                    QuizAnswer.submission_id,
+                    QuizAnswer.question_id,
+                    QuizAnswer.is_correct,
+                    QuizAnswer.marks_obtained,
+                    func.upper(func.trim(QuizAnswer.student_answer))
+                )
+                .join(QuizSubmission, QuizSubmission.id == QuizAnswer.submission_id)
+                .where(QuizSubmission.quiz_id == quiz_id, QuizAnswer.is_correct.isnot(None))
+            )
+            rows = result.cursor.fetchall()
+            result.close()
+
+            question_ids = np.frombuffer(answer_key.question_ids, dtype=np.int64)
+            total_marks = float(np.frombuffer(answer_key.marks, dtype=np.float64).sum())
+
+            if not rows or not len(question_ids):
+                return QuizAnalyticsRepository._empty_analysis(quiz, answer_key, total_marks)
+
+            submission_ids, answer_question_ids, is_correct, marks_obtained, answers = zip(*rows)
+            answer_question_ids = np.fromiter(answer_question_ids, dtype=np.int64, count=len(rows))
+
+            # Map each answer to its question column, dropping answers to deleted questions
+            order = np.argsort(question_ids)
+            found = np.searchsorted(question_ids, answer_question_ids, sorter=order)
+            found = np.minimum(found, len(question_ids) - 1)
+            columns = order[found]
+            known = question_ids[columns] == answer_question_ids
+
+            submission_index, rows_of = np.unique(np.fromiter(submission_ids, dtype=np.int64, count=len(rows)), return_inverse=True)
+            rows_of = rows_of[known]
+            columns = columns[known]
+
+            submission_count = len(submission_index)
+            question_count = len(question_ids)
+
+            correct = np.zeros((submission_count, question_count))
+            marks = np.zeros((submission_count, question_count))
+            correct[rows_of, columns] = np.fromiter(is_correct, dtype=np.float64, count=len(rows))[known]
+            marks[rows_of, columns] = np.array(marks_obtained, dtype=np.float64)[known]
+
+            scores = marks.sum(axis=1)
+            percentages = scores / total_marks * 100 if total_marks > 0 else np.zeros(submission_count)
+
+            # Difficulty: share of students answering correctly
+            p_values = correct.mean(axis=0)
+
+            # Discrimination: point-biserial correlation of each item with the rest of the score
+            rest_scores = scores[:, None] - marks
+            item_deviation = correct - p_values
+            rest_deviation = rest_scores - rest_scores.mean(axis=0)
+            denominator = np.sqrt((item_deviation ** 2).sum(axis=0) * (rest_deviation ** 2).sum(axis=0))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                discrimination = np.where(denominator > 0, (item_deviation * rest_deviation).sum(axis=0) / denominator, np.nan)
+
+            responses = np.bincount(columns, minlength=question_count)
+            distractors = QuizAnalyticsRepository._option_distributions(answer_key, np.array(answers, dtype=object)[known], columns)
+
+            counts, edges = np.histogram(percentages, bins=histogram_bins, range=(0, 100))
+
+            questions = []
+            for index in range(question_count):
+                question = {
+                    "question_id": int(question_ids[index]),
+                    "order_number": answer_key.order_numbers[index],
+                    "question_type": answer_key.question_type(index),
+                    "correct_answer": answer_key.correct_answers[index],
+                    "marks": answer_key.marks[index],
+                    "responses": int(responses[index]),
+                    "p_value": float(p_values[index]),
+                    "discrimination": None if np.isnan(discrimination[index]) else float(discrimination[index])
+                }
+                if index in distractors:
+                    question["options"] = distractors[index]
+                questions.append(question)
+
+            return {
+                "quiz_id": quiz.id,
+                "quiz_title": quiz.title,
+                "submission_count": submission_count,
+                "question_count": question_count,
+                "total_marks": total_marks,
+                "scores": {
+                    "mean": float(percentages.mean()),
+                    "median": float(np.median(percentages)),
+                    "std": float(percentages.std()),
+                    "min": float(percentages.min()),
+                    "max": float(percentages.max())
+                },
+                "histogram": {
+                    "bin_edges": edges.tolist(),
+                    "counts": counts.tolist()
+                },
+                "questions": questions
+            }
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _option_distributions(answer_key, answers, columns):
+        """Count chosen options per multiple choice question, keyed by question column"""
+        distributions = {}
+        multiple_choice = [
+            index for index in range(len(answer_key))
+            if answer_key.question_type(index) == 'multiple_choice'
+        ]
+        if not multiple_choice:
+            return distributions
+
+        sort_order = np.argsort(columns, kind='stable')
+        sorted_columns = columns[sort_order]
+        sorted_answers = answers[sort_order]
+        for index in multiple_choice:
+            start, end = np.searchsorted(sorted_columns, [index, index + 1])
+            chosen, counts = np.unique(sorted_answers[start:end].astype(str), return_counts=True)
+            chosen_counts = dict(zip(chosen.tolist(), counts.tolist()))
+
+            options = {option: chosen_counts.pop(option, 0) for option in MULTIPLE_CHOICE_OPTIONS}
+            options["blank"] = chosen_counts.pop('', 0)
+            options["other"] = sum(chosen_counts.values())
+            distributions[index] = options
+        return distributions
+
+    @staticmethod
+    def _empty_analysis(quiz, answer_key, total_marks):
+        return {
+            "quiz_id": quiz.id,
+            "quiz_title": quiz.title,
+            "submission_count": 0,
+            "question_count": len(answer_key),
+            "total_marks": total_marks,
+            "scores": None,
+            "histogram": None,
+            "questions": [{
+                "question_id": answer_key.question_ids[index],
+                "order_number": answer_key.order_numbers[index],
+                "question_type": answer_key.question_type(index),
+                "correct_answer": answer_key.correct_answers[index],
+                "marks": answer_key.marks[index],
+                "responses": 0,
+                "p_value": None,
+                "discrimination": None
+            } for index in range(len(answer_key))]
+        }
@@ -0,0 +1,121 @@
+from app.extension import db
+from app.model.models import Quiz, QuizQuestion, QuizSubmission, QuizAnswer, QuizResult, Student, Course
+from flask import abort
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+RESULT_EXPORT_COLUMNS = (
+    'result_id', 'submission_id', 'quiz_id', 'quiz_title', 'student_id', 'student_name',
+    'total_marks', 'marks_obtained', 'percentage', 'grade', 'graded_by_teacher',
+    'submitted_at', 'graded_at', 'created_at'
+)
+
+ANSWER_EXPORT_COLUMNS = (
+    'answer_id', 'submission_id', 'student_id', 'student_name', 'question_id', 'order_number',
+    'question_type', 'student_answer', 'correct_answer', 'is_correct', 'marks_obtained', 'marks'
+)
+
+
+class QuizExportRepository:
+
+    @staticmethod
+    def ensure_quiz_exists(quiz_id):
+        """Abort with 404 before a quiz export starts streaming"""
+        try:
+            if db.session.scalar(select(Quiz.id).where(Quiz.id == quiz_id)) is None:
+                abort(404, "Quiz not found")
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def ensure_course_exists(course_id):
+        """Abort with 404 before a course export starts streaming"""
+        try:
+            if db.session.scalar(select(Course.id).where(Course.id == course_id)) is None:
+                abort(404, "Course not found")
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def iter_quiz_results(quiz_id):
+        """Yield result rows of a quiz in batches from a server-side cursor"""
+        return QuizExportRepository._stream(
+            QuizExportRepository._results_query().where(QuizSubmission.quiz_id == quiz_id)
+        )
+
+    @staticmethod
+    def iter_course_results(course_id):
+        """Yield result rows of every quiz in a course in batches from a server-side cursor"""
+        return QuizExportRepository._stream(
+            QuizExportRepository._results_query().where(Quiz.course_id == course_id)
+        )
+
+    @staticmethod
+    def iter_quiz_answers(quiz_id):
+        """Yield answer rows of a quiz, one per question per submission"""
+        return QuizExportRepository._stream(
+            select(
+                QuizAnswer.id.label('answer_id'),
+                QuizAnswer.submission_id,
+                QuizSubmission.student_id,
+                (Student.first_name + ' ' + Student.last_name).label('student_name'),
+                QuizAnswer.question_id,
+                QuizQuestion.order_number,
+                QuizQuestion.question_type,
+                QuizAnswer.student_answer,
+                QuizQuestion.correct_answer,
+                QuizAnswer.is_correct,
+                QuizAnswer.marks_obtained,
+                QuizQuestion.marks
+            )
+            .join(QuizSubmission, QuizSubmission.id == QuizAnswer.submission_id)
+            .join(Student, Student.id == QuizSubmission.student_id)
+            .join(QuizQuestion, QuizQuestion.id == QuizAnswer.question_id)
+            .where(QuizSubmission.quiz_id == quiz_id)
+            .order_by(QuizAnswer.submission_id, QuizQuestion.order_number)
+        )
+
+    @staticmethod
+    def _results_query():
+        return (
+            select(
+                QuizResult.id.label('result_id'),
+                QuizResult.submission_id,
+                Quiz.id.label('quiz_id'),
+                Quiz.title.label('quiz_title'),
+                QuizSubmission.student_id,
+                (Student.first_name + ' ' + Student.last_name).label('student_name'),
+                QuizResult.total_marks,
+                QuizResult.marks_obtained,
+                QuizResult.percentage,
+                QuizResult.grade,
+                QuizResult.graded_by_teacher,
+                QuizSubmission.submitted_at,
+                QuizResult.graded_at,
+                QuizResult.created_at
+            )
+            .join(QuizSubmission, QuizSubmission.id == QuizResult.submission_id)
+            .join(Quiz, Quiz.id == QuizSubmission.quiz_id)
+            .join(Student, Student.id == QuizSubmission.student_id)
+            .order_by(Quiz.id, QuizResult.id)
+        )
+
+    @staticmethod
+    def _stream(statement):
+        """Yield rows as tuples; yield_per keeps only one batch in memory at a time"""
+        try:
+            result = db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            try:
+                for partition in result.partitions():
+                    yield from partition
+            finally:
+                result.close()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
@@ -0,0 +1,121 @@
+from app.extension import db
+from app.model.models import Quiz, QuizSubmission, QuizAnswer, QuizResult, Enrollment
+from app.repository.quiz_repository import QuizGradingRepository, QuizStatsRepository
+from app.repository.course_grade_repository import CourseGradeRepository
+from flask import abort
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+
+class QuizImportRepository:
+
+    @staticmethod
+    def import_submissions(quiz_id, sheet_chunks, grader):
+        """Validate, grade and bulk insert answer sheets for a quiz in one transaction.
+
+        `sheet_chunks` yields lists of dicts with row, student_id, time_taken_minutes and answers
+        in question order; each list is graded and inserted before the next is read, so only one
+        is held in memory. `grader(answer_key, answer_lists)` returns grade_sheets() output for them.
+        Returns (imported count, per-row errors).
+        """
+        try:
+            quiz = db.session.get(Quiz, quiz_id)
+            if not quiz:
+                abort(404, "Quiz not found")
+
+            answer_key = QuizGradingRepository.get_answer_key(quiz_id, quiz.content_version)
+
+            # One query each for the course roster and students who already submitted
+            enrolled = set(db.session.scalars(
+                select(Enrollment.student_id).where(Enrollment.course_id == quiz.course_id)
+            ))
+            submitted = set(db.session.scalars(
+                select(QuizSubmission.student_id).where(QuizSubmission.quiz_id == quiz_id)
+            ))
+
+            imported = 0
+            errors = []
+            for sheets in sheet_chunks:
+                accepted = QuizImportRepository._accept_sheets(sheets, len(answer_key), enrolled, submitted, errors)
+                if accepted:
+                    QuizImportRepository._insert_sheets(quiz_id, answer_key, accepted, grader(answer_key, [sheet['answers'] for sheet in accepted]))
+                    imported += len(accepted)
+
+            if not imported:
+                return 0, errors
+
+            # One aggregate query instead of a stats delta per imported sheet
+            QuizStatsRepository.refresh(quiz_id)
+            CourseGradeRepository.recompute_course_in_transaction(quiz.course_id)
+            db.session.commit()
+
+            return imported, errors
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _accept_sheets(sheets, question_count, enrolled, submitted, errors):
+        """Sheets that may be imported, padded to question_count answers; the rest are added to errors"""
+        accepted = []
+        for sheet in sheets:
+            student_id = sheet['student_id']
+            if student_id not in enrolled:
+                error = "Student is not enrolled in this course"
+            elif student_id in submitted:
+                error = "Quiz has already been submitted"
+            elif len(sheet['answers']) > question_count:
+                error = f"Expected at most {question_count} answers, got {len(sheet['answers'])}"
+            else:
+                error = None
+
+            if error:
+                errors.append({"row": sheet['row'], "student_id": student_id, "error": error})
+                continue
+            submitted.add(student_id)
+            # Missing trailing answers are blank, as in the single submission route
+            sheet['answers'] = list(sheet['answers']) + [""] * (question_count - len(sheet['answers']))
+            accepted.append(sheet)
+        return accepted
+
+    @staticmethod
+    def _insert_sheets(quiz_id, answer_key, sheets, graded):
+        """Bulk insert graded sheets as submissions with their answers and results"""
+        submission_ids = db.session.scalars(
+            insert(QuizSubmission).returning(QuizSubmission.id, sort_by_parameter_order=True),
+            [{
+                'quiz_id': quiz_id,
+                'student_id': sheet['student_id'],
+                'time_taken_minutes': sheet.get('time_taken_minutes'),
+                'is_completed': True
+            } for sheet in sheets]
+        ).all()
+
+        question_ids = answer_key.question_ids
+        total_marks = sum(answer_key.marks)
+
+        answer_rows = []
+        result_rows = []
+        for submission_id, sheet, (correct, marks, marks_obtained) in zip(submission_ids, sheets, graded):
+            answer_rows.extend({
+                'submission_id': submission_id,
+                'question_id': question_ids[index],
+                'student_answer': answer,
+                'is_correct': correct[index],
+                'marks_obtained': marks[index]
+            } for index, answer in enumerate(sheet['answers']))
+
+            percentage = (marks_obtained / total_marks) * 100 if total_marks > 0 else 0
+            result_rows.append({
+                'submission_id': submission_id,
+                'total_marks': total_marks,
+                'marks_obtained': marks_obtained,
+                'percentage': percentage,
+                'grade': QuizGradingRepository._calculate_grade(percentage),
+                'graded_by_teacher': False
+            })
+
+        # Core table inserts: plain executemany without ORM bulk-save bookkeeping
+        if answer_rows:
+            db.session.execute(insert(QuizAnswer.__table__), answer_rows)
+        db.session.execute(insert(QuizResult.__table__), result_rows)
@@ -1,9 +1,49 @@
-from app.model.models import Quiz, QuizQuestion, QuizSubmission, QuizAnswer, QuizResult, Student, Course
+from app.model.models import Quiz, QuizQuestion, QuizSubmission, QuizAnswer, QuizResult, QuizStats, Student, Course, Enrollment
 from app.extension import db
+from app.repository.grading_queue_repository import GradingQueueRepository
+from app.repository.course_grade_repository import CourseGradeRepository
+from app.repository.answer_key_cache import answer_key_cache, CompiledAnswerKey, normalize_answer, type_code
+from app.repository.preview_cache import preview_cache
 from datetime import datetime, timezone
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select, insert, update, delete, case, func, literal, Integer, DateTime
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
 from flask import abort
+import time
+
+
+# Minimum percentage for each letter grade, highest first
+GRADE_BOUNDARIES = [
+    (90, 'A+'),
+    (85, 'A'),
+    (80, 'B+'),
+    (75, 'B'),
+    (70, 'C+'),
+    (65, 'C'),
+    (60, 'D'),
+]
+
+# QuizStats counter column for each letter grade
+GRADE_COUNT_COLUMNS = {
+    'A+': 'grade_a_plus',
+    'A': 'grade_a',
+    'B+': 'grade_b_plus',
+    'B': 'grade_b',
+    'C+': 'grade_c_plus',
+    'C': 'grade_c',
+    'D': 'grade_d',
+    'F': 'grade_f',
+}
+
+# QuizStats counter columns for each 10% band of percentage
+DECILE_COLUMNS = [f'decile_{band}' for band in range(10)]
+
+# Answers read and rewritten per batch when a quiz is regraded
+REGRADE_BATCH_SIZE = 5000
+
+
+def _decile_column(percentage):
+    return DECILE_COLUMNS[min(max(int(percentage // 10), 0), 9)]
 
 
 class QuizRepository:
@@ -41,77 +81,88 @@ class QuizRepository:
     
     @staticmethod
     def get_quizzes_by_course(course_id):
-        """Get all quizzes for a specific course"""
+        """Get all quizzes for a specific course with question counts, in one query"""
         try:
-            return Quiz.query.filter_by(course_id=course_id).order_by(Quiz.created_at.desc()).all()
+            return db.session.execute(
+                QuizRepository._listing_query()
+                .where(Quiz.course_id == course_id)
+                .order_by(Quiz.created_at.desc())
+            ).all()
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def get_available_quizzes_for_student(student_id, course_id):
-        """Get available quizzes for a student (not yet attempted and within date range)"""
-        try:
-            from app.repository.enrollment_repository import EnrollmentRepository
-            
-            # Check if student is enrolled in the course
-            enrollment = EnrollmentRepository.get_enrollment_by_student_and_course(student_id, course_id)
-            if not enrollment:
-                abort(400, "Student is not enrolled in this course")
-            
-            # Get all quizzes for course (bypass date filtering for now)
-            all_quizzes = QuizRepository.get_quizzes_by_course(course_id)
-            
-            # Filter out already attempted quizzes
-            available_quizzes = []
-            for quiz in all_quizzes:
-                if quiz.is_active:  # Simple check without date comparison
-                    submission = QuizSubmissionRepository.get_student_submission_for_quiz(student_id, quiz.id)
-                    if not submission:
-                        available_quizzes.append(quiz)
-            
-            return available_quizzes
-        except SQLAlchemyError as e:
-            db.session.rollback()
-            raise e
+    def _listing_query():
+        """Quiz listing rows with course name, question count and question marks total.
+
+        Counts come from a grouped subquery so listings never load question collections.
+        """
+        question_totals = (
+            select(
+                QuizQuestion.quiz_id,
+                func.count(QuizQuestion.id).label('question_count'),
+                func.sum(QuizQuestion.marks).label('question_marks')
+            )
+            .group_by(QuizQuestion.quiz_id)
+            .subquery()
+        )
+        return (
+            select(
+                Quiz.id,
+                Quiz.course_id,
+                Course.name.label('course_name'),
+                Quiz.title,
+                Quiz.description,
+                Quiz.total_marks,
+                Quiz.weight,
+                Quiz.duration_minutes,
+                Quiz.start_date,
+                Quiz.end_date,
+                Quiz.is_active,
+                Quiz.created_at,
+                func.coalesce(question_totals.c.question_count, 0).label('question_count'),
+                func.coalesce(question_totals.c.question_marks, 0.0).label('question_marks')
+            )
+            .join(Course, Course.id == Quiz.course_id)
+            .outerjoin(question_totals, question_totals.c.quiz_id == Quiz.id)
+        )
     
     @staticmethod
-    def get_quiz_preview_for_student(student_id, quiz_id):
-        """Allow student to preview quiz questions before attempting"""
+    def get_available_quizzes_for_student(student_id, course_id=None):
+        """Get quizzes open to a student: in an enrolled course, active, inside the date window
+        and not yet attempted. One anti-join query; all enrolled courses when course_id is None.
+        """
         try:
-            from app.repository.enrollment_repository import EnrollmentRepository
-            
-            quiz = QuizRepository.get_quiz_by_id(quiz_id)
-            if not quiz:
-                abort(404, "Quiz not found")
-
-            enrollment = EnrollmentRepository.get_enrollment_by_student_and_course(student_id, quiz.course_id)
-            if not enrollment:
-                abort(400, "Student is not enrolled in this course")
-
-            submission = QuizSubmissionRepository.get_student_submission_for_quiz(student_id, quiz_id)
-            if submission:
-                abort(400, "Quiz has already been submitted")
-            
-            if not quiz.is_active:
-                abort(400, "Quiz is not active")
+            now = datetime.now()  # Use naive datetime to match database
+            query = (
+                QuizRepository._listing_query()
+                .where(
+                    Quiz.is_active == True,
+                    Quiz.start_date <= now,
+                    Quiz.end_date >= now,
+                    select(Enrollment.id).where(
+                        Enrollment.course_id == Quiz.course_id,
+                        Enrollment.student_id == student_id
+                    ).exists(),
+                    ~select(QuizSubmission.id).where(
+                        QuizSubmission.quiz_id == Quiz.id,
+                        QuizSubmission.student_id == student_id
+                    ).exists()
+                )
+                .order_by(Quiz.end_date, Quiz.id)
+            )
+            if course_id is not None:
+                query = query.where(Quiz.course_id == course_id)
+            available_quizzes = db.session.execute(query).all()
             
-            quiz_preview = {
-                "question_count": len(quiz.questions),
-                "questions": [{
-                    "id": q.id,
-                    "question_text": q.question_text,
-                    "question_type": q.question_type,
-                    "option_a": q.option_a if q.question_type == "multiple_choice" else None,
-                    "option_b": q.option_b if q.question_type == "multiple_choice" else None,
-                    "option_c": q.option_c if q.question_type == "multiple_choice" else None,
-                    "option_d": q.option_d if q.question_type == "multiple_choice" else None,
-                    "marks": q.marks,
-                    "order_number": q.order_number
-                } for q in sorted(quiz.questions, key=lambda x: x.order_number)],
-            }
+            # Only an empty result needs telling apart from a missing enrollment
+            if not available_quizzes and course_id is not None:
+                from app.repository.enrollment_repository import EnrollmentRepository
+                if not EnrollmentRepository.get_enrollment_by_student_and_course(student_id, course_id):
+                    abort(400, "Student is not enrolled in this course")
             
-            return quiz_preview
+            return available_quizzes
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -143,6 +194,9 @@ class QuizRepository:
             
             for key, value in update_data.items():
                 setattr(quiz, key, value)
+            if 'weight' in update_data:
+                db.session.flush()
+                CourseGradeRepository.recompute_course_in_transaction(quiz.course_id)
             db.session.commit()
             return quiz
         except SQLAlchemyError as e:
@@ -157,18 +211,178 @@ class QuizRepository:
             if not quiz:
                 abort(404, "Quiz not found")
             
+            course_id = quiz.course_id
             db.session.delete(quiz)
+            db.session.flush()
+            CourseGradeRepository.recompute_course_in_transaction(course_id)
             db.session.commit()
+            # The id may be reused by a new quiz starting again at content_version 1
+            for cache in (answer_key_cache, preview_cache):
+                cache.invalidate_where(lambda key: key[0] == quiz_id)
             return {"deleted": True}
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
+    @staticmethod
+    def clone_quiz(quiz_id, course_id=None, title=None, start_date=None, end_date=None):
+        """Copy a quiz and its questions, optionally into another course or date window.
+
+        The questions are copied by one INSERT ... SELECT. A new start_date without an
+        end_date keeps the source quiz's window length. Returns the new quiz id.
+        """
+        try:
+            source = db.session.get(Quiz, quiz_id)
+            if not source:
+                abort(404, "Quiz not found")
+            if course_id is not None and course_id != source.course_id and db.session.get(Course, course_id) is None:
+                abort(400, "Course not found")
+            
+            if start_date is None:
+                start_date = source.start_date
+            if end_date is None:
+                end_date = start_date + (source.end_date - source.start_date)
+            if end_date <= start_date:
+                abort(400, "End date must be after start date")
+            
+            clone_id = db.session.execute(
+                insert(Quiz).values(
+                    course_id=source.course_id if course_id is None else course_id,
+                    title=source.title if title is None else title,
+                    description=source.description,
+                    total_marks=source.total_marks,
+                    duration_minutes=source.duration_minutes,
+                    start_date=start_date,
+                    end_date=end_date,
+                    is_active=source.is_active,
+                    weight=source.weight
+                ).returning(Quiz.id)
+            ).scalar_one()
+            
+            copied_columns = [
+                'question_text', 'question_type', 'option_a', 'option_b', 'option_c', 'option_d',
+                'correct_answer', 'marks', 'order_number'
+            ]
+            db.session.execute(
+                insert(QuizQuestion).from_select(
+                    ['quiz_id', 'created_at', *copied_columns],
+                    select(
+                        literal(clone_id, Integer),
+                        literal(datetime.now(timezone.utc), DateTime),
+                        *(getattr(QuizQuestion, column) for column in copied_columns)
+                    )
+                    .where(QuizQuestion.quiz_id == quiz_id)
+                    .order_by(QuizQuestion.order_number)
+                )
+            )
+            db.session.commit()
+            return clone_id
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def bump_content_version(*quiz_ids):
+        """Mark quizzes' questions as changed within the caller's transaction; returns the number of quizzes found"""
+        return db.session.execute(
+            update(Quiz)
+            .where(Quiz.id.in_(set(quiz_ids)))
+            .values(content_version=Quiz.content_version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    
+    @staticmethod
+    def check_preview_access(student_id, quiz_id):
+        """Check in one query that a student may preview a quiz; returns its content version"""
+        try:
+            row = db.session.execute(
+                select(
+                    Quiz.is_active,
+                    Quiz.content_version,
+                    select(Enrollment.id).where(
+                        Enrollment.course_id == Quiz.course_id,
+                        Enrollment.student_id == student_id
+                    ).exists().label('enrolled'),
+                    select(QuizSubmission.id).where(
+                        QuizSubmission.quiz_id == Quiz.id,
+                        QuizSubmission.student_id == student_id
+                    ).exists().label('submitted')
+                ).where(Quiz.id == quiz_id)
+            ).first()
+            if not row:
+                abort(404, "Quiz not found")
+            if not row.enrolled:
+                abort(400, "Student is not enrolled in this course")
+            if row.submitted:
+                abort(400, "Quiz has already been submitted")
+            if not row.is_active:
+                abort(400, "Quiz is not active")
+            return row.content_version
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def get_preview_payload(quiz_id):
+        """Student-facing questions of a quiz, without answers, ordered in SQL"""
+        try:
+            questions = db.session.execute(
+                select(
+                    QuizQuestion.id,
+                    QuizQuestion.question_text,
+                    QuizQuestion.question_type,
+                    QuizQuestion.option_a,
+                    QuizQuestion.option_b,
+                    QuizQuestion.option_c,
+                    QuizQuestion.option_d,
+                    QuizQuestion.marks,
+                    QuizQuestion.order_number
+                )
+                .where(QuizQuestion.quiz_id == quiz_id)
+                .order_by(QuizQuestion.order_number)
+            ).all()
+            
+            return {
+                "question_count": len(questions),
+                "questions": [{
+                    "id": q.id,
+                    "question_text": q.question_text,
+                    "question_type": q.question_type,
+                    "option_a": q.option_a if q.question_type == "multiple_choice" else None,
+                    "option_b": q.option_b if q.question_type == "multiple_choice" else None,
+                    "option_c": q.option_c if q.question_type == "multiple_choice" else None,
+                    "option_d": q.option_d if q.question_type == "multiple_choice" else None,
+                    "marks": q.marks,
+                    "order_number": q.order_number
+                } for q in questions],
+            }
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def get_quizzes_starting_between(start, end):
+        """(id, content_version) of active quizzes whose start_date falls in [start, end]"""
+        try:
+            return db.session.execute(
+                select(Quiz.id, Quiz.content_version)
+                .where(Quiz.is_active == True, Quiz.start_date >= start, Quiz.start_date <= end)
+            ).all()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+    
     @staticmethod
     def get_quiz_with_questions(quiz_id):
-        """Get quiz with all its questions"""
+        """Get quiz with its course and all its questions loaded up front"""
         try:
-            return Quiz.query.filter_by(id=quiz_id).first()
+            quiz = Quiz.query.options(
+                joinedload(Quiz.course),
+                selectinload(Quiz.questions)
+            ).filter_by(id=quiz_id).first()
+            if not quiz:
+                abort(404, "Quiz not found")
+            return quiz
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -187,6 +401,7 @@ class QuizQuestionRepository:
             
             question = QuizQuestion(**question_data)
             db.session.add(question)
+            QuizRepository.bump_content_version(quiz.id)
             db.session.commit()
             return question
         except IntegrityError:
@@ -206,15 +421,20 @@ class QuizQuestionRepository:
             raise e
     
     @staticmethod
-    def update_question(question_id, update_data):
-        """Update a question"""
+    def update_question(question_id, update_data, regrade=False):
+        """Update a question, and with regrade its answers and the quiz's results, in one transaction"""
         try:
             question = QuizQuestion.query.get(question_id)
             if not question:
                 abort(404, "Question not found")
             
+            previous_quiz_id = question.quiz_id
             for key, value in update_data.items():
                 setattr(question, key, value)
+            QuizRepository.bump_content_version(previous_quiz_id, question.quiz_id)
+            if regrade:
+                db.session.flush()
+                QuizGradingRepository.regrade_in_transaction(question.quiz_id, [question_id])
             db.session.commit()
             return question
         except SQLAlchemyError as e:
@@ -223,15 +443,50 @@ class QuizQuestionRepository:
     
     @staticmethod
     def delete_question(question_id):
-        """Delete a question"""
+        """Delete a question and regrade the quiz's results without it, in one transaction"""
         try:
             question = QuizQuestion.query.get(question_id)
             if not question:
                 abort(404, "Question not found")
             
+            quiz_id = question.quiz_id
             db.session.delete(question)
+            QuizRepository.bump_content_version(quiz_id)
+            db.session.flush()
+            QuizGradingRepository.regrade_in_transaction(quiz_id)
             db.session.commit()
-            return {"deleted": True}
+            return {"deleted": True, "quiz_id": quiz_id}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def create_questions(quiz_id, questions_data):
+        """Append an ordered set of questions to a quiz in one transaction; returns their ids in order"""
+        try:
+            # The version bump locks the quiz row, so concurrent appends cannot share order numbers
+            if not QuizRepository.bump_content_version(quiz_id):
+                abort(404, "Quiz not found")
+            
+            last_order = db.session.scalar(
+                select(func.coalesce(func.max(QuizQuestion.order_number), 0)).where(QuizQuestion.quiz_id == quiz_id)
+            )
+            # Same keys in every row, so all questions go out as one executemany
+            optional = dict.fromkeys(['option_a', 'option_b', 'option_c', 'option_d'])
+            db.session.execute(insert(QuizQuestion), [
+                {**optional, **question, 'quiz_id': quiz_id, 'order_number': last_order + position}
+                for position, question in enumerate(questions_data, start=1)
+            ])
+            question_ids = db.session.scalars(
+                select(QuizQuestion.id)
+                .where(QuizQuestion.quiz_id == quiz_id, QuizQuestion.order_number > last_order)
+                .order_by(QuizQuestion.order_number)
+            ).all()
+            db.session.commit()
+            return question_ids
+        except IntegrityError:
+            db.session.rollback()
+            abort(400, "Database constraint violation")
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -252,8 +507,8 @@ class QuizSubmissionRepository:
             raise e
     
     @staticmethod
-    def submit_quiz(student_id, submission_data):
-        """Submit a quiz with answers - No validation, maximum flexibility"""
+    def submit_quiz(student_id, submission_data, defer_grading=False):
+        """Submit a quiz with answers, grading it now or queueing it for the grading workers"""
         try:
             quiz_id = submission_data['quiz_id']
             
@@ -261,24 +516,30 @@ class QuizSubmissionRepository:
             if not quiz:
                 abort(404, "Quiz not found")
             
-            submission_record = {
-                'quiz_id': quiz_id,
-                'student_id': student_id,
-                'time_taken_minutes': submission_data.get('time_taken_minutes'),
-                'is_completed': True
-            }
-            submission = QuizSubmissionRepository.create_submission(submission_record)
+            submission = QuizSubmission(
+                quiz_id=quiz_id,
+                student_id=student_id,
+                time_taken_minutes=submission_data.get('time_taken_minutes'),
+                is_completed=True
+            )
+            db.session.add(submission)
+            db.session.flush()
 
-            answers_data = []
-            for answer in submission_data['answers']:
-                answers_data.append({
-                    'submission_id': submission.id,
-                    'question_id': answer['question_id'],
-                    'student_answer': answer['answer']
-                })
-            
-            QuizAnswerRepository.create_multiple_answers(answers_data)
-            QuizGradingRepository.auto_grade_submission(submission.id)
+            answers_data = [{
+                'submission_id': submission.id,
+                'question_id': answer['question_id'],
+                'student_answer': answer['answer']
+            } for answer in submission_data['answers']]
+            if answers_data:
+                db.session.execute(insert(QuizAnswer), answers_data)
+
+            # Submission, answers and the queued job are persisted together
+            if defer_grading:
+                GradingQueueRepository.enqueue(submission.id)
+            db.session.commit()
+
+            if not defer_grading:
+                QuizGradingRepository.auto_grade_submission(submission.id)
             
             return submission.id
             
@@ -290,36 +551,50 @@ class QuizSubmissionRepository:
     def get_submission_answers_details(submission_id):
         """Get detailed answers for a specific submission with questions and correctness"""
         try:
-            submission = QuizSubmissionRepository.get_submission_by_id(submission_id)
+            submission = db.session.execute(
+                select(
+                    QuizSubmission.id,
+                    QuizSubmission.quiz_id,
+                    QuizSubmission.submitted_at,
+                    Student.first_name,
+                    Student.last_name,
+                    Quiz.title
+                )
+                .join(Student, Student.id == QuizSubmission.student_id)
+                .join(Quiz, Quiz.id == QuizSubmission.quiz_id)
+                .where(QuizSubmission.id == submission_id)
+            ).first()
             if not submission:
                 abort(404, "Submission not found")
 
-            answers = QuizAnswerRepository.get_answers_by_submission(submission_id)
-            questions = QuizQuestionRepository.get_questions_by_quiz(submission.quiz_id)
-            question_dict = {q.id: q for q in questions}
+            answer_key = QuizGradingRepository.get_answer_key(submission.quiz_id)
+            answers = db.session.execute(
+                select(QuizAnswer.question_id, QuizAnswer.student_answer)
+                .where(QuizAnswer.submission_id == submission_id)
+            ).all()
 
             answer_details = []
-            for answer in answers:
-                question = question_dict.get(answer.question_id)
-                if question:
+            for question_id, student_answer in answers:
+                index = answer_key.positions.get(question_id)
+                if index is not None:
                     answer_details.append({
-                        "question_id": answer.question_id,
-                        "question_text": question.question_text,
-                        "question_type": question.question_type,
-                        "correct_answer": question.correct_answer,
-                        "student_answer": answer.student_answer,
-                        "marks": question.marks,
-                        "order_number": question.order_number,
-                        "is_correct": answer.student_answer.strip().lower() == question.correct_answer.strip().lower() if question.correct_answer else None
+                        "question_id": question_id,
+                        "question_text": answer_key.question_texts[index],
+                        "question_type": answer_key.question_type(index),
+                        "correct_answer": answer_key.correct_answers[index],
+                        "student_answer": student_answer,
+                        "marks": answer_key.marks[index],
+                        "order_number": answer_key.order_numbers[index],
+                        "is_correct": answer_key.is_correct(index, student_answer) if answer_key.correct_answers[index] else None
                     })
             
             answer_details.sort(key=lambda x: x["order_number"])
             
             response_data = {
                 "submission_id": submission.id,
-                "student_name": f"{submission.student.first_name} {submission.student.last_name}",
-                "quiz_title": submission.quiz.title,
-                "submitted_at": submission.submitted_at.isoformat() if submission.submitted_at else None,
+                "student_name": f"{submission.first_name} {submission.last_name}",
+                "quiz_title": submission.title,
+                "submitted_at": submission.submitted_at,
                 "total_questions": len(answer_details),
                 "answers": answer_details
             }
@@ -354,7 +629,9 @@ class QuizSubmissionRepository:
     def get_submissions_by_quiz(quiz_id):
         """Get all submissions for a specific quiz"""
         try:
-            return QuizSubmission.query.filter_by(quiz_id=quiz_id).join(Student).all()
+            return QuizSubmission.query.filter_by(quiz_id=quiz_id).join(Student).options(
+                contains_eager(QuizSubmission.student)
+            ).all()
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -467,7 +744,9 @@ class QuizResultRepository:
     def get_results_by_quiz(quiz_id):
         """Get all results for a specific quiz"""
         try:
-            return QuizResult.query.join(QuizSubmission).filter(QuizSubmission.quiz_id == quiz_id).join(Student).all()
+            return QuizResult.query.join(QuizSubmission).filter(QuizSubmission.quiz_id == quiz_id).join(Student).options(
+                contains_eager(QuizResult.submission).contains_eager(QuizSubmission.student)
+            ).all()
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -487,68 +766,478 @@ class QuizResultRepository:
             raise e
 
 
+class QuizStatsRepository:
+    
+    @staticmethod
+    def apply_change(quiz_id, old=None, new=None):
+        """Fold a result change into a quiz's running stats within the caller's transaction.
+        
+        old and new are (percentage, grade) tuples: new alone adds a result, old alone
+        removes one, and both replace a result's previous grading with its new one.
+        """
+        if old is None and new is None:
+            return
+        
+        values = {}
+        count_delta = (new is not None) - (old is not None)
+        if count_delta:
+            values['result_count'] = QuizStats.result_count + count_delta
+        
+        sum_delta = (new[0] if new else 0) - (old[0] if old else 0)
+        sum_sq_delta = (new[0] ** 2 if new else 0) - (old[0] ** 2 if old else 0)
+        values['sum_percentage'] = QuizStats.sum_percentage + sum_delta
+        values['sum_sq_percentage'] = QuizStats.sum_sq_percentage + sum_sq_delta
+        
+        counter_deltas = {}
+        if old:
+            for column in (GRADE_COUNT_COLUMNS[old[1]], _decile_column(old[0])):
+                counter_deltas[column] = counter_deltas.get(column, 0) - 1
+        if new:
+            for column in (GRADE_COUNT_COLUMNS[new[1]], _decile_column(new[0])):
+                counter_deltas[column] = counter_deltas.get(column, 0) + 1
+        for column, delta in counter_deltas.items():
+            if delta:
+                values[column] = getattr(QuizStats, column) + delta
+        
+        raised_max = QuizStats.max_percentage
+        if new:
+            raised_max = case(
+                (or_(QuizStats.max_percentage.is_(None), QuizStats.max_percentage < new[0]), new[0]),
+                else_=QuizStats.max_percentage
+            )
+        if old:
+            # Removing the current maximum is the only case that needs a rescan
+            values['max_percentage'] = case(
+                (QuizStats.max_percentage <= old[0], QuizStatsRepository._max_percentage_query(quiz_id)),
+                else_=raised_max
+            )
+        else:
+            values['max_percentage'] = raised_max
+        
+        statement = (
+            update(QuizStats)
+            .where(QuizStats.quiz_id == quiz_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if db.session.execute(statement).rowcount:
+            return
+        
+        # First result of this quiz: the aggregate is built from what is already stored
+        try:
+            with db.session.begin_nested():
+                QuizStatsRepository._rebuild_rows([quiz_id])
+        except IntegrityError:
+            # A concurrent transaction created the row first
+            db.session.execute(statement)
+    
+    @staticmethod
+    def refresh(quiz_id):
+        """Re-aggregate one quiz's stats within the caller's transaction"""
+        QuizStatsRepository._rebuild_rows([quiz_id])
+    
+    @staticmethod
+    def get_stats(quiz_id):
+        """Get summary statistics for a quiz from its maintained aggregate"""
+        try:
+            quiz = db.session.get(Quiz, quiz_id)
+            if not quiz:
+                abort(404, "Quiz not found")
+            
+            stats = db.session.get(QuizStats, quiz_id)
+            return QuizStatsRepository._summarize(quiz_id, stats)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def rebuild(quiz_id=None, verify_only=False):
+        """Recompute stats from quiz_results and report quizzes whose incremental values drifted"""
+        try:
+            fresh = {row['quiz_id']: row for row in QuizStatsRepository._aggregate(quiz_id)}
+            
+            query = select(QuizStats)
+            if quiz_id is not None:
+                query = query.where(QuizStats.quiz_id == quiz_id)
+            stored = {stats.quiz_id: stats for stats in db.session.execute(query).scalars()}
+            
+            mismatches = []
+            for stats_quiz_id in sorted(set(fresh) | set(stored)):
+                expected = fresh.get(stats_quiz_id) or QuizStatsRepository._empty_row(stats_quiz_id)
+                actual = stored.get(stats_quiz_id)
+                differences = {
+                    column: {"stored": getattr(actual, column) if actual else None, "expected": value}
+                    for column, value in expected.items()
+                    if column != 'quiz_id' and not QuizStatsRepository._same(getattr(actual, column) if actual else None, value)
+                }
+                if differences:
+                    mismatches.append({"quiz_id": stats_quiz_id, "differences": differences})
+            
+            if not verify_only:
+                QuizStatsRepository._rebuild_rows([quiz_id] if quiz_id is not None else None, fresh)
+                db.session.commit()
+            
+            return {"quizzes_checked": len(set(fresh) | set(stored)), "mismatches": mismatches, "rebuilt": not verify_only}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+    
+    @staticmethod
+    def _rebuild_rows(quiz_ids=None, aggregates=None):
+        """Replace stats rows for quiz_ids (all quizzes if None) with freshly aggregated ones"""
+        if aggregates is None:
+            aggregates = {}
+            for ids_quiz_id in (quiz_ids or [None]):
+                aggregates.update({row['quiz_id']: row for row in QuizStatsRepository._aggregate(ids_quiz_id)})
+        
+        query = delete(QuizStats)
+        if quiz_ids is not None:
+            query = query.where(QuizStats.quiz_id.in_(quiz_ids))
+        db.session.execute(query.execution_options(synchronize_session=False))
+        
+        rows = list(aggregates.values())
+        if quiz_ids is not None:
+            rows += [QuizStatsRepository._empty_row(missing) for missing in quiz_ids if missing not in aggregates]
+        if rows:
+            db.session.execute(insert(QuizStats), rows)
+    
+    @staticmethod
+    def _aggregate(quiz_id=None):
+        """One GROUP BY over quiz_results producing QuizStats rows"""
+        columns = [
+            QuizSubmission.quiz_id.label('quiz_id'),
+            func.count(QuizResult.id).label('result_count'),
+            func.coalesce(func.sum(QuizResult.percentage), 0.0).label('sum_percentage'),
+            func.coalesce(func.sum(QuizResult.percentage * QuizResult.percentage), 0.0).label('sum_sq_percentage'),
+            func.max(QuizResult.percentage).label('max_percentage'),
+        ] + [
+            func.sum(case((QuizResult.grade == grade, 1), else_=0)).label(column)
+            for grade, column in GRADE_COUNT_COLUMNS.items()
+        ] + [
+            func.sum(case((QuizStatsRepository._decile_condition(band), 1), else_=0)).label(column)
+            for band, column in enumerate(DECILE_COLUMNS)
+        ]
+        query = select(*columns).join(QuizSubmission, QuizSubmission.id == QuizResult.submission_id)
+        if quiz_id is not None:
+            query = query.where(QuizSubmission.quiz_id == quiz_id)
+        return [dict(row._mapping) for row in db.session.execute(query.group_by(QuizSubmission.quiz_id))]
+    
+    @staticmethod
+    def _decile_condition(band):
+        """SQL equivalent of _decile_column for one band"""
+        if band == 0:
+            return QuizResult.percentage < 10
+        if band == 9:
+            return QuizResult.percentage >= 90
+        return and_(QuizResult.percentage >= band * 10, QuizResult.percentage < (band + 1) * 10)
+    
+    @staticmethod
+    def _max_percentage_query(quiz_id):
+        return (
+            select(func.max(QuizResult.percentage))
+            .join(QuizSubmission, QuizSubmission.id == QuizResult.submission_id)
+            .where(QuizSubmission.quiz_id == quiz_id)
+            .scalar_subquery()
+        )
+    
+    @staticmethod
+    def _empty_row(quiz_id):
+        return {
+            'quiz_id': quiz_id,
+            'result_count': 0,
+            'sum_percentage': 0.0,
+            'sum_sq_percentage': 0.0,
+            'max_percentage': None,
+            **{column: 0 for column in GRADE_COUNT_COLUMNS.values()},
+            **{column: 0 for column in DECILE_COLUMNS}
+        }
+    
+    @staticmethod
+    def _same(stored, expected):
+        if stored is None or expected is None:
+            return stored is None and expected is None
+        return abs(stored - expected) <= 1e-6 * max(1.0, abs(expected))
+    
+    @staticmethod
+    def _summarize(quiz_id, stats):
+        """Derive summary statistics from an aggregate row in constant time"""
+        if stats is None or not stats.result_count:
+            return {
+                "quiz_id": quiz_id,
+                "submission_count": 0,
+                "mean": None,
+                "std": None,
+                "median_estimate": None,
+                "median_grade": None,
+                "max": None,
+                "pass_rate": None,
+                "grade_counts": {grade: 0 for grade in GRADE_COUNT_COLUMNS},
+                "histogram": {"bin_edges": list(range(0, 101, 10)), "counts": [0] * len(DECILE_COLUMNS)}
+            }
+        
+        count = stats.result_count
+        mean = stats.sum_percentage / count
+        variance = max(stats.sum_sq_percentage / count - mean ** 2, 0.0)
+        grade_counts = {grade: getattr(stats, column) for grade, column in GRADE_COUNT_COLUMNS.items()}
+        deciles = [getattr(stats, column) for column in DECILE_COLUMNS]
+        passed = count - grade_counts['F']
+        
+        return {
+            "quiz_id": quiz_id,
+            "submission_count": count,
+            "mean": mean,
+            "std": variance ** 0.5,
+            # Interpolated within the median's 10% band; /analytics has the exact median
+            "median_estimate": QuizStatsRepository._grouped_median(deciles, count),
+            "median_grade": QuizStatsRepository._median_grade(grade_counts, count),
+            "max": stats.max_percentage,
+            "pass_rate": passed / count,
+            "grade_counts": grade_counts,
+            "histogram": {"bin_edges": list(range(0, 101, 10)), "counts": deciles}
+        }
+    
+    @staticmethod
+    def _grouped_median(deciles, count):
+        """Median percentage interpolated within the 10% band that holds it"""
+        half = count / 2
+        below = 0
+        for band, in_band in enumerate(deciles):
+            if in_band and below + in_band >= half:
+                return band * 10 + (half - below) / in_band * 10
+            below += in_band
+        return None
+    
+    @staticmethod
+    def _median_grade(grade_counts, count):
+        """Letter grade of the median result"""
+        half = count / 2
+        below = 0
+        for grade in reversed(list(GRADE_COUNT_COLUMNS)):
+            below += grade_counts[grade]
+            if below >= half:
+                return grade
+        return None
+
+
 class QuizGradingRepository:
     
     @staticmethod
     def auto_grade_submission(submission_id):
-        """Automatically grade a quiz submission"""
+        """Automatically grade a quiz submission in a single transaction"""
         try:
-            submission = QuizSubmissionRepository.get_submission_by_id(submission_id)
-            if not submission:
+            started_at = time.perf_counter()
+
+            # One round trip for the submission's quiz, course and any existing result
+            row = db.session.execute(
+                select(
+                    QuizSubmission.quiz_id,
+                    QuizSubmission.student_id,
+                    Quiz.course_id,
+                    Quiz.content_version,
+                    QuizResult.id,
+                    QuizResult.marks_overridden,
+                    QuizResult.percentage,
+                    QuizResult.grade
+                )
+                .join(Quiz, Quiz.id == QuizSubmission.quiz_id)
+                .outerjoin(QuizResult, QuizResult.submission_id == QuizSubmission.id)
+                .where(QuizSubmission.id == submission_id)
+            ).first()
+            if not row:
                 abort(404, "Submission not found")
-            
-            # Get all answers for this submission
-            answers = QuizAnswerRepository.get_answers_by_submission(submission_id)
-            quiz_questions = QuizQuestionRepository.get_questions_by_quiz(submission.quiz_id)
-            
-            total_marks = 0
-            marks_obtained = 0
-            
-            # Grade each answer
-            for answer in answers:
-                question = next((q for q in quiz_questions if q.id == answer.question_id), None)
-                if question:
-                    total_marks += question.marks
-                    
-                    # Check if answer is correct
-                    is_correct = QuizGradingRepository._is_answer_correct(
-                        answer.student_answer, 
-                        question.correct_answer, 
-                        question.question_type
-                    )
-                    
-                    marks_for_answer = question.marks if is_correct else 0
-                    marks_obtained += marks_for_answer
-                    
-                    # Update answer with grading
-                    QuizAnswerRepository.update_answer_grading(answer.id, is_correct, marks_for_answer)
-            
+            quiz_id, student_id, course_id, content_version, result_id, marks_overridden, previous_percentage, previous_grade = row
+
+            answer_key = QuizGradingRepository.get_answer_key(quiz_id, content_version)
+            answers = db.session.execute(
+                select(QuizAnswer.id, QuizAnswer.question_id, QuizAnswer.student_answer)
+                .where(QuizAnswer.submission_id == submission_id)
+            ).all()
+
+            answer_updates, total_marks, marks_obtained = QuizGradingRepository._grade_answers(answer_key, answers)
+
             # Calculate percentage and grade
             percentage = (marks_obtained / total_marks) * 100 if total_marks > 0 else 0
             grade = QuizGradingRepository._calculate_grade(percentage)
-            
-            # Create or update result
+
+            # Bulk UPDATE of every graded answer, then INSERT or UPDATE the result
+            if answer_updates:
+                db.session.execute(update(QuizAnswer), answer_updates)
+
             result_data = {
-                'submission_id': submission_id,
                 'total_marks': total_marks,
                 'marks_obtained': marks_obtained,
                 'percentage': percentage,
-                'grade': grade,
-                'graded_by_teacher': False
+                'grade': grade
             }
-            
-            QuizResultRepository.create_result(result_data)
-            
+            if result_id is None:
+                db.session.add(QuizResult(submission_id=submission_id, graded_by_teacher=False, **result_data))
+                QuizStatsRepository.apply_change(quiz_id, new=(percentage, grade))
+            elif not marks_overridden:
+                db.session.execute(update(QuizResult), [{'id': result_id, **result_data}])
+                QuizStatsRepository.apply_change(quiz_id, old=(previous_percentage, previous_grade), new=(percentage, grade))
+
+            if result_id is None or not marks_overridden:
+                db.session.flush()
+                CourseGradeRepository.recompute_enrollment(student_id, course_id)
+
+            db.session.commit()
+
             return {
                 "marks_obtained": marks_obtained,
                 "total_marks": total_marks,
                 "percentage": percentage,
-                "grade": grade
+                "grade": grade,
+                "grading_ms": round((time.perf_counter() - started_at) * 1000, 3)
             }
-            
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_answer_key(quiz_id, content_version=None):
+        """Get a quiz's compiled answer key, querying its questions only on a cache miss.
+
+        Keys are cached per (quiz_id, content_version): a question change bumps the version,
+        so every process stops using the old key at once. The version is read if not given.
+        """
+        if content_version is None:
+            content_version = db.session.scalar(select(Quiz.content_version).where(Quiz.id == quiz_id))
+        return answer_key_cache.get((quiz_id, content_version), QuizGradingRepository._compile_answer_key)
+    
+    @staticmethod
+    def _compile_answer_key(key):
+        """Load a quiz's questions and compile them into an answer key"""
+        quiz_id, _ = key
+        rows = db.session.execute(
+            select(
+                QuizQuestion.id,
+                QuizQuestion.question_text,
+                QuizQuestion.question_type,
+                QuizQuestion.correct_answer,
+                QuizQuestion.marks,
+                QuizQuestion.order_number
+            ).where(QuizQuestion.quiz_id == quiz_id)
+        ).all()
+        return CompiledAnswerKey(quiz_id, rows)
+
+    @staticmethod
+    def _grade_answers(answer_key, answers):
+        """Grade (answer_id, question_id, student_answer) rows in memory against a compiled answer key"""
+        answer_updates = []
+        total_marks = 0
+        marks_obtained = 0
+
+        for answer_id, question_id, student_answer in answers:
+            index = answer_key.positions.get(question_id)
+            if index is None:
+                continue
+            marks = answer_key.marks[index]
+            total_marks += marks
+
+            is_correct = answer_key.is_correct(index, student_answer)
+            marks_for_answer = marks if is_correct else 0
+            marks_obtained += marks_for_answer
+            answer_updates.append({'id': answer_id, 'is_correct': is_correct, 'marks_obtained': marks_for_answer})
+
+        return answer_updates, total_marks, marks_obtained
+    
+    @staticmethod
+    def regrade_quiz(quiz_id, question_ids=None):
+        """Regrade every answer and result of a quiz, keeping teacher overrides"""
+        try:
+            result = QuizGradingRepository.regrade_in_transaction(quiz_id, question_ids)
+            db.session.commit()
+            return result
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
+
+    @staticmethod
+    def regrade_in_transaction(quiz_id, question_ids=None):
+        """Regrade a quiz within the caller's transaction, which commits.
+
+        Answers are graded in Python against a compiled answer key, the same comparison as
+        submission grading, and only changed answers are written back. Result totals are then
+        recomputed with one set-based UPDATE.
+        """
+        started_at = time.perf_counter()
+
+        course_id = db.session.scalar(select(Quiz.course_id).where(Quiz.id == quiz_id))
+        if course_id is None:
+            abort(404, "Quiz not found")
+
+        # Compiled from this transaction's questions and not cached: the edit may still roll back
+        answer_key = QuizGradingRepository._compile_answer_key((quiz_id, None))
+        regrade_ids = [question_id for question_id in answer_key.question_ids
+                       if not question_ids or question_id in question_ids]
+
+        answers_regraded = 0
+        last_id = 0
+        while regrade_ids:
+            answers = db.session.execute(
+                select(QuizAnswer.id, QuizAnswer.question_id, QuizAnswer.student_answer,
+                       QuizAnswer.is_correct, QuizAnswer.marks_obtained)
+                .where(QuizAnswer.question_id.in_(regrade_ids), QuizAnswer.id > last_id)
+                .order_by(QuizAnswer.id)
+                .limit(REGRADE_BATCH_SIZE)
+            ).all()
+            if not answers:
+                break
+            last_id = answers[-1].id
+            answers_regraded += len(answers)
+
+            answer_updates, _, _ = QuizGradingRepository._grade_answers(
+                answer_key, [(answer.id, answer.question_id, answer.student_answer) for answer in answers]
+            )
+            changed = [
+                graded for graded, answer in zip(answer_updates, answers)
+                if (graded['is_correct'], graded['marks_obtained']) != (answer.is_correct, answer.marks_obtained)
+            ]
+            if changed:
+                db.session.execute(update(QuizAnswer), changed)
+
+        # Results: recompute totals for every submission, keeping teacher overrides
+        totals = (
+            select(
+                QuizAnswer.submission_id.label('submission_id'),
+                func.sum(QuizQuestion.marks).label('total_marks'),
+                func.sum(QuizAnswer.marks_obtained).label('marks_obtained')
+            )
+            .join(QuizQuestion, QuizQuestion.id == QuizAnswer.question_id)
+            .where(QuizQuestion.quiz_id == quiz_id)
+            .group_by(QuizAnswer.submission_id)
+            .subquery()
+        )
+        percentage = case(
+            (totals.c.total_marks > 0, totals.c.marks_obtained * 100.0 / totals.c.total_marks),
+            else_=0
+        )
+        results_result = db.session.execute(
+            update(QuizResult)
+            .where(
+                QuizResult.submission_id == totals.c.submission_id,
+                QuizResult.marks_overridden.isnot(True)
+            )
+            .values(
+                total_marks=totals.c.total_marks,
+                marks_obtained=totals.c.marks_obtained,
+                percentage=percentage,
+                grade=QuizGradingRepository._grade_expression(percentage)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        # Set-based updates bypass the incremental path, so re-aggregate this quiz
+        QuizStatsRepository.refresh(quiz_id)
+        CourseGradeRepository.recompute_course_in_transaction(course_id)
+
+        return {
+            "quiz_id": quiz_id,
+            "answers_regraded": answers_regraded,
+            "results_updated": results_result.rowcount,
+            "grading_ms": round((time.perf_counter() - started_at) * 1000, 3)
+        }
     
     @staticmethod
     def manual_grade_submission(submission_id, teacher_feedback=None, override_marks=None):
@@ -566,11 +1255,21 @@ class QuizGradingRepository:
             
             if override_marks is not None:
                 # Teacher is overriding the marks
+                update_data['marks_overridden'] = True
                 update_data['marks_obtained'] = override_marks
                 update_data['percentage'] = (override_marks / result.total_marks) * 100
                 update_data['grade'] = QuizGradingRepository._calculate_grade(update_data['percentage'])
             
-            QuizResultRepository.update_result(submission_id, update_data)
+            previous = (result.percentage, result.grade)
+            for key, value in update_data.items():
+                setattr(result, key, value)
+            db.session.flush()
+            
+            if override_marks is not None:
+                submission = result.submission
+                QuizStatsRepository.apply_change(submission.quiz_id, old=previous, new=(result.percentage, result.grade))
+                CourseGradeRepository.recompute_enrollment(submission.student_id, submission.quiz.course_id)
+            db.session.commit()
             
             return {"graded": True}
             
@@ -581,29 +1280,22 @@ class QuizGradingRepository:
     @staticmethod
     def _is_answer_correct(student_answer, correct_answer, question_type):
         """Check if student answer is correct"""
-        if question_type in ['multiple_choice', 'true_false']:
-            return student_answer.strip().upper() == correct_answer.strip().upper()
-        elif question_type == 'text':
-            # For text questions, do a case-insensitive comparison
-            return student_answer.strip().lower() == correct_answer.strip().lower()
-        return False
+        code = type_code(question_type)
+        normalized = normalize_answer(correct_answer, code)
+        return normalized is not None and normalize_answer(student_answer, code) == normalized
     
     @staticmethod
     def _calculate_grade(percentage):
         """Calculate letter grade from percentage"""
-        if percentage >= 90:
-            return 'A+'
-        elif percentage >= 85:
-            return 'A'
-        elif percentage >= 80:
-            return 'B+'
-        elif percentage >= 75:
-            return 'B'
-        elif percentage >= 70:
-            return 'C+'
-        elif percentage >= 65:
-            return 'C'
-        elif percentage >= 60:
-            return 'D'
-        else:
-            return 'F'
+        for min_percentage, grade in GRADE_BOUNDARIES:
+            if percentage >= min_percentage:
+                return grade
+        return 'F'
+    
+    @staticmethod
+    def _grade_expression(percentage):
+        """SQL equivalent of _calculate_grade for a percentage expression"""
+        return case(
+            *[(percentage >= min_percentage, grade) for min_percentage, grade in GRADE_BOUNDARIES],
+            else_='F'
+        )
@@ -0,0 +1,84 @@
+import csv
+import io
+from datetime import datetime, timezone
+from app.extension import db
+from app.repository.search_repository import SEARCH_SOURCES, SearchIndex
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+_SEARCH_KINDS = {table: kind for kind, (table, _, _) in SEARCH_SOURCES.items()}
+
+
+class RosterImportRepository:
+    """Bulk loads of already-validated student or teacher rows, one committed chunk at a time"""
+
+    @staticmethod
+    def import_chunk(model, records, seen_emails):
+        """Insert the records whose email is new; returns (imported count, per-row errors).
+
+        `records` are (row number, field dict) pairs. seen_emails holds emails accepted in
+        earlier chunks and is updated with this chunk's.
+        """
+        try:
+            existing = set(db.session.scalars(
+                select(model.email).where(model.email.in_({fields["email"] for _, fields in records}))
+            ))
+
+            errors = []
+            accepted = []
+            for row, fields in records:
+                email = fields["email"]
+                if email in existing:
+                    errors.append({"row": row, "email": email, "error": "Email already exists"})
+                elif email in seen_emails:
+                    errors.append({"row": row, "email": email, "error": "Duplicate email in file"})
+                else:
+                    seen_emails.add(email)
+                    accepted.append(fields)
+
+            if not accepted:
+                return 0, errors
+
+            # COPY and executemany both skip the model's Python-side defaults
+            created_at = datetime.now(timezone.utc)
+            columns = [column.name for column in model.__table__.columns if column.name not in ("id", "updated_at")]
+            rows = [{**{column: None for column in columns}, **fields, "created_at": created_at} for fields in accepted]
+            try:
+                with SearchIndex.deferred(db.session.connection(), _SEARCH_KINDS[model.__tablename__]):
+                    if db.session.get_bind().dialect.name == "postgresql":
+                        RosterImportRepository._copy(model.__tablename__, columns, rows)
+                    else:
+                        db.session.execute(insert(model.__table__), rows)
+                db.session.commit()
+            except IntegrityError:
+                # A concurrent insert took one of the emails after the check; nothing in the chunk is kept
+                db.session.rollback()
+                for fields in accepted:
+                    seen_emails.discard(fields["email"])
+                return 0, errors + [{"row": None, "email": None, "error": f"Chunk of {len(accepted)} rows rolled back: email conflict with a concurrent insert"}]
+            return len(accepted), errors
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _copy(table, columns, rows):
+        """COPY rows into table over the session's connection, as CSV"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # Unquoted empty fields are NULL in COPY's CSV format; quoted ones are empty strings
+            writer.writerow([r"\N" if row[column] is None else row[column] for column in columns])
+        statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+
+        connection = db.session.connection()
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            if connection.dialect.driver == "psycopg2":
+                buffer.seek(0)
+                cursor.copy_expert(statement, buffer)
+            else:
+                with cursor.copy(statement) as copy:
+                    copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
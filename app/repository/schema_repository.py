@@ -0,0 +1,44 @@
+from app.extension import db
+from sqlalchemy import UniqueConstraint, inspect
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database lacks tables, columns or constraints the models declare"""
+
+
+class SchemaRepository:
+    """Compares the live database with the models. db.create_all() only creates missing tables,
+    so columns and constraints added to existing tables reach a database through migrations alone."""
+
+    @staticmethod
+    def missing():
+        """Tables, columns, unique constraints and indexes the models declare but the database lacks"""
+        inspector = inspect(db.engine)
+        existing_tables = set(inspector.get_table_names())
+        missing = []
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                missing.append(f"table {table.name}")
+                continue
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            missing += [f"column {table.name}.{c.name}" for c in table.columns if c.name not in columns]
+
+            constraints = {u["name"] for u in inspector.get_unique_constraints(table.name)}
+            indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            missing += [
+                f"unique constraint {c.name}" for c in table.constraints
+                if isinstance(c, UniqueConstraint) and c.name and c.name not in constraints | indexes
+            ]
+            missing += [f"index {i.name}" for i in table.indexes if i.name not in indexes | constraints]
+        return missing
+
+    @staticmethod
+    def verify():
+        """Raise SchemaOutOfDate listing what is missing; call before serving requests"""
+        missing = SchemaRepository.missing()
+        if missing:
+            raise SchemaOutOfDate(
+                "Database schema is out of date, run `flask db upgrade` "
+                "(a database made by init_db.py before migrations existed needs "
+                "`flask db stamp 3b1f0c2a9d4e` first). Missing: " + ", ".join(missing)
+            )
@@ -0,0 +1,239 @@
+import re
+from contextlib import contextmanager
+from app.extension import db
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+
+SEARCH_TYPES = ("student", "teacher", "course")
+
+# Searchable text per type as (table, title, body); a title match ranks above a body match.
+# {row} is "" in queries and "new." inside triggers.
+SEARCH_SOURCES = {
+    "student": ("students", "{row}first_name || ' ' || {row}last_name", "{row}email"),
+    "teacher": ("teachers", "{row}first_name || ' ' || {row}last_name", "{row}subject"),
+    "course": ("courses", "{row}name", "{row}description"),
+}
+
+# SQLite keeps every type in one FTS5 table; rowid = source id * 3 + type code
+_TYPE_CODES = {kind: code for code, kind in enumerate(SEARCH_TYPES)}
+
+DETAIL_LENGTH = 160
+
+
+def _source(kind, row=""):
+    table, title, body = SEARCH_SOURCES[kind]
+    return table, title.format(row=row), body.format(row=row)
+
+
+def _sources(row=""):
+    return [_source(kind, row) for kind in SEARCH_TYPES]
+
+
+class SearchIndex:
+    """Database-side search index: FTS5 on SQLite, pg_trgm GIN indexes on PostgreSQL.
+
+    SQLite triggers keep the FTS table in step with the source tables; PostgreSQL indexes
+    the lower-cased title and body expressions directly.
+    """
+
+    @staticmethod
+    @contextmanager
+    def deferred(connection, kind):
+        """Within the caller's transaction, index rows of kind inserted in the block with one
+        statement when it exits instead of one trigger run per row. No-op outside SQLite."""
+        if connection.dialect.name != "sqlite":
+            yield
+            return
+        table, title, body = _source(kind)
+        # The pause row holds the write lock, so no other insert can slip in before last_id
+        connection.execute(text("INSERT INTO search_index_pause (source) VALUES (:table)"), {"table": table})
+        last_id = connection.execute(text(f"SELECT coalesce(max(id), 0) FROM {table}")).scalar()
+        yield
+        connection.execute(
+            text(
+                f"INSERT INTO search_index (rowid, title, body) "
+                f"SELECT id * 3 + {_TYPE_CODES[kind]}, {title}, {body} FROM {table} WHERE id > :last_id"
+            ),
+            {"last_id": last_id}
+        )
+        connection.execute(text("DELETE FROM search_index_pause WHERE source = :table"), {"table": table})
+
+    @staticmethod
+    def install(connection):
+        """Create the index if missing; a new SQLite index is populated from the source tables"""
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            exists = connection.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'")
+            ).first()
+            for statement in SearchIndex._sqlite_ddl():
+                connection.execute(text(statement))
+            if not exists:
+                SearchIndex._sqlite_populate(connection)
+        elif dialect == "postgresql":
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for table, title, body in _sources():
+                connection.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_search "
+                    f"ON {table} USING gin ((lower({title} || ' ' || {body})) gin_trgm_ops)"
+                ))
+
+    @staticmethod
+    def rebuild(connection):
+        """Re-read every source row into the index. Returns the number of rows indexed."""
+        SearchIndex.install(connection)
+        if connection.dialect.name != "sqlite":
+            return sum(
+                connection.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+                for table, _, _ in _sources()
+            )
+        connection.execute(text("DELETE FROM search_index"))
+        return SearchIndex._sqlite_populate(connection)
+
+    @staticmethod
+    def _sqlite_ddl():
+        yield (
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+            "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+        yield "CREATE TABLE IF NOT EXISTS search_index_pause (source TEXT PRIMARY KEY)"
+        for kind, (table, title, body) in zip(SEARCH_TYPES, _sources("new.")):
+            code = _TYPE_CODES[kind]
+            # Only edits to searched columns touch the index
+            columns = ", ".join(re.findall(r"new\.(\w+)", f"{title} {body}"))
+            insert = f"INSERT INTO search_index (rowid, title, body) VALUES (new.id * 3 + {code}, {title}, {body});"
+            delete = f"DELETE FROM search_index WHERE rowid = old.id * 3 + {code};"
+            paused = f"EXISTS (SELECT 1 FROM search_index_pause WHERE source = '{table}')"
+            # Triggers are recreated on every install so existing databases pick up changes
+            for name in ("insert", "update", "delete"):
+                yield f"DROP TRIGGER IF EXISTS {table}_search_{name}"
+            yield f"CREATE TRIGGER {table}_search_insert AFTER INSERT ON {table} WHEN NOT {paused} BEGIN {insert} END"
+            yield f"CREATE TRIGGER {table}_search_update AFTER UPDATE OF {columns} ON {table} BEGIN {delete} {insert} END"
+            yield f"CREATE TRIGGER {table}_search_delete AFTER DELETE ON {table} BEGIN {delete} END"
+
+    @staticmethod
+    def _sqlite_populate(connection):
+        indexed = 0
+        for kind, (table, title, body) in zip(SEARCH_TYPES, _sources()):
+            indexed += connection.execute(text(
+                f"INSERT INTO search_index (rowid, title, body) "
+                f"SELECT id * 3 + {_TYPE_CODES[kind]}, {title}, {body} FROM {table}"
+            )).rowcount
+        return indexed
+
+
+def exclude_search_index(object, name, type_, reflected, compare_to):
+    """Alembic include_object hook: the search index tables are created by SearchIndex.install, not the models"""
+    return not (type_ == "table" and reflected and compare_to is None and name.startswith("search_index"))
+
+
+@event.listens_for(db.metadata, "after_create")
+def _install_search_index(target, connection, **kw):
+    SearchIndex.install(connection)
+
+
+class SearchRepository:
+
+    @staticmethod
+    def search(query, types=None, limit=20, offset=0):
+        """Ranked matches for query as dicts of type, id, title, detail and score; best first.
+
+        Each word of the query matches by prefix; PostgreSQL also matches misspellings by
+        trigram similarity.
+        """
+        types = tuple(types or SEARCH_TYPES)
+        try:
+            dialect = db.session.get_bind().dialect.name
+            if dialect == "sqlite":
+                return SearchRepository._search_fts5(query, types, limit, offset)
+            if dialect == "postgresql":
+                return SearchRepository._search_trigram(query, types, limit, offset)
+            return SearchRepository._search_like(query, types, limit, offset)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def rebuild_index():
+        """Recreate the search index from the student, teacher and course tables"""
+        try:
+            indexed = SearchIndex.rebuild(db.session.connection())
+            db.session.commit()
+            return indexed
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _search_fts5(query, types, limit, offset):
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        # Quoted words cannot be read as FTS5 operators; * makes each one a prefix match
+        match = " ".join(f'"{word}"*' for word in words)
+        codes = ", ".join(str(_TYPE_CODES[kind]) for kind in types)
+        rows = db.session.execute(
+            text(
+                "SELECT rowid, title, snippet(search_index, 1, '', '', '...', 24) AS detail, "
+                "bm25(search_index, 10.0, 1.0) AS rank "
+                "FROM search_index WHERE search_index MATCH :match "
+                f"AND rowid % 3 IN ({codes}) "
+                "ORDER BY rank, rowid LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "limit": limit, "offset": offset}
+        ).all()
+        return [{
+            "type": SEARCH_TYPES[row.rowid % 3],
+            "id": row.rowid // 3,
+            "title": row.title,
+            "detail": row.detail,
+            # bm25 is lower-is-better and negative; flip it so higher scores rank first
+            "score": round(-row.rank, 4)
+        } for row in rows]
+
+    @staticmethod
+    def _search_trigram(query, types, limit, offset):
+        term = query.strip().lower()
+        if not term:
+            return []
+        selects = []
+        for kind in types:
+            table, title, body = _source(kind)
+            document = f"lower({title} || ' ' || {body})"
+            selects.append(
+                f"SELECT '{kind}' AS type, id, {title} AS title, left({body}, {DETAIL_LENGTH}) AS detail, "
+                f"word_similarity(:term, {document}) AS score FROM {table} "
+                f"WHERE :term <% {document} OR {document} LIKE :pattern"
+            )
+        rows = db.session.execute(
+            text(" UNION ALL ".join(selects) + " ORDER BY score DESC, type, id LIMIT :limit OFFSET :offset"),
+            {"term": term, "pattern": f"%{SearchRepository._escape_like(term)}%", "limit": limit, "offset": offset}
+        ).all()
+        return [{
+            "type": row.type, "id": row.id, "title": row.title, "detail": row.detail, "score": round(row.score, 4)
+        } for row in rows]
+
+    @staticmethod
+    def _search_like(query, types, limit, offset):
+        """Unranked substring match for databases without a search index"""
+        term = query.strip().lower()
+        if not term:
+            return []
+        selects = []
+        for kind in types:
+            table, title, body = _source(kind)
+            selects.append(
+                f"SELECT '{kind}' AS type, id, {title} AS title, {body} AS detail FROM {table} "
+                f"WHERE lower({title} || ' ' || {body}) LIKE :pattern"
+            )
+        rows = db.session.execute(
+            text(" UNION ALL ".join(selects) + " ORDER BY type, id LIMIT :limit OFFSET :offset"),
+            {"pattern": f"%{SearchRepository._escape_like(term)}%", "limit": limit, "offset": offset}
+        ).all()
+        return [{
+            "type": row.type, "id": row.id, "title": row.title, "detail": (row.detail or "")[:DETAIL_LENGTH], "score": 0.0
+        } for row in rows]
+
+    @staticmethod
+    def _escape_like(value):
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -2,27 +2,59 @@ from datetime import datetime
 from app.extension import db
 from app.model.models import Student, Enrollment
 from flask import abort
+from app.repository.course_seat_repository import CourseSeatRepository
+from app.repository.projection import Projection, stream_rows
+from app.repository.pagination import DEFAULT_PAGE_SIZE, apply_filters, resolve_sort, keyset_page, order_by_key, page_of
 from sqlalchemy.exc import SQLAlchemyError
 
+STUDENT_PROJECTION = Projection(
+    id=Student.id,
+    first_name=Student.first_name,
+    last_name=Student.last_name,
+    email=Student.email,
+    date_of_birth=Student.date_of_birth,
+    grade=Student.grade,
+    address=Student.address,
+    phone=Student.phone,
+    created_at=Student.created_at,
+    updated_at=Student.updated_at
+)
+STUDENT_SORT_COLUMNS = {"id": Student.id, "last_name": Student.last_name, "grade": Student.grade}
+
 class StudentRepository:
     @staticmethod
-    def get_all_students():
-        """Get all students from the database."""
+    def get_all_students(filters=None, sort="id", limit=DEFAULT_PAGE_SIZE, cursor=None, fields=None):
+        """One keyset page of students matching filters as dicts of fields; returns (students, next_cursor)"""
         try:
-            students = Student.query.all()
-            return students
+            sort_column, descending = resolve_sort(sort, STUDENT_SORT_COLUMNS)
+            statement, serialize = STUDENT_PROJECTION.select(fields, required=(Student.id, sort_column))
+            statement = apply_filters(statement, Student, filters)
+            rows = db.session.execute(
+                keyset_page(statement, sort_column, Student.id, limit, cursor, descending)
+            ).all()
+            rows, next_cursor = page_of(rows, limit, sort_column, Student.id, descending)
+            return [serialize(row) for row in rows], next_cursor
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def get_student_by_id(student_id: int):
+    def iter_students(filters=None, sort="id", fields=None):
+        """Yield every student matching filters as a dict of fields, in sort order, batch by batch"""
+        sort_column, descending = resolve_sort(sort, STUDENT_SORT_COLUMNS)
+        statement, serialize = STUDENT_PROJECTION.select(fields)
+        statement = order_by_key(apply_filters(statement, Student, filters), sort_column, Student.id, descending)
+        return stream_rows(statement, serialize)
+    
+    @staticmethod
+    def get_student_by_id(student_id: int, fields=None):
         """Get a student by ID."""
         try:
-            student = Student.query.get(student_id)
-            if not student:
+            statement, serialize = STUDENT_PROJECTION.select(fields)
+            row = db.session.execute(statement.where(Student.id == student_id)).first()
+            if row is None:
                 abort(404, "Student not found")
-            return student
+            return serialize(row)
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
@@ -87,6 +119,7 @@ class StudentRepository:
                 abort(404, "Student not found")
             
             # No need to delete enrollments separately - cascade will handle it
+            CourseSeatRepository.release_student_seats(student_id)
             db.session.delete(student)
             db.session.commit()
             return {"deleted": True}
@@ -2,25 +2,56 @@ from datetime import datetime
 from app.extension import db
 from app.model.models import Teacher, Course
 from flask import abort
+from app.repository.projection import Projection, stream_rows
+from app.repository.pagination import DEFAULT_PAGE_SIZE, apply_filters, resolve_sort, keyset_page, order_by_key, page_of
 from sqlalchemy.exc import SQLAlchemyError
 
+TEACHER_PROJECTION = Projection(
+    id=Teacher.id,
+    first_name=Teacher.first_name,
+    last_name=Teacher.last_name,
+    email=Teacher.email,
+    subject=Teacher.subject,
+    qualification=Teacher.qualification,
+    phone=Teacher.phone,
+    created_at=Teacher.created_at,
+    updated_at=Teacher.updated_at
+)
+TEACHER_SORT_COLUMNS = {"id": Teacher.id, "last_name": Teacher.last_name, "subject": Teacher.subject}
+
 class TeacherRepository:
     @staticmethod
-    def get_all_teachers():
+    def get_all_teachers(filters=None, sort="id", limit=DEFAULT_PAGE_SIZE, cursor=None, fields=None):
+        """One keyset page of teachers matching filters as dicts of fields; returns (teachers, next_cursor)"""
         try:
-            teachers = Teacher.query.all()
-            return teachers
+            sort_column, descending = resolve_sort(sort, TEACHER_SORT_COLUMNS)
+            statement, serialize = TEACHER_PROJECTION.select(fields, required=(Teacher.id, sort_column))
+            statement = apply_filters(statement, Teacher, filters)
+            rows = db.session.execute(
+                keyset_page(statement, sort_column, Teacher.id, limit, cursor, descending)
+            ).all()
+            rows, next_cursor = page_of(rows, limit, sort_column, Teacher.id, descending)
+            return [serialize(row) for row in rows], next_cursor
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
     
     @staticmethod
-    def get_teacher_by_id(teacher_id: int):
+    def iter_teachers(filters=None, sort="id", fields=None):
+        """Yield every teacher matching filters as a dict of fields, in sort order, batch by batch"""
+        sort_column, descending = resolve_sort(sort, TEACHER_SORT_COLUMNS)
+        statement, serialize = TEACHER_PROJECTION.select(fields)
+        statement = order_by_key(apply_filters(statement, Teacher, filters), sort_column, Teacher.id, descending)
+        return stream_rows(statement, serialize)
+    
+    @staticmethod
+    def get_teacher_by_id(teacher_id: int, fields=None):
         try:
-            teacher = Teacher.query.get(teacher_id)
-            if not teacher:
+            statement, serialize = TEACHER_PROJECTION.select(fields)
+            row = db.session.execute(statement.where(Teacher.id == teacher_id)).first()
+            if row is None:
                 abort(404, "Teacher not found")
-            return teacher
+            return serialize(row)
         except SQLAlchemyError as e:
             db.session.rollback()
             raise e
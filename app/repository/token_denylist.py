@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from app.repository.lru_cache import LRUCache
+
+# Each sync re-reads revocations stamped this long before the previous one started. Rows only
+# become visible at commit, which can come after rows stamped later; the overlap also absorbs
+# clock skew between app hosts.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenDenylist:
+    """Process-local copy of the revoked token ids (jti), each kept only until its token expires.
+
+    is_revoked is a dict lookup. sync() merges rows revoked since shortly before the last sync,
+    so other processes' revocations arrive within one sync interval; this process's own are
+    added at once. Rows read twice are deduplicated by jti.
+    """
+
+    def __init__(self):
+        self._expiry = {}  # jti -> exp, seconds since the epoch
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._loaded_at = None  # Naive UTC start of the last load
+        self._synced_at = None
+
+    def is_revoked(self, jti):
+        return jti in self._expiry
+
+    def add(self, jti, exp):
+        with self._lock:
+            self._expiry[jti] = exp
+
+    def sync(self, load, interval):
+        """Merge load(since) -> [(jti, exp)] when interval seconds have passed since the last sync.
+
+        since is None on the first sync (load everything unexpired), then a naive UTC time.
+        One thread syncs at a time; the others keep using the current entries, except before
+        the first sync, when they wait for it.
+        """
+        if self._synced_at is not None and time.monotonic() - self._synced_at < interval:
+            return
+        if not self._sync_lock.acquire(blocking=self._synced_at is None):
+            return
+        try:
+            if self._synced_at is not None and time.monotonic() - self._synced_at < interval:
+                return
+            started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+            rows = load(None if self._loaded_at is None else self._loaded_at - SYNC_OVERLAP)
+            now = time.time()
+            with self._lock:
+                for jti, exp in rows:
+                    self._expiry[jti] = exp
+                self._loaded_at = started_at
+                self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > now}
+            self._synced_at = time.monotonic()
+        finally:
+            self._sync_lock.release()
+
+    def clear(self):
+        with self._lock:
+            self._expiry = {}
+            self._loaded_at = None
+            self._synced_at = None
+
+    def __len__(self):
+        return len(self._expiry)
+
+
+token_denylist = TokenDenylist()
+
+
+# Claims of tokens whose signature has been checked, keyed by the token string; expiry and
+# revocation are still checked on every use
+verified_tokens = LRUCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", 4096)))
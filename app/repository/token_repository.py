@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from app.extension import db
+from app.model.models import RevokedToken
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+
+def _utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RevokedTokenRepository:
+    """The revoked_tokens table: the durable deny-list that each process's in-memory copy is synced from"""
+
+    @staticmethod
+    def revoke(jti, token_type, user_id, expires_at):
+        """Record a token as revoked; False when it already was, so a refresh token is only spent once"""
+        try:
+            db.session.add(RevokedToken(jti=jti, token_type=token_type, user_id=user_id, expires_at=expires_at))
+            db.session.commit()
+            return True
+        except IntegrityError:
+            db.session.rollback()
+            return False
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_revoked_since(since=None):
+        """(jti, expires_at) of unexpired revocations stamped at or after since (naive UTC), or all of them"""
+        try:
+            statement = select(RevokedToken.jti, RevokedToken.expires_at).where(RevokedToken.expires_at > _utc_now())
+            if since is not None:
+                statement = statement.where(RevokedToken.revoked_at >= since)
+            return db.session.execute(statement).all()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def purge_expired():
+        """Delete revocations of tokens that have expired anyway; returns the number deleted"""
+        try:
+            purged = db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= _utc_now())).rowcount
+            db.session.commit()
+            return purged
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise e
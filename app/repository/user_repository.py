@@ -1,9 +1,11 @@
 
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.extension import db
 from app.model.models import User
+from app.repository.password_hasher import password_hasher, PasswordHasherBusy
 from flask import abort
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
 
 class UserRepository:
     
@@ -14,7 +16,7 @@ class UserRepository:
             new_user = User(
                 username=args.get("username", args["email"].split('@')[0]),  # Default username from email
                 email=args["email"],
-                password_hash=generate_password_hash(args["password"])
+                password_hash=password_hasher.hash(args["password"])
             )
             
             # Add to session and commit
@@ -30,13 +32,30 @@ class UserRepository:
     @staticmethod
     def user_login(args):
         # Find user by email
-        user = User.query.filter_by(email=args["email"]).first()
+        user = db.session.execute(
+            select(User.id, User.email, User.username, User.created_at, User.password_hash)
+            .where(User.email == args["email"])
+        ).first()
+        # Hand the connection back before hashing, so logins waiting on the hasher don't hold the pool
+        db.session.commit()
         
         # Check if user exists and password is correct
-        if not user or not check_password_hash(user.password_hash, args["password"]):
+        if not user or not password_hasher.verify(user.password_hash, args["password"]):
             # No need to log failed logins in this version
             abort(401, "Invalid email or password")
         
+        # Hashes made with an older method or cost are upgraded while the password is at hand
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                db.session.execute(
+                    update(User).where(User.id == user.id).values(password_hash=password_hasher.hash(args["password"]))
+                )
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass  # The login stands; the upgrade happens on a later one
+            except SQLAlchemyError:
+                db.session.rollback()
+        
         # Create user info dictionary to return
         user_info = {
             "user_id": user.id,
@@ -47,4 +66,4 @@ class UserRepository:
         
         # No need to log successful logins in this version
         
-        return user_info
+        return user_info
\ No newline at end of file
@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, validate, validates, ValidationError
+from marshmallow import Schema, fields, validate, validates, validates_schema, ValidationError
 from datetime import datetime
 
 
@@ -16,14 +16,24 @@ class QuizQuestionSchema(Schema):
     order_number = fields.Int(required=True, validate=validate.Range(min=1))
     created_at = fields.DateTime(dump_only=True)
 
-    @validates('question_type')
-    def validate_question_type_options(self, value):
-        if value == 'multiple_choice':
-            if not all([self.get('option_a'), self.get('option_b')]):
-                raise ValidationError('Multiple choice questions must have at least options A and B')
-        elif value == 'true_false':
-            if self.get('correct_answer') not in ['True', 'False']:
-                raise ValidationError('True/False questions must have "True" or "False" as correct answer')
+    @validates_schema
+    def validate_question_type_options(self, data, **kwargs):
+        question_type = data.get('question_type')
+        if question_type == 'multiple_choice':
+            if not all([data.get('option_a'), data.get('option_b')]):
+                raise ValidationError('Multiple choice questions must have at least options A and B', 'question_type')
+        elif question_type == 'true_false':
+            if data.get('correct_answer') not in ['True', 'False']:
+                raise ValidationError('True/False questions must have "True" or "False" as correct answer', 'question_type')
+
+
+class QuizQuestionSetSchema(Schema):
+    # List position sets order_number, after the quiz's existing questions
+    questions = fields.List(
+        fields.Nested(QuizQuestionSchema(exclude=('quiz_id', 'order_number'))),
+        required=True,
+        validate=validate.Length(min=1, max=500)
+    )
 
 
 class QuizSchema(Schema):
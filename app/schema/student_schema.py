@@ -11,7 +11,7 @@ class StudentCreateSchema(Schema):
     phone = fields.Str(required=False)
     
     @validates('grade')
-    def validate_grade(self, value):
+    def validate_grade(self, value, **kwargs):
         if value < 1 or value > 12:
             raise ValidationError('Grade must be between 1 and 12')
 
@@ -25,6 +25,6 @@ class StudentUpdateSchema(Schema):
     phone = fields.Str()
     
     @validates('grade')
-    def validate_grade(self, value):
+    def validate_grade(self, value, **kwargs):
         if value is not None and (value < 1 or value > 12):
             raise ValidationError('Grade must be between 1 and 12')
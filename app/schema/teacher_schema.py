@@ -10,7 +10,7 @@ class TeacherCreateSchema(Schema):
     phone = fields.Str(required=False)
     
     @validates('subject')
-    def validate_subject(self, value):
+    def validate_subject(self, value, **kwargs):
         if len(value) < 2:
             raise ValidationError('Subject name must be at least 2 characters long')
 
@@ -23,6 +23,6 @@ class TeacherUpdateSchema(Schema):
     phone = fields.Str()
     
     @validates('subject')
-    def validate_subject(self, value):
+    def validate_subject(self, value, **kwargs):
         if value is not None and len(value) < 2:
             raise ValidationError('Subject name must be at least 2 characters long')
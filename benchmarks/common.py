@@ -0,0 +1,48 @@
+"""Shared setup for the benchmark scripts: a throwaway SQLite database and a timing helper.
+
+Run a benchmark from the repository root, e.g. `python benchmarks/projection_benchmark.py`.
+Set DATABASE_URL to benchmark another database; its tables are dropped and recreated.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='sms-bench-'), 'bench.db')}")
+
+
+@contextmanager
+def benchmark_app():
+    """The app inside an app context on freshly created, empty tables"""
+    from app import app
+    from app.extension import db
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+def measure(fn, repeat=5):
+    """Median wall time in ms over repeat runs, peak traced memory in KiB of one run, and fn's result"""
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024, result
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers, ["-" * width for width in widths], *rows]:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
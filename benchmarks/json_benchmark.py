@@ -0,0 +1,104 @@
+"""JSON encoding of real payload shapes: the stdlib json.dumps the endpoints used before,
+and CustomJSONProvider.dumps_bytes with its stdlib and orjson backends.
+
+Payloads are an enrollment list page, a quiz preview and a quiz result NDJSON export.
+Reports median encode time, MB/s and encoded size.
+"""
+import argparse
+import json
+from datetime import date
+from common import benchmark_app, measure, print_table
+
+
+def old_ndjson(rows, columns):
+    """iter_ndjson before it used the app's JSON provider"""
+    def export_value(value):
+        return value.isoformat() if isinstance(value, date) else value
+    return "".join(json.dumps(dict(zip(columns, map(export_value, row)))) + "\n" for row in rows).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    with benchmark_app() as app:
+        from app.api.streaming import iter_ndjson
+        from app.blc.quizImportBLC import QuizImportBLC
+        from app.extension import db
+        from app.json_provider import CustomJSONProvider, orjson
+        from app.repository.enrollment_repository import EnrollmentRepository
+        from app.repository.quiz_export_repository import QuizExportRepository, RESULT_EXPORT_COLUMNS
+        from app.repository.quiz_repository import QuizRepository
+        from sqlalchemy import insert
+        from datetime import datetime, timedelta
+        from app.model.models import Teacher, Course, Student, Enrollment, Quiz, QuizQuestion
+
+        now = datetime.now()
+        teacher = Teacher(first_name="Ada", last_name="Byron", email="ada@school.org", subject="Math", qualification="MSc")
+        db.session.add(teacher)
+        db.session.flush()
+        course = Course(name="Algebra", description="Algebra I", credits=3, teacher_id=teacher.id, max_students=0)
+        db.session.add(course)
+        db.session.flush()
+        student_ids = db.session.scalars(insert(Student).returning(Student.id), [
+            {"first_name": f"First{i}", "last_name": f"Last{i}", "email": f"s{i}@school.org",
+             "date_of_birth": date(2010, 1, 1), "grade": 5, "created_at": now, "updated_at": now}
+            for i in range(args.students)
+        ]).all()
+        db.session.execute(insert(Enrollment), [
+            {"student_id": student_id, "course_id": course.id, "enrollment_date": date.today(), "status": "active",
+             "created_at": now, "updated_at": now}
+            for student_id in student_ids
+        ])
+        quiz = Quiz(course_id=course.id, title="Midterm", total_marks=args.questions,
+                    start_date=now - timedelta(days=1), end_date=now + timedelta(days=1))
+        db.session.add(quiz)
+        db.session.flush()
+        db.session.add_all(
+            QuizQuestion(quiz_id=quiz.id, question_text=f"Which option is right for question {i}?",
+                         question_type="multiple_choice", option_a="First", option_b="Second", option_c="Third",
+                         option_d="Fourth", correct_answer="A", marks=1, order_number=i + 1)
+            for i in range(args.questions)
+        )
+        db.session.commit()
+        sheets = ["student_id"] + [f"{student_id}," + ",".join("AB"[(student_id + i) % 2] for i in range(args.questions))
+                                   for student_id in student_ids]
+        QuizImportBLC.import_submissions(quiz.id, sheets, "csv")
+
+        enrollments, _ = EnrollmentRepository.get_all_enrollments(limit=1000)
+        preview = QuizRepository.get_preview_payload(quiz.id)
+        export_rows = list(QuizExportRepository.iter_quiz_results(quiz.id))
+
+        encoders = [("stdlib json.dumps (before)", None), ("dumps_bytes, stdlib", CustomJSONProvider(app, "stdlib"))]
+        if orjson is not None:
+            encoders.append(("dumps_bytes, orjson", CustomJSONProvider(app, "orjson")))
+
+        rows = []
+        for encoder_name, provider in encoders:
+            if provider is None:
+                payloads = [
+                    ("enrollment page (1000)", lambda: json.dumps(enrollments, default=app.json.default).encode()),
+                    (f"quiz preview ({args.questions} q)", lambda: json.dumps(preview, default=app.json.default).encode()),
+                    (f"result export ndjson ({len(export_rows)})", lambda: old_ndjson(export_rows, RESULT_EXPORT_COLUMNS)),
+                ]
+            else:
+                payloads = [
+                    ("enrollment page (1000)", lambda: provider.dumps_bytes(enrollments)),
+                    (f"quiz preview ({args.questions} q)", lambda: provider.dumps_bytes(preview)),
+                    (f"result export ndjson ({len(export_rows)})",
+                     lambda: b"".join(iter_ndjson(export_rows, RESULT_EXPORT_COLUMNS, provider.dumps_bytes))),
+                ]
+            for payload_name, encode in payloads:
+                latency_ms, _, body = measure(encode, args.repeat)
+                rows.append([payload_name, encoder_name, f"{latency_ms:.3f}",
+                             f"{len(body) / latency_ms / 1000:.0f}", f"{len(body) / 1024:,.1f}"])
+
+    print(f"median of {args.repeat} runs")
+    print_table(["payload", "encoder", "ms", "MB/s", "KiB"], sorted(rows, key=lambda row: row[0]))
+
+
+if __name__ == "__main__":
+    main()
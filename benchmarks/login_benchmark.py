@@ -0,0 +1,106 @@
+"""Login storm: many clients logging in at once while a probe client reads a student record.
+
+Compares hashing on the request threads, unbounded (as before the hashing pool), with the
+bounded PasswordHasher pool, whose 503 + Retry-After answers the clients honour.
+Reports successful logins per second, 503 answers and the probe's p50/p95 latency.
+"""
+import argparse
+import statistics
+import threading
+import time
+from common import benchmark_app, print_table
+
+
+class InlineHasher:
+    """Hashing on the request thread with no bound, as logins did before the pool"""
+
+    def __init__(self, method, salt_length):
+        self.method = method
+        self.salt_length = salt_length
+
+    def verify(self, password_hash, password):
+        from werkzeug.security import check_password_hash
+        return check_password_hash(password_hash, password)
+
+    def hash(self, password):
+        from werkzeug.security import generate_password_hash
+        return generate_password_hash(password, self.method, self.salt_length)
+
+    def needs_rehash(self, password_hash):
+        return False
+
+
+def storm(app, clients, seconds):
+    """Run login clients and one probe for seconds; returns (status counts, probe latencies in ms)"""
+    statuses = {}
+    latencies = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def login(index):
+        client = app.test_client()
+        while not stop.is_set():
+            response = client.post("/login", json={"email": f"user{index}@school.org", "password": "secret1"})
+            with lock:
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 503:
+                time.sleep(float(response.headers["Retry-After"]))
+
+    def probe():
+        client = app.test_client()
+        while not stop.is_set():
+            started_at = time.perf_counter()
+            client.get("/students/detail/1")
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=login, args=(index,)) for index in range(clients)]
+    threads.append(threading.Thread(target=probe))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return statuses, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    with benchmark_app() as app:
+        from datetime import date
+        from werkzeug.security import generate_password_hash
+        from app.extension import db
+        from app.model.models import Student, User
+        from app.repository import user_repository
+        from app.repository.password_hasher import password_hasher
+
+        app.config["JWT_SECRET_KEY"] = "benchmark-secret-key-that-is-long-enough-for-hs256"
+        # Every user shares one hash, so seeding costs a single key derivation
+        password_hash = generate_password_hash("secret1", password_hasher.method, password_hasher.salt_length)
+        db.session.add_all(User(username=f"user{index}", email=f"user{index}@school.org", password_hash=password_hash)
+                           for index in range(args.clients))
+        db.session.add(Student(first_name="Probe", last_name="Student", email="probe@school.org",
+                               date_of_birth=date(2010, 1, 1), grade=5))
+        db.session.commit()
+
+        rows = []
+        modes = [("request threads (before)", InlineHasher(password_hasher.method, password_hasher.salt_length)),
+                 (f"pool ({password_hasher.workers} workers)", password_hasher)]
+        for name, hasher in modes:
+            user_repository.password_hasher = hasher
+            statuses, latencies = storm(app, args.clients, args.seconds)
+            rows.append([name, f"{statuses.get(200, 0) / args.seconds:.1f}", statuses.get(503, 0),
+                         f"{statistics.median(latencies):.1f}", f"{statistics.quantiles(latencies, n=20)[-1]:.1f}"])
+        user_repository.password_hasher = password_hasher
+
+    print(f"{args.clients} login clients for {args.seconds:g} s each, {password_hasher.method}")
+    print_table(["hashing", "logins/s", "503s", "probe p50 ms", "probe p95 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
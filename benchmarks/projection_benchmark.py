@@ -0,0 +1,68 @@
+"""Student list read path: ORM entities copied into dicts (the original /students/list) against
+Core rows through STUDENT_PROJECTION, with all fields and with a sparse fieldset.
+
+Reports median latency, rows per second, peak memory and the JSON payload size.
+"""
+import argparse
+from datetime import date, datetime
+from common import benchmark_app, measure, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with benchmark_app() as app:
+        from sqlalchemy import insert
+        from app.extension import db
+        from app.model.models import Student
+        from app.repository.student_repository import STUDENT_PROJECTION
+
+        now = datetime.now()
+        db.session.execute(insert(Student), [
+            {"first_name": f"First{i}", "last_name": f"Last{i % 500}", "email": f"student{i}@school.org",
+             "date_of_birth": date(2010, 1 + i % 12, 1 + i % 28), "grade": 1 + i % 12,
+             "address": f"{i} Main Street", "phone": "555-0100", "created_at": now, "updated_at": now}
+            for i in range(args.rows)
+        ])
+        db.session.commit()
+
+        def orm_path():
+            db.session.expunge_all()
+            return [{
+                "id": student.id,
+                "first_name": student.first_name,
+                "last_name": student.last_name,
+                "email": student.email,
+                "date_of_birth": student.date_of_birth.isoformat() if student.date_of_birth else None,
+                "grade": student.grade,
+                "address": student.address,
+                "phone": student.phone,
+                "created_at": student.created_at.isoformat() if student.created_at else None,
+                "updated_at": student.updated_at.isoformat() if student.updated_at else None
+            } for student in Student.query.all()]
+
+        def projection_path(fields=None):
+            statement, serialize = STUDENT_PROJECTION.select(fields)
+            return [serialize(row) for row in db.session.execute(statement)]
+
+        paths = [
+            ("orm entities", orm_path),
+            ("projection, all fields", projection_path),
+            ("projection, fields=id,last_name", lambda: projection_path(["id", "last_name"])),
+        ]
+        rows = []
+        for name, path in paths:
+            latency_ms, peak_kib, result = measure(path, args.repeat)
+            payload = app.json.dumps(result).encode()
+            rows.append([name, f"{latency_ms:.1f}", f"{args.rows / latency_ms * 1000:,.0f}",
+                         f"{peak_kib / 1024:.1f}", f"{len(payload) / 1024:,.0f}"])
+
+    print(f"{args.rows} students, median of {args.repeat} runs")
+    print_table(["path", "ms", "rows/s", "peak MiB", "payload KiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
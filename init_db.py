@@ -7,9 +7,12 @@ load_dotenv()
 
 from app import app, db
 from app.model import models
+from flask_migrate import stamp
 
 if __name__ == "__main__":
     with app.app_context():
         # Create all tables
         db.create_all()
+        # The tables already match the newest migration; later schema changes go through `flask db upgrade`
+        stamp()
         print("Database tables created successfully!")
@@ -0,0 +1,198 @@
+"""Columns, constraints, indexes and tables added since the baseline schema
+
+Seat counts (courses.enrolled_count) are backfilled from enrollments and the search
+index is installed. The quiz_stats aggregate and stored course grades are not derived
+here; run `flask quiz rebuild-stats` and `flask course recompute-grades` afterwards.
+
+Revision ID: 8c5e2d7f41a6
+Revises: 3b1f0c2a9d4e
+Create Date: 2026-10-18 09:40:51.602117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from app.repository.search_repository import SearchIndex
+
+
+# revision identifiers, used by Alembic.
+revision = '8c5e2d7f41a6'
+down_revision = '3b1f0c2a9d4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The unique constraint cannot be added over duplicate rows; stop before changing anything
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM (SELECT 1 FROM enrollments GROUP BY student_id, course_id HAVING count(*) > 1) d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} student/course pairs are enrolled more than once; "
+            "delete the extra enrollments rows and run the upgrade again"
+        )
+    op.create_table('revoked_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(length=32), nullable=False),
+    sa.Column('token_type', sa.String(length=10), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_revoked_at'), ['revoked_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_revoked_tokens_user_id'), ['user_id'], unique=False)
+
+    op.create_table('quiz_stats',
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('result_count', sa.Integer(), nullable=False),
+    sa.Column('sum_percentage', sa.Float(), nullable=False),
+    sa.Column('sum_sq_percentage', sa.Float(), nullable=False),
+    sa.Column('max_percentage', sa.Float(), nullable=True),
+    sa.Column('grade_a_plus', sa.Integer(), nullable=False),
+    sa.Column('grade_a', sa.Integer(), nullable=False),
+    sa.Column('grade_b_plus', sa.Integer(), nullable=False),
+    sa.Column('grade_b', sa.Integer(), nullable=False),
+    sa.Column('grade_c_plus', sa.Integer(), nullable=False),
+    sa.Column('grade_c', sa.Integer(), nullable=False),
+    sa.Column('grade_d', sa.Integer(), nullable=False),
+    sa.Column('grade_f', sa.Integer(), nullable=False),
+    sa.Column('decile_0', sa.Integer(), nullable=False),
+    sa.Column('decile_1', sa.Integer(), nullable=False),
+    sa.Column('decile_2', sa.Integer(), nullable=False),
+    sa.Column('decile_3', sa.Integer(), nullable=False),
+    sa.Column('decile_4', sa.Integer(), nullable=False),
+    sa.Column('decile_5', sa.Integer(), nullable=False),
+    sa.Column('decile_6', sa.Integer(), nullable=False),
+    sa.Column('decile_7', sa.Integer(), nullable=False),
+    sa.Column('decile_8', sa.Integer(), nullable=False),
+    sa.Column('decile_9', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ),
+    sa.PrimaryKeyConstraint('quiz_id')
+    )
+    op.create_table('grading_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('locked_by', sa.String(length=100), nullable=True),
+    sa.Column('enqueued_at', sa.DateTime(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('lag_ms', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['submission_id'], ['quiz_submissions.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('submission_id')
+    )
+    with op.batch_alter_table('grading_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_grading_jobs_status'), ['status'], unique=False)
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('enrolled_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('drop_lowest', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_courses_name'), ['name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_courses_teacher_id'), ['teacher_id'], unique=False)
+
+    with op.batch_alter_table('enrollments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_enrollments_course_id'), ['course_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_enrollments_enrollment_date'), ['enrollment_date'], unique=False)
+        batch_op.create_index(batch_op.f('ix_enrollments_status'), ['status'], unique=False)
+        batch_op.create_unique_constraint('uq_enrollments_student_id_course_id', ['student_id', 'course_id'])
+
+    with op.batch_alter_table('quiz_answers', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_quiz_answers_question_id'), ['question_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_quiz_answers_submission_id'), ['submission_id'], unique=False)
+
+    with op.batch_alter_table('quiz_results', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('marks_overridden', sa.Boolean(), server_default=sa.false(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_quiz_results_submission_id'), ['submission_id'], unique=False)
+
+    with op.batch_alter_table('quiz_submissions', schema=None) as batch_op:
+        batch_op.create_index('ix_quiz_submissions_quiz_id_student_id', ['quiz_id', 'student_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_quiz_submissions_student_id'), ['student_id'], unique=False)
+
+    with op.batch_alter_table('quizzes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('weight', sa.Float(), server_default='1.0', nullable=False))
+        batch_op.add_column(sa.Column('content_version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_students_grade'), ['grade'], unique=False)
+        batch_op.create_index(batch_op.f('ix_students_last_name'), ['last_name'], unique=False)
+
+    with op.batch_alter_table('teachers', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_teachers_last_name'), ['last_name'], unique=False)
+        batch_op.create_index(batch_op.f('ix_teachers_subject'), ['subject'], unique=False)
+
+    # Seats taken by enrollments made before enrolled_count existed
+    op.execute(
+        "UPDATE courses SET enrolled_count = "
+        "(SELECT count(*) FROM enrollments WHERE enrollments.course_id = courses.id)"
+    )
+    SearchIndex.install(op.get_bind())
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for table in ("students", "teachers", "courses"):
+            for name in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_search_{name}")
+        op.execute("DROP TABLE IF EXISTS search_index_pause")
+        op.execute("DROP TABLE IF EXISTS search_index")
+    elif bind.dialect.name == "postgresql":
+        for table in ("students", "teachers", "courses"):
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_search")
+
+    with op.batch_alter_table('teachers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_teachers_subject'))
+        batch_op.drop_index(batch_op.f('ix_teachers_last_name'))
+
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_students_last_name'))
+        batch_op.drop_index(batch_op.f('ix_students_grade'))
+
+    with op.batch_alter_table('quizzes', schema=None) as batch_op:
+        batch_op.drop_column('content_version')
+        batch_op.drop_column('weight')
+
+    with op.batch_alter_table('quiz_submissions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quiz_submissions_student_id'))
+        batch_op.drop_index('ix_quiz_submissions_quiz_id_student_id')
+
+    with op.batch_alter_table('quiz_results', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quiz_results_submission_id'))
+        batch_op.drop_column('marks_overridden')
+
+    with op.batch_alter_table('quiz_answers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quiz_answers_submission_id'))
+        batch_op.drop_index(batch_op.f('ix_quiz_answers_question_id'))
+
+    with op.batch_alter_table('enrollments', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_enrollments_student_id_course_id', type_='unique')
+        batch_op.drop_index(batch_op.f('ix_enrollments_status'))
+        batch_op.drop_index(batch_op.f('ix_enrollments_enrollment_date'))
+        batch_op.drop_index(batch_op.f('ix_enrollments_course_id'))
+
+    with op.batch_alter_table('courses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_courses_teacher_id'))
+        batch_op.drop_index(batch_op.f('ix_courses_name'))
+        batch_op.drop_column('drop_lowest')
+        batch_op.drop_column('enrolled_count')
+
+    with op.batch_alter_table('grading_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_grading_jobs_status'))
+
+    op.drop_table('grading_jobs')
+    op.drop_table('quiz_stats')
+    with op.batch_alter_table('revoked_tokens', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_user_id'))
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_revoked_at'))
+        batch_op.drop_index(batch_op.f('ix_revoked_tokens_expires_at'))
+
+    op.drop_table('revoked_tokens')
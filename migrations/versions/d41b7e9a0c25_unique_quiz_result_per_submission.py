@@ -0,0 +1,40 @@
+"""One quiz result per submission
+
+Replaces the plain index on quiz_results.submission_id with a unique constraint, so
+two graders racing on a submission cannot both insert its result.
+
+Revision ID: d41b7e9a0c25
+Revises: 8c5e2d7f41a6
+Create Date: 2026-10-18 14:05:37.280913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41b7e9a0c25'
+down_revision = '8c5e2d7f41a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The unique constraint cannot be added over duplicate rows; stop before changing anything
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM (SELECT 1 FROM quiz_results GROUP BY submission_id HAVING count(*) > 1) d"
+    )).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} submissions have more than one quiz_results row; delete the extra rows, "
+            "run the upgrade again, then `flask quiz rebuild-stats`"
+        )
+    with op.batch_alter_table('quiz_results', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_quiz_results_submission_id'))
+        batch_op.create_unique_constraint('uq_quiz_results_submission_id', ['submission_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('quiz_results', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_quiz_results_submission_id', type_='unique')
+        batch_op.create_index(batch_op.f('ix_quiz_results_submission_id'), ['submission_id'], unique=False)
@@ -5,8 +5,27 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app import app
+from app.repository.schema_repository import SchemaRepository
+from app.blc.gradingQueueBLC import grading_workers
+from app.blc.quizPreviewBLC import preview_prewarmer
+from app.blc.quizImportBLC import import_grading_pool
 
 
 if __name__ == "__main__":
+    # Refuse to start against a database that predates the models
+    with app.app_context():
+        SchemaRepository.verify()
+
+    if app.config["GRADING_WORKERS"] > 0:
+        grading_workers.start(app, app.config["GRADING_WORKERS"])
+    if app.config["PREVIEW_PREWARM_MINUTES"] > 0:
+        preview_prewarmer.start(app)
+
+    # Before serving, so no request thread ever starts the processes
+    import_grading_pool.start(app.config["IMPORT_GRADING_PROCESSES"])
+
     port = int(os.getenv("PORT", 8001))
-    app.run(host="0.0.0.0", port=port)
+    try:
+        app.run(host="0.0.0.0", port=port)
+    finally:
+        import_grading_pool.stop()
@@ -0,0 +1,83 @@
+import itertools
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+# The app reads its database URL at import time
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="sms-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+
+import pytest
+from app import app as flask_app
+from app.extension import db
+from app.model.models import Teacher, Course, Student, Enrollment, Quiz, QuizQuestion
+from app.repository.answer_key_cache import answer_key_cache
+from app.repository.preview_cache import preview_cache
+from app.repository.token_denylist import token_denylist, verified_tokens
+
+_emails = itertools.count()
+
+
+@pytest.fixture
+def app():
+    """The app on a new, empty database file, with process-local caches cleared"""
+    flask_app.config.update(TESTING=True, JWT_SECRET_KEY="test-secret-key-that-is-long-enough-for-hs256")
+    with flask_app.app_context():
+        db.engine.dispose()
+        if os.path.exists(_DB_PATH):
+            os.remove(_DB_PATH)
+        db.create_all()
+        for cache in (answer_key_cache, preview_cache, token_denylist, verified_tokens):
+            cache.clear()
+        yield flask_app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def make_course(max_students=30):
+    teacher = Teacher(first_name="Ada", last_name="Byron", email=f"t{next(_emails)}@school.org",
+                      subject="Math", qualification="MSc")
+    db.session.add(teacher)
+    db.session.flush()
+    course = Course(name="Algebra", description="Algebra I", credits=3, teacher_id=teacher.id, max_students=max_students)
+    db.session.add(course)
+    db.session.commit()
+    return course.id
+
+
+def make_students(count, grade=5):
+    students = [
+        Student(first_name=f"S{i}", last_name="Lee", email=f"s{next(_emails)}@school.org", date_of_birth=date(2010, 1, 1), grade=grade)
+        for i in range(count)
+    ]
+    db.session.add_all(students)
+    db.session.commit()
+    return [student.id for student in students]
+
+
+def enroll(student_ids, course_id):
+    db.session.add_all(
+        Enrollment(student_id=student_id, course_id=course_id, enrollment_date=date.today()) for student_id in student_ids
+    )
+    db.session.execute(db.update(Course).where(Course.id == course_id).values(enrolled_count=Course.enrolled_count + len(student_ids)))
+    db.session.commit()
+
+
+def make_quiz(course_id, question_count, correct_answer="A"):
+    """An open quiz whose multiple choice questions all have correct_answer"""
+    quiz = Quiz(course_id=course_id, title="Weekly quiz", start_date=datetime.now() - timedelta(days=1),
+                end_date=datetime.now() + timedelta(days=1))
+    db.session.add(quiz)
+    db.session.flush()
+    db.session.add_all(
+        QuizQuestion(quiz_id=quiz.id, question_text=f"Question {i}", question_type="multiple_choice",
+                     option_a="a", option_b="b", correct_answer=correct_answer, marks=1, order_number=i + 1)
+        for i in range(question_count)
+    )
+    db.session.commit()
+    return quiz.id
@@ -0,0 +1,46 @@
+from sqlalchemy import update
+from app.extension import db
+from app.model.models import Quiz, QuizQuestion, QuizResult
+from app.repository.quiz_repository import QuizRepository, QuizSubmissionRepository, QuizGradingRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def submit(student_id, quiz_id, answer):
+    question_ids = QuizGradingRepository.get_answer_key(quiz_id).question_ids
+    submission_id = QuizSubmissionRepository.submit_quiz(student_id, {
+        "quiz_id": quiz_id,
+        "answers": [{"question_id": question_id, "answer": answer} for question_id in question_ids]
+    })
+    return db.session.get(QuizResult, db.session.scalar(
+        db.select(QuizResult.id).where(QuizResult.submission_id == submission_id)
+    ))
+
+
+def test_question_change_elsewhere_retires_cached_key(app):
+    course_id = make_course()
+    first, second = make_students(2)
+    enroll([first, second], course_id)
+    quiz_id = make_quiz(course_id, 3, correct_answer="A")
+    assert submit(first, quiz_id, "A").percentage == 100
+
+    # Another process edits the answer key: no invalidate() reaches this process's cache
+    db.session.execute(update(QuizQuestion).where(QuizQuestion.quiz_id == quiz_id).values(correct_answer="B"))
+    db.session.execute(update(Quiz).where(Quiz.id == quiz_id).values(content_version=Quiz.content_version + 1))
+    db.session.commit()
+
+    result = submit(second, quiz_id, "A")
+    assert result.percentage == 0
+
+
+def test_deleted_quiz_key_is_not_reused_by_a_new_quiz(app):
+    course_id = make_course()
+    first, second = make_students(2)
+    enroll([first, second], course_id)
+    quiz_id = make_quiz(course_id, 3, correct_answer="A")
+    assert submit(first, quiz_id, "A").percentage == 100
+
+    QuizRepository.delete_quiz(quiz_id)
+    # SQLite hands the highest deleted id out again, and the new quiz starts at content_version 1
+    assert make_quiz(course_id, 3, correct_answer="B") == quiz_id
+
+    assert submit(second, quiz_id, "B").percentage == 100
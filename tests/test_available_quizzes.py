@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from app.extension import db
+from app.model.models import Quiz
+from app.repository.quiz_repository import QuizSubmissionRepository, QuizGradingRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def available(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return [quiz["id"] for quiz in response.get_json()]
+
+
+def test_only_open_unattempted_quizzes_of_enrolled_courses(client):
+    course_id, other_course = make_course(), make_course()
+    student_id, = make_students(1)
+    enroll([student_id], course_id)
+    open_quiz, submitted, inactive, upcoming, ended = (make_quiz(course_id, 2) for _ in range(5))
+    make_quiz(other_course, 1)
+    now = datetime.now()
+    db.session.execute(update(Quiz).where(Quiz.id == inactive).values(is_active=False))
+    db.session.execute(update(Quiz).where(Quiz.id == upcoming).values(start_date=now + timedelta(hours=1), end_date=now + timedelta(hours=2)))
+    db.session.execute(update(Quiz).where(Quiz.id == ended).values(start_date=now - timedelta(hours=2), end_date=now - timedelta(hours=1)))
+    db.session.commit()
+    QuizSubmissionRepository.submit_quiz(student_id, {"quiz_id": submitted, "answers": [
+        {"question_id": question_id, "answer": "A"} for question_id in QuizGradingRepository.get_answer_key(submitted).question_ids
+    ]})
+
+    assert available(client, f"/quizzes/student/{student_id}/course/{course_id}/available") == [open_quiz]
+    assert available(client, f"/quizzes/student/{student_id}/available") == [open_quiz]
+
+
+def test_a_course_the_student_is_not_in_is_an_error(client):
+    course_id = make_course()
+    student_id, = make_students(1)
+    make_quiz(course_id, 1)
+
+    response = client.get(f"/quizzes/student/{student_id}/course/{course_id}/available")
+
+    assert "Student is not enrolled in this course" in response.get_json()["error"]
+    assert available(client, f"/quizzes/student/{student_id}/available") == []
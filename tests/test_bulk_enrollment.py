@@ -0,0 +1,56 @@
+from sqlalchemy import select
+from app.extension import db
+from app.model.models import Course, Enrollment
+from conftest import make_course, make_students, enroll
+
+
+def outcomes(body):
+    return [(result["student_id"], result["outcome"], result.get("reason")) for result in body["results"]]
+
+
+def enrolled(course_id):
+    db.session.expire_all()
+    students = db.session.scalars(select(Enrollment.student_id).where(Enrollment.course_id == course_id).order_by(Enrollment.student_id))
+    return list(students), db.session.scalar(select(Course.enrolled_count).where(Course.id == course_id))
+
+
+def test_listed_students_get_one_outcome_each_in_request_order(client):
+    course_id = make_course(max_students=3)
+    first, second, third, fourth = make_students(4)
+    enroll([second], course_id)
+
+    response = client.post("/enrollments/bulk", json={"course_id": course_id, "student_ids": [first, second, 999, first, third, fourth]})
+
+    body = response.get_json()
+    assert response.status_code == 200, body
+    assert outcomes(body) == [
+        (first, "created", None),
+        (second, "skipped", "Student is already enrolled in this course"),
+        (999, "rejected", "Student not found"),
+        (first, "skipped", "Duplicate student in request"),
+        (third, "created", None),
+        (fourth, "rejected", "Course has reached maximum enrollment"),
+    ]
+    assert (body["created"], body["skipped"], body["rejected"]) == (2, 2, 2)
+    assert enrolled(course_id) == ([first, second, third], 3)
+
+
+def test_a_whole_grade_level_is_enrolled(client):
+    course_id = make_course()
+    sixth = make_students(3, grade=6)
+    make_students(2, grade=7)
+
+    body = client.post("/enrollments/bulk", json={"course_id": course_id, "grade": 6, "status": "completed"}).get_json()
+
+    assert [result["student_id"] for result in body["results"]] == sixth
+    assert all(result["enrollment_id"] for result in body["results"])
+    assert enrolled(course_id) == (sixth, 3)
+    assert set(db.session.scalars(select(Enrollment.status))) == {"completed"}
+
+
+def test_exactly_one_student_source_is_required(client):
+    course_id = make_course()
+    both = client.post("/enrollments/bulk", json={"course_id": course_id, "student_ids": [1], "grade": 6})
+    neither = client.post("/enrollments/bulk", json={"course_id": course_id})
+    assert both.status_code == neither.status_code == 400
+    assert enrolled(course_id) == ([], 0)
@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select
+from app.extension import db
+from app.model.models import Course, Enrollment
+from conftest import make_course, make_students
+
+CAPACITY = 10
+ENROLLERS = 60
+
+
+def enroll_concurrently(app, course_id, student_ids):
+    """POST /enrollments/create for every student at once, one client per thread; returns the status codes"""
+    start = threading.Barrier(len(student_ids))
+
+    def attempt(student_id):
+        client = app.test_client()
+        start.wait()
+        return client.post("/enrollments/create", json={"student_id": student_id, "course_id": course_id}).status_code
+
+    with ThreadPoolExecutor(max_workers=len(student_ids)) as pool:
+        return list(pool.map(attempt, student_ids))
+
+
+def seats(course_id):
+    db.session.expire_all()
+    enrolled = db.session.scalar(select(func.count(Enrollment.id)).where(Enrollment.course_id == course_id))
+    return enrolled, db.session.get(Course, course_id).enrolled_count
+
+
+def test_simultaneous_enrollers_never_exceed_capacity(app):
+    course_id = make_course(max_students=CAPACITY)
+    statuses = enroll_concurrently(app, course_id, make_students(ENROLLERS))
+
+    assert statuses.count(201) == CAPACITY
+    assert statuses.count(400) == ENROLLERS - CAPACITY
+    assert seats(course_id) == (CAPACITY, CAPACITY)
+
+
+def test_simultaneous_duplicate_enrollments_take_one_seat(app):
+    course_id = make_course(max_students=CAPACITY)
+    student_id, = make_students(1)
+    statuses = enroll_concurrently(app, course_id, [student_id] * 20)
+
+    assert statuses.count(201) == 1
+    assert seats(course_id) == (1, 1)
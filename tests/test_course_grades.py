@@ -0,0 +1,50 @@
+from sqlalchemy import select, update
+from app.blc.courseBLC import CourseBLC
+from app.extension import db
+from app.model.models import Enrollment
+from app.repository.quiz_repository import QuizRepository, QuizSubmissionRepository, QuizGradingRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def submit(student_id, quiz_id, answer):
+    QuizSubmissionRepository.submit_quiz(student_id, {
+        "quiz_id": quiz_id,
+        "answers": [{"question_id": question_id, "answer": answer}
+                    for question_id in QuizGradingRepository.get_answer_key(quiz_id).question_ids]
+    })
+
+
+def grades(course_id):
+    db.session.expire_all()
+    return dict(db.session.execute(
+        select(Enrollment.student_id, Enrollment.grade).where(Enrollment.course_id == course_id)
+    ).all())
+
+
+def test_deleting_a_students_only_result_clears_their_course_grade(app):
+    course_id = make_course()
+    both, second_only = make_students(2)
+    enroll([both, second_only], course_id)
+    first_quiz, second_quiz = make_quiz(course_id, 2), make_quiz(course_id, 2)
+    submit(both, first_quiz, "A")
+    submit(both, second_quiz, "B")
+    submit(second_only, second_quiz, "A")
+    assert grades(course_id) == {both: 50, second_only: 100}
+
+    QuizRepository.delete_quiz(second_quiz)
+
+    assert grades(course_id) == {both: 100, second_only: None}
+
+
+def test_recompute_clears_grades_without_results(app):
+    course_id = make_course()
+    graded, ungraded = make_students(2)
+    enroll([graded, ungraded], course_id)
+    submit(graded, make_quiz(course_id, 1), "A")
+    db.session.execute(update(Enrollment).where(Enrollment.student_id == ungraded).values(grade=88))
+    db.session.commit()
+
+    result = CourseBLC.recompute_grades(course_id)
+
+    assert result["enrollments_updated"] == 2
+    assert grades(course_id) == {graded: 100, ungraded: None}
@@ -0,0 +1,27 @@
+import json
+from datetime import datetime
+from app.repository.quiz_export_repository import RESULT_EXPORT_COLUMNS
+from app.repository.quiz_repository import QuizSubmissionRepository, QuizGradingRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def test_ndjson_result_export_encodes_rows_with_the_json_provider(client):
+    course_id = make_course()
+    students = make_students(3)
+    enroll(students, course_id)
+    quiz_id = make_quiz(course_id, 2, correct_answer="A")
+    question_ids = QuizGradingRepository.get_answer_key(quiz_id).question_ids
+    for student_id in students:
+        QuizSubmissionRepository.submit_quiz(student_id, {
+            "quiz_id": quiz_id,
+            "answers": [{"question_id": question_id, "answer": "A"} for question_id in question_ids]
+        })
+
+    response = client.get(f"/quizzes/{quiz_id}/results/export?format=ndjson")
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert len(records) == 3
+    assert all(list(record) == list(RESULT_EXPORT_COLUMNS) for record in records)
+    assert [record["percentage"] for record in records] == [100, 100, 100]
+    datetime.fromisoformat(records[0]["submitted_at"])
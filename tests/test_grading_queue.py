@@ -0,0 +1,97 @@
+import pytest
+from datetime import timedelta
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.blc.gradingQueueBLC import GradingQueueBLC
+from app.extension import db
+from app.model.models import GradingJob, QuizResult, QuizStats
+from app.repository.grading_queue_repository import GradingQueueRepository
+from app.repository.quiz_repository import QuizGradingRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+TIMEOUT = 300
+
+
+@pytest.fixture
+def queued(client):
+    """A two-question quiz with one submission answered A, B and queued for grading"""
+    course_id = make_course()
+    student_id, = make_students(1)
+    enroll([student_id], course_id)
+    quiz_id = make_quiz(course_id, 2)
+    response = client.post(f"/quizzes/student/{student_id}/submit/{quiz_id}?async=true", data="A,B")
+    assert response.status_code == 202
+    return quiz_id, response.get_json()["submission_id"]
+
+
+def job():
+    db.session.expire_all()
+    return db.session.scalar(select(GradingJob))
+
+
+def time_out(job_id):
+    """Make a claimed job look abandoned by its worker"""
+    db.session.execute(update(GradingJob).where(GradingJob.id == job_id)
+                       .values(locked_at=GradingJob.locked_at - timedelta(seconds=TIMEOUT + 1)))
+    db.session.commit()
+
+
+def test_queued_submission_is_graded_by_a_worker(client, queued):
+    quiz_id, submission_id = queued
+    assert client.get(f"/quizzes/submissions/{submission_id}/status").get_json()["status"] == "pending"
+
+    assert GradingQueueBLC.process_next("worker-1", TIMEOUT) is True
+    assert GradingQueueBLC.process_next("worker-1", TIMEOUT) is False
+
+    status = client.get(f"/quizzes/submissions/{submission_id}/status").get_json()
+    assert (status["status"], status["attempts"], status["result"]["percentage"]) == ("done", 1, 50)
+    assert db.session.get(QuizStats, quiz_id).result_count == 1
+
+
+def test_a_job_is_claimed_once_until_it_times_out(queued):
+    _, submission_id = queued
+    job_id, claimed_submission, _ = GradingQueueRepository.claim_next("worker-1", TIMEOUT)
+    assert claimed_submission == submission_id
+    assert GradingQueueRepository.claim_next("worker-2", TIMEOUT) is None
+
+    time_out(job_id)
+    assert GradingQueueRepository.claim_next("worker-2", TIMEOUT)[0] == job_id
+    assert (job().locked_by, job().attempts) == ("worker-2", 2)
+
+
+def test_a_worker_whose_job_was_reclaimed_cannot_finish_it(queued):
+    job_id, _, enqueued_at = GradingQueueRepository.claim_next("worker-1", TIMEOUT)
+    time_out(job_id)
+    GradingQueueRepository.claim_next("worker-2", TIMEOUT)
+
+    assert GradingQueueRepository.complete(job_id, "worker-1", enqueued_at) is False
+    assert GradingQueueRepository.fail(job_id, "worker-1", "timed out", max_attempts=3) is False
+    assert (job().status, job().locked_by) == ("processing", "worker-2")
+
+    assert GradingQueueRepository.complete(job_id, "worker-2", enqueued_at) is True
+    assert job().status == "done"
+
+
+def test_failed_job_returns_to_the_queue_until_its_attempts_run_out(queued):
+    job_id, _, _ = GradingQueueRepository.claim_next("worker-1", TIMEOUT)
+    assert GradingQueueRepository.fail(job_id, "worker-1", "database is locked", max_attempts=2) is True
+    assert (job().status, job().locked_by) == ("pending", None)
+
+    GradingQueueRepository.claim_next("worker-1", TIMEOUT)
+    GradingQueueRepository.fail(job_id, "worker-1", "database is locked", max_attempts=2)
+    assert (job().status, job().last_error) == ("failed", "database is locked")
+
+
+def test_a_submission_has_at_most_one_result(queued):
+    quiz_id, submission_id = queued
+    GradingQueueBLC.process_next("worker-1", TIMEOUT)
+    # A second grader of the same submission cannot add another result
+    with pytest.raises(IntegrityError):
+        db.session.execute(insert(QuizResult).values(
+            submission_id=submission_id, total_marks=2, marks_obtained=1, percentage=50, grade="F"
+        ))
+    db.session.rollback()
+
+    QuizGradingRepository.auto_grade_submission(submission_id)
+    db.session.expire_all()
+    assert db.session.get(QuizStats, quiz_id).result_count == 1
@@ -0,0 +1,79 @@
+import pytest
+from flask_migrate import downgrade, upgrade
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from app.extension import db
+from app.repository.schema_repository import SchemaOutOfDate, SchemaRepository
+
+BASELINE = "3b1f0c2a9d4e"
+
+
+@pytest.fixture
+def baseline_db(app):
+    """The database as init_db.py created it before migrations, with a course two students joined"""
+    db.drop_all()
+    db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    db.session.commit()
+    upgrade(revision=BASELINE)
+    for statement in (
+        "INSERT INTO teachers (id, first_name, last_name, email, subject, qualification) VALUES (1, 'Ada', 'Byron', 't@school.org', 'Math', 'MSc')",
+        "INSERT INTO courses (id, name, description, credits, max_students, teacher_id) VALUES (1, 'Algebra', 'Algebra I', 3, 30, 1)",
+        "INSERT INTO students (id, first_name, last_name, email, date_of_birth, grade) VALUES (1, 'S', 'Lee', 's1@school.org', '2010-01-01', 5)",
+        "INSERT INTO students (id, first_name, last_name, email, date_of_birth, grade) VALUES (2, 'T', 'Lee', 's2@school.org', '2010-01-01', 5)",
+        "INSERT INTO enrollments (student_id, course_id, enrollment_date) VALUES (1, 1, '2026-09-01')",
+        "INSERT INTO enrollments (student_id, course_id, enrollment_date) VALUES (2, 1, '2026-09-01')",
+        "INSERT INTO quizzes (id, course_id, title, total_marks, start_date, end_date) VALUES (1, 1, 'Quiz', 10, '2026-09-01', '2026-09-02')",
+    ):
+        db.session.execute(text(statement))
+    db.session.commit()
+
+
+def test_startup_check_rejects_a_baseline_database(baseline_db):
+    missing = SchemaRepository.missing()
+    for item in ("column courses.enrolled_count", "column courses.drop_lowest", "column quizzes.weight",
+                 "column quizzes.content_version", "column quiz_results.marks_overridden",
+                 "unique constraint uq_enrollments_student_id_course_id"):
+        assert item in missing
+    with pytest.raises(SchemaOutOfDate, match="flask db upgrade"):
+        SchemaRepository.verify()
+
+
+def test_upgrade_brings_a_baseline_database_to_the_models(baseline_db):
+    upgrade()
+    db.session.remove()
+
+    assert SchemaRepository.missing() == []
+    course = db.session.execute(text("SELECT enrolled_count, drop_lowest FROM courses WHERE id = 1")).one()
+    assert tuple(course) == (2, 0)
+    quiz = db.session.execute(text("SELECT weight, content_version FROM quizzes WHERE id = 1")).one()
+    assert tuple(quiz) == (1.0, 1)
+    with pytest.raises(IntegrityError):
+        db.session.execute(text("INSERT INTO enrollments (student_id, course_id, enrollment_date) VALUES (1, 1, '2026-09-02')"))
+    db.session.rollback()
+    result = "INSERT INTO quiz_results (submission_id, total_marks, marks_obtained, percentage) VALUES (1, 10, 5, 50)"
+    db.session.execute(text(result))
+    with pytest.raises(IntegrityError):
+        db.session.execute(text(result))
+    db.session.rollback()
+
+    downgrade(revision=BASELINE)
+    assert "column courses.enrolled_count" in SchemaRepository.missing()
+
+
+def test_upgrade_refuses_duplicate_enrollments(baseline_db):
+    db.session.execute(text("INSERT INTO enrollments (student_id, course_id, enrollment_date) VALUES (1, 1, '2026-09-02')"))
+    db.session.commit()
+    # flask_migrate logs the migration's error and exits
+    with pytest.raises(SystemExit):
+        upgrade()
+    assert "column courses.enrolled_count" in SchemaRepository.missing()
+
+
+def test_upgrade_refuses_duplicate_quiz_results(baseline_db):
+    upgrade(revision="8c5e2d7f41a6")
+    for _ in range(2):
+        db.session.execute(text("INSERT INTO quiz_results (submission_id, total_marks, marks_obtained, percentage) VALUES (1, 10, 5, 50)"))
+    db.session.commit()
+    with pytest.raises(SystemExit):
+        upgrade()
+    assert "unique constraint uq_quiz_results_submission_id" in SchemaRepository.missing()
@@ -0,0 +1,39 @@
+import pytest
+from werkzeug.security import generate_password_hash
+from app.extension import db
+from app.model.models import User
+from app.repository.password_hasher import PasswordHasher, password_hasher
+
+
+@pytest.fixture(scope="module")
+def hasher():
+    return PasswordHasher(workers=1, max_pending=1, method="pbkdf2:sha256", salt_length=16)
+
+
+@pytest.mark.parametrize("method, salt_length, rehash", [
+    ("pbkdf2:sha256", 16, False),
+    ("pbkdf2:sha256:260000", 16, False),
+    ("pbkdf2:sha256:100000", 16, True),
+    ("pbkdf2:sha512", 16, True),
+    ("pbkdf2:sha256", 8, True),
+])
+def test_needs_rehash_compares_every_parameter(hasher, method, salt_length, rehash):
+    assert hasher.needs_rehash(generate_password_hash("secret1", method, salt_length)) is rehash
+
+
+def test_needs_rehash_rejects_unparsable_hashes(hasher):
+    assert hasher.needs_rehash("not-a-hash") is True
+
+
+def test_login_upgrades_a_cheaper_hash(client):
+    db.session.add(User(username="ada", email="ada@school.org",
+                        password_hash=generate_password_hash("secret1", "pbkdf2:sha256:1000", 8)))
+    db.session.commit()
+
+    response = client.post("/login", json={"email": "ada@school.org", "password": "secret1"})
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    stored = db.session.scalar(db.select(User.password_hash))
+    assert not password_hasher.needs_rehash(stored)
+    assert client.post("/login", json={"email": "ada@school.org", "password": "secret1"}).status_code == 200
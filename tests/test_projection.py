@@ -0,0 +1,26 @@
+import itertools
+import pytest
+from app.repository.projection import SERIALIZER_CACHE_SIZE
+from app.repository.student_repository import STUDENT_PROJECTION
+
+
+def test_equal_field_sets_share_one_statement_and_serializer():
+    first, serialize_first = STUDENT_PROJECTION.select(["last_name", "id"])
+    second, serialize_second = STUDENT_PROJECTION.select(["id", "last_name", "id", "last_name"])
+
+    assert str(first) == str(second)
+    assert serialize_first is serialize_second
+    assert list(serialize_first((7, "Lee"))) == ["id", "last_name"]
+
+
+def test_serializer_cache_is_bounded():
+    for size in (1, 2, 3):
+        for fields in itertools.combinations(STUDENT_PROJECTION.field_names, size):
+            STUDENT_PROJECTION.select(list(fields))
+
+    assert STUDENT_PROJECTION._serializers.stats()["size"] <= SERIALIZER_CACHE_SIZE
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(KeyError):
+        STUDENT_PROJECTION.select(["id", "password"])
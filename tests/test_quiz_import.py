@@ -0,0 +1,86 @@
+import io
+import pytest
+from sqlalchemy import func, select
+from app.blc.quizImportBLC import import_grading_pool
+from app.extension import db
+from app.model.models import QuizResult
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def upload(client, quiz_id, text):
+    return client.post(
+        f"/quizzes/{quiz_id}/submissions/import",
+        data={"file": (io.BytesIO(text.encode()), "sheets.csv")},
+        content_type="multipart/form-data"
+    )
+
+
+@pytest.fixture
+def grading_pool():
+    import_grading_pool.start(2)
+    yield import_grading_pool
+    import_grading_pool.stop()
+
+
+def test_import_streams_sheets_in_chunks(app, client):
+    app.config.update(IMPORT_GRADING_CHUNK_SIZE=2)
+    course_id = make_course()
+    students = make_students(5)
+    enroll(students, course_id)
+    quiz_id = make_quiz(course_id, 2, correct_answer="A")
+
+    rows = [f"{student_id},A,{'A' if i % 2 else 'B'}" for i, student_id in enumerate(students)]
+    rows.insert(2, "not-a-student,A,A")
+    rows.append(f"{students[0]},A,A")
+    response = upload(client, quiz_id, "student_id,q1,q2\n" + "\n".join(rows) + "\n")
+
+    body = response.get_json()
+    assert response.status_code == 200, body
+    assert body["imported"] == 5
+    assert [(error["row"], error["error"]) for error in body["errors"]] == [
+        (4, "Invalid student_id or time_taken_minutes"),
+        (8, "Quiz has already been submitted"),
+    ]
+    percentages = db.session.scalars(select(QuizResult.percentage).order_by(QuizResult.submission_id)).all()
+    assert percentages == [50, 100, 50, 100, 50]
+
+
+def test_imports_share_the_pool_started_with_the_server(app, client, grading_pool):
+    app.config.update(IMPORT_GRADING_CHUNK_SIZE=2)
+    course_id = make_course()
+    students = make_students(8)
+    enroll(students, course_id)
+
+    executor = grading_pool._executor
+    for batch in (students[:4], students[4:]):
+        quiz_id = make_quiz(course_id, 3, correct_answer="C")
+        response = upload(client, quiz_id, "student_id,q1,q2,q3\n" + "".join(f"{s},C,C,D\n" for s in batch))
+        assert response.get_json()["imported"] == 4
+        assert grading_pool._executor is executor
+
+    assert (executor._max_workers, executor._mp_context.get_start_method()) == (2, "spawn")
+    assert len(executor._processes) == 2
+    assert db.session.scalar(select(func.count()).where(QuizResult.marks_obtained == 2)) == 8
+
+
+def test_cli_import_runs_its_own_pool_of_the_requested_size(app, tmp_path, monkeypatch):
+    course_id = make_course()
+    students = make_students(4)
+    enroll(students, course_id)
+    quiz_id = make_quiz(course_id, 1, correct_answer="B")
+    path = tmp_path / "sheets.csv"
+    path.write_text("student_id,q1\n" + "".join(f"{s},B\n" for s in students))
+    app.config.update(IMPORT_GRADING_CHUNK_SIZE=1)
+
+    sizes = []
+    grade = import_grading_pool.grade
+
+    def record_size(answer_key, chunks):
+        sizes.append(import_grading_pool.processes)
+        return grade(answer_key, chunks)
+    monkeypatch.setattr(import_grading_pool, "grade", record_size)
+    result = app.test_cli_runner().invoke(args=["quiz", "import-submissions", str(quiz_id), str(path), "--processes", "3"])
+
+    assert "Imported 4 submissions" in result.output, result.output
+    assert sizes == [3, 3]
+    assert import_grading_pool._executor is None
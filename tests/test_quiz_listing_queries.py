@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.extension import db
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+@contextmanager
+def count_statements():
+    """Collect every SQL statement the app sends while the block runs"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+
+def get(client, url):
+    db.session.remove()
+    with count_statements() as statements:
+        response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json(), len(statements)
+
+
+def test_quiz_listings_use_the_same_statements_for_any_quiz_count(client):
+    course_id = make_course()
+    student_id, = make_students(1)
+    enroll([student_id], course_id)
+    listings = (f"/quizzes/course/{course_id}", f"/quizzes/student/{student_id}/course/{course_id}/available")
+
+    make_quiz(course_id, 2)
+    few = [get(client, url) for url in listings]
+    for question_count in range(1, 13):
+        make_quiz(course_id, question_count)
+    many = [get(client, url) for url in listings]
+
+    for (few_quizzes, few_statements), (many_quizzes, many_statements) in zip(few, many):
+        assert (len(few_quizzes), len(many_quizzes)) == (1, 13)
+        assert few_statements == many_statements == 1
+    assert sorted(quiz["question_count"] for quiz in many[0][0]) == sorted([2] + list(range(1, 13)))
+
+
+def test_quiz_detail_uses_the_same_statements_for_any_question_count(client):
+    course_id = make_course()
+    small, small_statements = get(client, f"/quizzes/{make_quiz(course_id, 2)}")
+    large, large_statements = get(client, f"/quizzes/{make_quiz(course_id, 40)}")
+
+    assert (small["question_count"], large["question_count"]) == (2, 40)
+    # The quiz with its course, then its questions
+    assert small_statements == large_statements == 2
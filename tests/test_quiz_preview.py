@@ -0,0 +1,22 @@
+from app.repository.quiz_repository import QuizRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def test_deleted_quiz_preview_is_not_served_for_a_new_quiz(client):
+    course_id = make_course()
+    student_id, = make_students(1)
+    enroll([student_id], course_id)
+    quiz_id = make_quiz(course_id, 2)
+    url = f"/quizzes/student/{student_id}/quiz/{quiz_id}/preview"
+    old = client.get(url)
+    assert old.status_code == 200
+    assert old.get_json()["question_count"] == 2
+
+    QuizRepository.delete_quiz(quiz_id)
+    # SQLite hands the highest deleted id out again, and the new quiz starts at content_version 1
+    assert make_quiz(course_id, 5) == quiz_id
+
+    new = client.get(url, headers={"If-None-Match": old.headers["ETag"]})
+    assert new.status_code == 200
+    assert new.get_json()["question_count"] == 5
+    assert new.headers["ETag"] != old.headers["ETag"]
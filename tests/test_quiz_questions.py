@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import select
+from werkzeug.exceptions import BadRequest, NotFound
+from app.extension import db
+from app.model.models import Quiz, QuizQuestion
+from app.repository.quiz_repository import QuizRepository, QuizQuestionRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def question(text, correct_answer="A", **fields):
+    return {"question_text": f"Which option is {text}?", "question_type": "multiple_choice",
+            "option_a": "a", "option_b": "b", "correct_answer": correct_answer, **fields}
+
+
+def questions(quiz_id):
+    db.session.expire_all()
+    return db.session.execute(
+        select(QuizQuestion.id, QuizQuestion.question_text, QuizQuestion.correct_answer, QuizQuestion.order_number)
+        .where(QuizQuestion.quiz_id == quiz_id).order_by(QuizQuestion.order_number)
+    ).all()
+
+
+def test_bulk_questions_append_in_order(client):
+    quiz_id = make_quiz(make_course(), 2)
+    version = db.session.scalar(select(Quiz.content_version).where(Quiz.id == quiz_id))
+
+    response = client.post(f"/quizzes/{quiz_id}/questions/bulk", json={"questions": [
+        question("first"), question("second", "B"), {**question("true"), "question_type": "true_false", "correct_answer": "True"}
+    ]})
+
+    assert response.status_code == 201, response.get_json()
+    stored = questions(quiz_id)
+    assert response.get_json()["question_ids"] == [row.id for row in stored[2:]]
+    assert [row.order_number for row in stored] == [1, 2, 3, 4, 5]
+    assert [row.correct_answer for row in stored[2:]] == ["A", "B", "True"]
+    assert db.session.scalar(select(Quiz.content_version).where(Quiz.id == quiz_id)) == version + 1
+
+
+def test_bulk_questions_are_all_or_nothing(client):
+    quiz_id = make_quiz(make_course(), 1)
+
+    response = client.post(f"/quizzes/{quiz_id}/questions/bulk", json={"questions": [
+        question("fine"), question("missing options", option_b=None)
+    ]})
+
+    assert response.status_code == 422
+    assert len(questions(quiz_id)) == 1
+    with pytest.raises(NotFound):
+        QuizQuestionRepository.create_questions(quiz_id + 1, [question("orphan")])
+
+
+def test_bulk_questions_reach_the_students_preview(client):
+    course_id = make_course()
+    student_id, = make_students(1)
+    enroll([student_id], course_id)
+    quiz_id = make_quiz(course_id, 1)
+    url = f"/quizzes/student/{student_id}/quiz/{quiz_id}/preview"
+    before = client.get(url)
+
+    client.post(f"/quizzes/{quiz_id}/questions/bulk", json={"questions": [question("new")]})
+
+    after = client.get(url, headers={"If-None-Match": before.headers["ETag"]})
+    assert after.status_code == 200
+    assert after.get_json()["question_count"] == 2
+
+
+def test_clone_copies_questions_into_another_course_and_window(client):
+    quiz_id = make_quiz(make_course(), 3, correct_answer="C")
+    target_course = make_course()
+    source = db.session.get(Quiz, quiz_id)
+    start_date = datetime(2027, 1, 4, 9, 0)
+
+    response = client.post(f"/quizzes/{quiz_id}/clone", json={"course_id": target_course, "start_date": start_date.isoformat()})
+
+    assert response.status_code == 201, response.get_json()
+    clone = db.session.get(Quiz, response.get_json()["quiz_id"])
+    assert (clone.course_id, clone.title, clone.content_version) == (target_course, source.title, 1)
+    assert (clone.start_date, clone.end_date - clone.start_date) == (start_date, source.end_date - source.start_date)
+    copied, original = questions(clone.id), questions(quiz_id)
+    assert [row[1:] for row in copied] == [row[1:] for row in original]
+    assert not {row.id for row in copied} & {row.id for row in original}
+
+
+def test_clone_rejects_bad_targets(app):
+    quiz_id = make_quiz(make_course(), 1)
+    with pytest.raises(NotFound):
+        QuizRepository.clone_quiz(quiz_id + 1)
+    with pytest.raises(BadRequest, match="Course not found"):
+        QuizRepository.clone_quiz(quiz_id, course_id=999)
+    with pytest.raises(BadRequest, match="End date"):
+        QuizRepository.clone_quiz(quiz_id, start_date=datetime.now(), end_date=datetime.now() - timedelta(hours=1))
+    assert db.session.scalar(select(db.func.count(Quiz.id))) == 1
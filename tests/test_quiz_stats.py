@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import delete, select
+from app.extension import db
+from app.model.models import QuizResult, QuizSubmission
+from app.repository.quiz_repository import QuizSubmissionRepository, QuizGradingRepository, QuizStatsRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def submit(student_id, quiz_id, answers):
+    """Submit answers in question order; returns the submission id"""
+    question_ids = QuizGradingRepository.get_answer_key(quiz_id).question_ids
+    return QuizSubmissionRepository.submit_quiz(student_id, {
+        "quiz_id": quiz_id,
+        "answers": [{"question_id": question_id, "answer": answer} for question_id, answer in zip(question_ids, answers)]
+    })
+
+
+def assert_matches_rebuild(quiz_id):
+    db.session.expire_all()
+    report = QuizStatsRepository.rebuild(quiz_id, verify_only=True)
+    assert report["mismatches"] == []
+
+
+@pytest.fixture
+def graded_quiz(app):
+    """A four-question quiz with results of 100%, 50% and 25%; returns (quiz_id, submission ids)"""
+    course_id = make_course()
+    students = make_students(3)
+    enroll(students, course_id)
+    quiz_id = make_quiz(course_id, 4)
+    submissions = [submit(student_id, quiz_id, answers)
+                   for student_id, answers in zip(students, ["AAAA", "AABB", "ABBB"])]
+    return quiz_id, submissions
+
+
+def remove_result(quiz_id, submission_id):
+    """Delete a submission's result and fold the removal into the stats, as one transaction"""
+    result = db.session.execute(
+        select(QuizResult.percentage, QuizResult.grade).where(QuizResult.submission_id == submission_id)
+    ).one()
+    db.session.execute(delete(QuizResult).where(QuizResult.submission_id == submission_id))
+    QuizStatsRepository.apply_change(quiz_id, old=tuple(result))
+    db.session.commit()
+
+
+def test_added_results_match_rebuild(graded_quiz):
+    quiz_id, _ = graded_quiz
+    assert_matches_rebuild(quiz_id)
+    stats = QuizStatsRepository.get_stats(quiz_id)
+    assert (stats["submission_count"], stats["max"]) == (3, 100)
+    assert stats["mean"] == pytest.approx(175 / 3)
+
+
+@pytest.mark.parametrize("override_marks, expected_max", [(3, 75), (1, 50)])
+def test_replaced_results_match_rebuild(graded_quiz, override_marks, expected_max):
+    quiz_id, submissions = graded_quiz
+    # Overriding the 100% result replaces the current maximum, with a higher or lower score
+    QuizGradingRepository.manual_grade_submission(submissions[0], override_marks=override_marks)
+
+    assert_matches_rebuild(quiz_id)
+    assert QuizStatsRepository.get_stats(quiz_id)["max"] == expected_max
+
+
+@pytest.mark.parametrize("removed, expected_max", [(2, 100), (0, 50)])
+def test_removed_results_match_rebuild(graded_quiz, removed, expected_max):
+    quiz_id, submissions = graded_quiz
+    remove_result(quiz_id, submissions[removed])
+
+    assert_matches_rebuild(quiz_id)
+    stats = QuizStatsRepository.get_stats(quiz_id)
+    assert (stats["submission_count"], stats["max"]) == (2, expected_max)
+
+
+def test_removing_every_result_empties_the_stats(graded_quiz):
+    quiz_id, submissions = graded_quiz
+    for submission_id in submissions:
+        remove_result(quiz_id, submission_id)
+
+    assert_matches_rebuild(quiz_id)
+    stats = QuizStatsRepository.get_stats(quiz_id)
+    assert (stats["submission_count"], stats["max"], stats["median_estimate"]) == (0, None, None)
+
+
+def test_median_estimate_stays_in_the_medians_band(client):
+    course_id = make_course()
+    students = make_students(3)
+    enroll(students, course_id)
+    quiz_id = make_quiz(course_id, 3)
+    for student_id, answers in zip(students, ["ABB", "BBB", "BBB"]):
+        submit(student_id, quiz_id, answers)
+
+    stats = client.get(f"/quizzes/{quiz_id}/stats").get_json()
+    median = client.get(f"/quizzes/{quiz_id}/analytics").get_json()["scores"]["median"]
+
+    assert "median" not in stats
+    assert median == 0
+    assert 0 <= stats["median_estimate"] < 10
+    assert stats["median_grade"] == "F"
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+from app.blc.quizBLC import QuizQuestionBLC
+from app.extension import db
+from app.model.models import Quiz, QuizQuestion, QuizAnswer, QuizResult
+from app.repository.quiz_repository import QuizSubmissionRepository, QuizStatsRepository
+from conftest import make_course, make_students, enroll, make_quiz
+
+
+def text_quiz(correct_answer):
+    """A one-question text quiz and an enrolled student"""
+    course_id = make_course()
+    student_id, = make_students(1)
+    enroll([student_id], course_id)
+    quiz_id = make_quiz(course_id, 1)
+    db.session.execute(update(QuizQuestion).where(QuizQuestion.quiz_id == quiz_id)
+                       .values(question_type="text", correct_answer=correct_answer))
+    db.session.commit()
+    question_id = db.session.scalar(select(QuizQuestion.id).where(QuizQuestion.quiz_id == quiz_id))
+    return quiz_id, question_id, student_id
+
+
+def submit(student_id, quiz_id, question_id, answer):
+    QuizSubmissionRepository.submit_quiz(student_id, {
+        "quiz_id": quiz_id, "answers": [{"question_id": question_id, "answer": answer}]
+    })
+
+
+def test_regrade_matches_submission_grading(app):
+    # Python's strip() and lower() also handle tabs, newlines and non-ASCII letters
+    quiz_id, question_id, student_id = text_quiz("Café")
+    submit(student_id, quiz_id, question_id, "\tCAFÉ\n")
+    assert db.session.scalar(select(QuizAnswer.is_correct)) is True
+
+    QuizQuestionBLC.update_question(question_id, {"marks": 4})
+
+    db.session.expire_all()
+    assert db.session.scalar(select(QuizAnswer.marks_obtained)) == 4
+    assert db.session.scalar(select(QuizResult.percentage)) == 100
+
+
+def test_question_change_and_regrade_commit_together(app, monkeypatch):
+    quiz_id, question_id, student_id = text_quiz("paris")
+    submit(student_id, quiz_id, question_id, "Paris")
+    version = db.session.scalar(select(Quiz.content_version).where(Quiz.id == quiz_id))
+
+    def fail(quiz_id):
+        raise OperationalError("UPDATE quiz_stats", {}, Exception("database is locked"))
+    monkeypatch.setattr(QuizStatsRepository, "refresh", fail)
+
+    with pytest.raises(OperationalError):
+        QuizQuestionBLC.update_question(question_id, {"correct_answer": "london"})
+
+    db.session.expire_all()
+    assert db.session.scalar(select(QuizQuestion.correct_answer)) == "paris"
+    assert db.session.scalar(select(Quiz.content_version).where(Quiz.id == quiz_id)) == version
+    assert db.session.scalar(select(QuizAnswer.is_correct)) is True
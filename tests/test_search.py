@@ -0,0 +1,81 @@
+from sqlalchemy import delete, update
+from app.extension import db
+from app.model.models import Course, Student
+from app.repository.search_repository import SearchRepository
+from conftest import make_course, make_students
+
+
+def search(client, query, **params):
+    response = client.get("/search", query_string={"q": query, **params})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def hits(body):
+    return [(result["type"], result["id"]) for result in body["results"]]
+
+
+def name_student(student_id, first_name, last_name):
+    db.session.execute(update(Student).where(Student.id == student_id).values(first_name=first_name, last_name=last_name))
+    db.session.commit()
+
+
+def test_words_match_by_prefix_and_titles_rank_first(client):
+    course_id = make_course()
+    db.session.execute(update(Course).where(Course.id == course_id)
+                       .values(name="Chemistry", description="Lab work with Marie Curie's methods"))
+    student_id, other_id = make_students(2)
+    name_student(student_id, "Marie", "Curie")
+    name_student(other_id, "Pierre", "Curie")
+
+    body = search(client, "mar cur")
+
+    assert hits(body) == [("student", student_id), ("course", course_id)]
+    assert body["results"][0]["title"] == "Marie Curie"
+
+
+def test_type_filter_and_pages(client):
+    make_course()
+    students = make_students(5)
+    for index, student_id in enumerate(students):
+        name_student(student_id, f"Ada{index}", "Lovelace")
+
+    first = search(client, "lovelace", type="student", limit=3)
+    second = search(client, "lovelace", type="student", limit=3, offset=first["next_offset"])
+
+    assert first["next_offset"] == 3 and second["next_offset"] is None
+    assert sorted(hits(first) + hits(second)) == [("student", student_id) for student_id in students]
+    assert hits(search(client, "lovelace", type="teacher,course")) == []
+
+
+def test_index_follows_edits_and_deletes(client):
+    student_id, = make_students(1)
+    name_student(student_id, "Grace", "Hopper")
+    assert hits(search(client, "hopper")) == [("student", student_id)]
+
+    name_student(student_id, "Grace", "Brewster")
+    assert hits(search(client, "hopper")) == []
+    assert hits(search(client, "brewster")) == [("student", student_id)]
+
+    db.session.execute(delete(Student).where(Student.id == student_id))
+    db.session.commit()
+    assert hits(search(client, "brewster")) == []
+
+
+def test_rebuild_reindexes_every_row(client):
+    students = make_students(3)
+    name_student(students[0], "Alan", "Turing")
+    db.session.execute(db.text("DELETE FROM search_index"))
+    db.session.commit()
+    assert hits(search(client, "turing")) == []
+
+    assert SearchRepository.rebuild_index() == len(students)
+    assert hits(search(client, "turing")) == [("student", students[0])]
+
+
+def test_operator_characters_are_plain_text(client):
+    student_id, = make_students(1)
+    name_student(student_id, "Ada", "Lovelace")
+    assert hits(search(client, 'lovelace" OR "x')) == []
+    assert hits(search(client, "lovelace*")) == [("student", student_id)]
+    assert search(client, "---")["results"] == []
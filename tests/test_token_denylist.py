@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+import jwt
+import pytest
+from app.extension import db
+from app.model.models import User, RevokedToken
+from app.blc.tokenBLC import TokenBLC
+
+
+def access_claims(user_id):
+    token = TokenBLC.issue_tokens(user_id, f"u{user_id}@school.org")["access_token"]
+    return token, TokenBLC.verify(token)
+
+
+def revoke_elsewhere(claims, row_id, revoked_at):
+    """A revocation written by another process, with the id and timestamp it was given before commit"""
+    db.session.add(RevokedToken(
+        id=row_id,
+        jti=claims["jti"],
+        token_type="access",
+        user_id=int(claims["sub"]),
+        expires_at=datetime.fromtimestamp(claims["exp"], timezone.utc).replace(tzinfo=None),
+        revoked_at=revoked_at
+    ))
+    db.session.commit()
+
+
+def test_revocations_committed_out_of_order_are_all_seen(app):
+    app.config["TOKEN_DENYLIST_SYNC_SECONDS"] = 0
+    db.session.add_all([User(id=1, username="a", email="u1@school.org", password_hash="x"),
+                        User(id=2, username="b", email="u2@school.org", password_hash="x")])
+    db.session.commit()
+    first_token, first = access_claims(1)
+    second_token, second = access_claims(2)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # Id 1 is allocated first but its transaction commits after id 2's
+    revoke_elsewhere(second, row_id=2, revoked_at=now)
+    with pytest.raises(jwt.InvalidTokenError):
+        TokenBLC.verify(second_token)
+    TokenBLC.verify(first_token)
+
+    revoke_elsewhere(first, row_id=1, revoked_at=now - timedelta(seconds=5))
+    with pytest.raises(jwt.InvalidTokenError):
+        TokenBLC.verify(first_token)
+
+
+def test_expired_revocations_are_dropped(app):
+    app.config["TOKEN_DENYLIST_SYNC_SECONDS"] = 0
+    db.session.add(User(id=1, username="a", email="u1@school.org", password_hash="x"))
+    db.session.commit()
+    token, claims = access_claims(1)
+    revoke_elsewhere({**claims, "exp": claims["exp"] - 10 ** 6}, row_id=1, revoked_at=datetime.now(timezone.utc).replace(tzinfo=None))
+    TokenBLC.verify(token)